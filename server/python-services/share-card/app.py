@@ -3,19 +3,19 @@ oarbit Share Card Rendering Service
 Flask microservice for generating share card images using Cairo+Pango
 """
 
+import base64
 import os
 from flask import Flask, request, jsonify, send_file
 from io import BytesIO
 import traceback
 
-# Import template modules
-from templates.base_template import render_test_card
-from templates.erg_summary import render_erg_summary
-from templates.erg_summary_alt import render_erg_summary_alt
-from templates.regatta_result import render_regatta_result
-from templates.regatta_summary import render_regatta_summary
-from templates.season_recap import render_season_recap
-from templates.team_leaderboard import render_team_leaderboard
+# Template modules (and the scene engine behind them) are imported on first use - see templates/registry.py
+from templates.registry import (
+    CARD_RENDERERS, CARD_SCENE_BUILDERS, OUTPUT_MIMETYPES, cache_stats, preload_templates, template_import_times
+)
+from templates.telemetry import ndjson_records, fold_telemetry_stream
+from templates.models import decode_workout, PayloadError, ErgWorkoutData
+from templates.fonts import register_fonts
 
 app = Flask(__name__)
 
@@ -25,22 +25,38 @@ DIMENSIONS = {
     '9:16': (2160, 3840),     # Instagram/TikTok story
 }
 
-# Card renderer registry - maps cardType to renderer function
-CARD_RENDERERS = {
-    'test': render_test_card,
-    'erg_summary': render_erg_summary,  # Design A - Evolved v5
-    'erg_summary_alt': render_erg_summary_alt,  # Design B - Fresh Direction
-    'regatta_result': render_regatta_result,  # Single race result
-    'regatta_summary': render_regatta_summary,  # Full regatta summary
-    'season_recap': render_season_recap,  # Spotify Wrapped style year-in-review
-    'team_leaderboard': render_team_leaderboard,  # Team rankings snapshot
-}
+# Upper bound on cards per /layout request
+MAX_LAYOUT_CARDS = 50
+# Upper bound on targets per multi-card /generate request
+MAX_GENERATE_TARGETS = 8
+
+# Streamed /generate body: a header object line followed by one line per stroke
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Register the bundled fonts (fails fast when one is missing)
+register_fonts()
+
+# Opt-in warm-up: "all" or a comma-separated list of card types to import, plus
+# the glyph atlases. Without it, both are built by a worker's first cards.
+_preload = os.environ.get('SHARE_CARD_PRELOAD_TEMPLATES', '').strip()
+if _preload:
+    preload_templates(None if _preload == 'all' else [t.strip() for t in _preload.split(',') if t.strip()])
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint for container orchestration"""
-    return jsonify({"status": "ok"}), 200
+    """
+    Health check endpoint for container orchestration
+
+    Also reports the templates this worker has loaded and what each cost to
+    import (ms), so startup regressions show up, and the branding image and
+    photo background cache counters once those modules are loaded.
+    """
+    return jsonify({
+        "status": "ok",
+        "templates": template_import_times(),
+        **cache_stats(),
+    }), 200
 
 
 @app.route('/generate', methods=['POST'])
@@ -56,23 +72,63 @@ def generate_card():
         "options": {
             "showAttribution": true,
             "teamColor": "#B87333",
+            "cardKey": "workout-123",  # optional: repaint only what changed since the last render
+            "sparkline": "pace",  # optional (erg_summary_alt): pace | watts | heartRate | strokeRate from workoutData.telemetry
+            "forceCurve": true,  # optional (erg_summary_alt): mean + percentile bands of telemetry.forceCurves
+            "backgroundPhoto": "<base64 JPEG/PNG>",  # optional: blurred, darkened photo behind the card
+            "shareUrl": "https://oarbit.net/share/abc123",  # optional: QR code to the share page, bottom-right
+            "teamLogo": "<base64 PNG/JPEG>",  # optional: team logo, bottom-left
+            "userAvatar": "<base64 PNG/JPEG>",  # optional: round avatar beside the logo
+            "output": "png" | "svg" | "pdf",  # optional, default png: svg/pdf return a vector document
+            "preview": true,  # optional (png only): fast 540px-wide render for the live editor, no grain
             ...
         }
     }
 
-    Returns: PNG image binary (Content-Type: image/png)
+    Long sessions can instead be sent as NDJSON (Content-Type:
+    application/x-ndjson): the first line is the body above without
+    workoutData.telemetry, and every following line is one stroke,
+    {"t": 1.9, "watts": 231, "heartRate": 141, "strokeRate": 28, "force": [...]}.
+    Strokes are folded into the renderer's telemetry as they are read, so
+    memory stays flat however long the session is.
+
+    Several cards can be rendered from one payload by sending "targets"
+    instead of cardType/format:
+        "targets": [{"cardType": "erg_summary", "format": "1:1"},
+                    {"cardType": "erg_summary_alt", "format": "9:16"}, ...]
+    The payload is decoded once per card type and the cards share split
+    analysis, text measurement and cached layers.
+
+    Returns: PNG image binary (Content-Type: image/png), or with options.output
+    an SVG (image/svg+xml) or PDF (application/pdf) document. Vector documents
+    keep text and shapes as vectors and replace grain with a small repeating tile.
+
+    With targets, returns JSON instead:
+    {"cards": [{"cardType": "...", "format": "1:1", "mimetype": "image/png", "data": "<base64>"}, ...]}
     """
     try:
         # Parse request body
-        data = request.get_json()
-        if not data:
+        streamed = request.mimetype == NDJSON_MIMETYPE
+        if streamed:
+            records = ndjson_records(request.stream)
+            try:
+                data = next(records, None)
+            except ValueError:
+                return jsonify({"error": "Malformed NDJSON header line"}), 400
+        else:
+            data = request.get_json()
+        if not data or not isinstance(data, dict):
             return jsonify({"error": "Missing request body"}), 400
 
-        card_type = data.get('cardType')
-        format_key = data.get('format', '1:1')
         workout_data = data.get('workoutData', {})
         options = data.get('options', {})
 
+        if 'targets' in data:
+            return generate_cards(data['targets'], workout_data, options, records if streamed else None)
+
+        card_type = data.get('cardType')
+        format_key = data.get('format', '1:1')
+
         # Validate required fields
         if not card_type:
             return jsonify({"error": "Missing required field: cardType"}), 400
@@ -80,6 +136,10 @@ def generate_card():
         if format_key not in DIMENSIONS:
             return jsonify({"error": f"Invalid format: {format_key}. Supported: {list(DIMENSIONS.keys())}"}), 400
 
+        error = validate_render_options(options)
+        if error:
+            return jsonify({"error": error}), 400
+
         # Get renderer for card type
         renderer = CARD_RENDERERS.get(card_type)
         if not renderer:
@@ -88,16 +148,33 @@ def generate_card():
                 "supported": list(CARD_RENDERERS.keys())
             }), 400
 
-        # Render card to PNG bytes
-        # Renderers accept (format_key, workout_data, options) and return bytes
-        png_bytes = renderer(format_key, workout_data, options)
+        # Decode workoutData into the card's typed model before any rendering work
+        try:
+            workout_data = decode_workout(card_type, workout_data)
+        except PayloadError as e:
+            return jsonify({"error": f"Invalid workoutData: {e}"}), 400
+
+        # Fold the stroke lines only once the header has validated
+        if streamed and isinstance(workout_data, ErgWorkoutData):
+            try:
+                workout_data.telemetry = fold_telemetry_stream(records)
+            except (ValueError, TypeError) as e:
+                return jsonify({"error": f"Malformed NDJSON stroke record: {e}"}), 400
+
+        # Render card to PNG (or SVG/PDF) bytes
+        # Renderers accept (format_key, decoded workout model, options) and return bytes
+        try:
+            card_bytes = renderer(format_key, workout_data, options)
+        except PayloadError as e:
+            return jsonify({"error": f"Invalid options: {e}"}), 400
 
-        # Return PNG binary
+        # Return the image/document binary
+        output = options.get('output', 'png')
         return send_file(
-            BytesIO(png_bytes),
-            mimetype='image/png',
+            BytesIO(card_bytes),
+            mimetype=OUTPUT_MIMETYPES[output],
             as_attachment=False,
-            download_name=f'{card_type}-{format_key.replace(":", "x")}.png'
+            download_name=f'{card_type}-{format_key.replace(":", "x")}.{output}'
         )
 
     except Exception as e:
@@ -111,6 +188,168 @@ def generate_card():
         }), 500
 
 
+def validate_render_options(options):
+    """Error message for an invalid options object (output, preview), else None"""
+    if not isinstance(options, dict):
+        return "Invalid field: options must be an object"
+    output = options.get('output', 'png')
+    if output not in OUTPUT_MIMETYPES:
+        return f"Invalid output: {output}. Supported: {list(OUTPUT_MIMETYPES.keys())}"
+    if options.get('preview') and output != 'png':
+        return "Invalid options: preview renders are PNG only"
+    return None
+
+
+def generate_cards(targets, workout_data, options, records=None):
+    """
+    /generate with several (cardType, format) targets for one payload
+
+    Every target is validated before anything renders. workoutData is decoded
+    once per card type (and NDJSON strokes folded once), so formats of a card
+    share one model and everything cached against it.
+    """
+    if not isinstance(targets, list) or not targets:
+        return jsonify({"error": "Invalid field: targets must be a non-empty list"}), 400
+    if len(targets) > MAX_GENERATE_TARGETS:
+        return jsonify({"error": f"Too many targets: {len(targets)}. Maximum: {MAX_GENERATE_TARGETS}"}), 400
+    error = validate_render_options(options)
+    if error:
+        return jsonify({"error": error}), 400
+
+    pairs = []
+    for i, target in enumerate(targets):
+        if not isinstance(target, dict):
+            return jsonify({"error": f"Invalid field: targets[{i}] must be an object"}), 400
+        card_type = target.get('cardType')
+        format_key = target.get('format', '1:1')
+        if card_type not in CARD_SCENE_BUILDERS:
+            return jsonify({
+                "error": f"Unknown card type in targets[{i}]: {card_type}",
+                "supported": list(CARD_SCENE_BUILDERS.keys())
+            }), 400
+        if format_key not in DIMENSIONS:
+            return jsonify({"error": f"Invalid format in targets[{i}]: {format_key}. "
+                                     f"Supported: {list(DIMENSIONS.keys())}"}), 400
+        if (card_type, format_key) in pairs:
+            return jsonify({"error": f"Duplicate target: {card_type} {format_key}"}), 400
+        pairs.append((card_type, format_key))
+
+    models = {}
+    for card_type, _ in pairs:
+        if card_type not in models:
+            try:
+                models[card_type] = decode_workout(card_type, workout_data)
+            except PayloadError as e:
+                return jsonify({"error": f"Invalid workoutData for {card_type}: {e}"}), 400
+
+    erg_models = [model for model in models.values() if isinstance(model, ErgWorkoutData)]
+    if records is not None and erg_models:
+        try:
+            telemetry = fold_telemetry_stream(records)
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": f"Malformed NDJSON stroke record: {e}"}), 400
+        for model in erg_models:
+            model.telemetry = telemetry
+
+    try:
+        scenes = [CARD_SCENE_BUILDERS[card_type](format_key, models[card_type], options)
+                  for card_type, format_key in pairs]
+        # Already imported by the scene builders above
+        from templates.scene import render_scenes
+        rendered = render_scenes(scenes, options)
+    except PayloadError as e:
+        return jsonify({"error": f"Invalid options: {e}"}), 400
+
+    mimetype = OUTPUT_MIMETYPES[options.get('output', 'png')]
+    return jsonify({"cards": [
+        {"cardType": card_type, "format": format_key, "mimetype": mimetype,
+         "data": base64.b64encode(card_bytes).decode('ascii')}
+        for (card_type, format_key), card_bytes in zip(pairs, rendered)
+    ]}), 200
+
+
+@app.route('/layout', methods=['POST'])
+def layout_cards():
+    """
+    Dry-run card layout: element boxes, font sizes and overflow flags as JSON
+
+    Runs each template's measurement and layout only - no surface, grain or
+    PNG encoding - so editors can validate titles and names cheaply.
+
+    Request body:
+    {
+        "cards": [
+            {"cardType": "...", "format": "1:1" | "9:16", "workoutData": { ... }, "options": { ... }},
+            ...
+        ]
+    }
+
+    Returns:
+    {
+        "cards": [
+            {"cardType": "...", "format": "1:1", "width": 2160, "height": 2160, "overflow": false,
+             "elements": [{"key": "title", "type": "Text", "bbox": [x, y, w, h],
+                           "fontSize": 64, "text": "...", "overflow": false}, ...]},
+            {"cardType": "...", "error": "..."},  # per-card validation errors
+            ...
+        ]
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data or not isinstance(data, dict):
+            return jsonify({"error": "Missing request body"}), 400
+
+        cards = data.get('cards')
+        if not isinstance(cards, list) or not cards:
+            return jsonify({"error": "Missing required field: cards (non-empty list)"}), 400
+        if len(cards) > MAX_LAYOUT_CARDS:
+            return jsonify({"error": f"Too many cards: {len(cards)}. Maximum: {MAX_LAYOUT_CARDS}"}), 400
+
+        results = []
+        for card in cards:
+            if not isinstance(card, dict):
+                results.append({"cardType": None, "format": None,
+                                "error": f"Invalid card: expected an object, got {type(card).__name__}"})
+                continue
+            card_type = card.get('cardType')
+            format_key = card.get('format', '1:1')
+            options = card.get('options', {})
+            result = {"cardType": card_type, "format": format_key}
+
+            if not isinstance(card_type, str) or card_type not in CARD_SCENE_BUILDERS:
+                result["error"] = f"Unknown card type: {card_type}"
+            elif not isinstance(format_key, str) or format_key not in DIMENSIONS:
+                result["error"] = f"Invalid format: {format_key}"
+            elif not isinstance(options, dict):
+                result["error"] = "Invalid options: expected an object"
+            else:
+                builder = CARD_SCENE_BUILDERS[card_type]
+                try:
+                    workout_data = decode_workout(card_type, card.get('workoutData', {}))
+                except PayloadError as e:
+                    result["error"] = f"Invalid workoutData: {e}"
+                else:
+                    try:
+                        scene = builder(format_key, workout_data, options)
+                    except PayloadError as e:
+                        result["error"] = f"Invalid options: {e}"
+                    else:
+                        result.update(scene.layout())
+            results.append(result)
+
+        return jsonify({"cards": results}), 200
+
+    except Exception as e:
+        error_detail = traceback.format_exc() if app.debug else str(e)
+        app.logger.error(f"Card layout failed: {error_detail}")
+
+        return jsonify({
+            "error": "Card layout failed",
+            "detail": str(e) if app.debug else "Internal server error"
+        }), 500
+
+
 if __name__ == '__main__':
     # Development server (use gunicorn in production via Dockerfile)
     app.run(host='0.0.0.0', port=5000, debug=True)
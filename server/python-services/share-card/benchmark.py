@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Render benchmark suite for share card templates
+
+Times every template/format/sample combination in-process (no HTTP) and
+reports min / median / p95 latency. Pass --check-golden to run the golden-image
+harness first, so a speedup is only reported once the output is unchanged.
+
+Usage:
+    python benchmark.py                     # all cases, 5 iterations
+    python benchmark.py -n 20 season_recap  # restrict to card types
+    python benchmark.py --check-golden      # gate on golden images first
+    python benchmark.py --telemetry         # sparkline/force-curve cost vs stroke count
+    python benchmark.py --stream            # peak decode memory, JSON vs NDJSON, vs stroke count
+    python benchmark.py --decode            # workoutData model decode/reject latency per sample
+    python benchmark.py --imports           # cold import time of each template module
+    python benchmark.py --outputs           # latency and size of PNG vs SVG vs PDF output
+    python benchmark.py --preview           # live editor preview latency against PREVIEW_BUDGET_MS
+    python benchmark.py --multi             # both formats per payload: separate renders vs one multi-target call
+"""
+
+import argparse
+import io
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from app import CARD_RENDERERS, CARD_SCENE_BUILDERS
+from samples import iter_cases, synthetic_telemetry, telemetry_ndjson, SAMPLE_PAYLOADS, DEFAULT_OPTIONS, FORMATS
+from templates.telemetry import ndjson_records, fold_telemetry_stream
+from templates.models import decode_workout, PayloadError
+from templates.registry import TEMPLATE_MANIFEST, OUTPUT_MIMETYPES
+from templates.scene import render_scenes
+import golden_images
+
+
+def time_case(card_type, format_key, workout_data, options, iterations):
+    """Render a case `iterations` times and return per-render latencies in ms"""
+    renderer = CARD_RENDERERS[card_type]
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        renderer(format_key, workout_data, options)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# Stroke counts from a 2K up to a long marathon
+TELEMETRY_STROKES = (200, 2000, 20000)
+
+
+def benchmark_telemetry(iterations):
+    """
+    Time erg_summary_alt with the sparkline and force-curve panels enabled at
+    increasing stroke counts; the panels reduce telemetry to fixed-size arrays,
+    so render time should not grow with the workout.
+    """
+    workout_data = SAMPLE_PAYLOADS['erg_summary_alt']['continuous']
+    options = dict(DEFAULT_OPTIONS, sparkline='pace', forceCurve=True)
+    print(f"{'case':<42} {'min':>9} {'median':>9} {'p95':>9}")
+    for strokes in TELEMETRY_STROKES:
+        data = dict(workout_data, telemetry=synthetic_telemetry(strokes))
+        for format_key in ('1:1', '9:16'):
+            time_case('erg_summary_alt', format_key, data, options, 1)
+            timings = time_case('erg_summary_alt', format_key, data, options, iterations)
+            case_name = f"telemetry-{strokes}-strokes-{format_key.replace(':', 'x')}"
+            print(f"{case_name:<42} {min(timings):>7.1f}ms {statistics.median(timings):>7.1f}ms "
+                  f"{percentile(timings, 95):>7.1f}ms")
+
+
+def peak_memory(fn):
+    """Run fn() and return (peak traced allocation in MB, elapsed ms)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1e6, elapsed
+
+
+def benchmark_stream():
+    """
+    Peak memory of decoding telemetry from one JSON body versus folding the
+    same strokes from an NDJSON stream; input bytes are built before tracing
+    so only decode-side allocations are counted.
+    """
+    print(f"{'strokes':>8} {'body':>9} {'json peak':>11} {'ndjson peak':>12} {'json':>9} {'ndjson':>9}")
+    for strokes in TELEMETRY_STROKES:
+        telemetry = synthetic_telemetry(strokes)
+        json_body = json.dumps({'workoutData': {'telemetry': telemetry}}).encode()
+        ndjson_body = telemetry_ndjson(telemetry)
+        del telemetry
+
+        json_peak, json_ms = peak_memory(lambda: json.loads(json_body))
+        ndjson_peak, ndjson_ms = peak_memory(
+            lambda: fold_telemetry_stream(ndjson_records(io.BytesIO(ndjson_body))))
+        print(f"{strokes:>8} {len(json_body) / 1e6:>7.1f}MB {json_peak:>9.1f}MB {ndjson_peak:>10.1f}MB "
+              f"{json_ms:>7.1f}ms {ndjson_ms:>7.1f}ms")
+
+
+def benchmark_decode(card_types, iterations):
+    """
+    Time decoding each sample's workoutData into its typed model, and
+    rejecting the same payload with its last list item corrupted
+    """
+    runs = max(iterations, 1) * 200
+    print(f"{'case':<42} {'decode':>10} {'reject':>10}")
+    for card_type, samples in SAMPLE_PAYLOADS.items():
+        if card_types and card_type not in card_types:
+            continue
+        for sample_name, workout_data in samples.items():
+            start = time.perf_counter()
+            for _ in range(runs):
+                decode_workout(card_type, workout_data)
+            decode_us = (time.perf_counter() - start) / runs * 1e6
+
+            # Worst case for early rejection: the bad value is the last one checked
+            lists = [key for key, value in workout_data.items() if isinstance(value, list) and value]
+            bad = dict(workout_data, **{lists[-1]: workout_data[lists[-1]][:-1] + [42]}) if lists else 42
+            start = time.perf_counter()
+            for _ in range(runs):
+                try:
+                    decode_workout(card_type, bad)
+                except PayloadError:
+                    pass
+            reject_us = (time.perf_counter() - start) / runs * 1e6
+            print(f"{card_type + '-' + sample_name:<42} {decode_us:>8.1f}us {reject_us:>8.1f}us")
+
+
+def benchmark_imports(card_types):
+    """
+    Cold import time of each template, each in a fresh interpreter so shared
+    modules (scene, base_template, numpy) count toward every template
+    """
+    script = ("import sys; from templates.registry import load_template, template_import_times; "
+              "load_template(sys.argv[1]); print(template_import_times()[sys.argv[1]])")
+    print(f"{'template':<20} {'import':>10}")
+    for card_type in TEMPLATE_MANIFEST:
+        if card_types and card_type not in card_types:
+            continue
+        result = subprocess.run([sys.executable, '-c', script, card_type],
+                                capture_output=True, text=True, check=True)
+        print(f"{card_type:<20} {float(result.stdout):>8.1f}ms")
+
+
+def benchmark_outputs(card_types, iterations):
+    """Latency and document size of each case rendered as PNG, SVG and PDF"""
+    print(f"{'case':<42} {'output':>6} {'median':>9} {'size':>10}")
+    for case_name, card_type, format_key, workout_data, options in iter_cases(card_types):
+        for output in OUTPUT_MIMETYPES:
+            output_options = dict(options, output=output)
+            size = len(CARD_RENDERERS[card_type](format_key, workout_data, output_options))
+            timings = time_case(card_type, format_key, workout_data, output_options, iterations)
+            print(f"{case_name:<42} {output:>6} {statistics.median(timings):>7.1f}ms {size / 1024:>8.1f}KB")
+
+
+# Editor previews re-render on every option toggle, so each must stay interactive
+PREVIEW_BUDGET_MS = 50
+
+
+def benchmark_preview(card_types, iterations):
+    """
+    Latency of options.preview renders per case, with the full render for
+    comparison. Exits non-zero when any preview's p95 is over budget.
+    """
+    print(f"{'case':<42} {'full':>9} {'preview':>9} {'p95':>9}")
+    over = []
+    for case_name, card_type, format_key, workout_data, options in iter_cases(card_types):
+        preview_options = dict(options, preview=True)
+        time_case(card_type, format_key, workout_data, options, 1)
+        time_case(card_type, format_key, workout_data, preview_options, 1)
+        full = time_case(card_type, format_key, workout_data, options, iterations)
+        preview = time_case(card_type, format_key, workout_data, preview_options, max(iterations, 20))
+        p95 = percentile(preview, 95)
+        flag = '' if p95 <= PREVIEW_BUDGET_MS else '  ✗ over budget'
+        if flag:
+            over.append(case_name)
+        print(f"{case_name:<42} {statistics.median(full):>7.1f}ms {statistics.median(preview):>7.1f}ms "
+              f"{p95:>7.1f}ms{flag}")
+    if over:
+        print(f"\n✗ {len(over)} case(s) over the {PREVIEW_BUDGET_MS}ms preview budget")
+        sys.exit(1)
+
+
+def benchmark_multi(card_types, iterations):
+    """
+    Both formats of each sample rendered as separate requests (decode and
+    build per format) versus one multi-target render (one decode)
+    """
+    print(f"{'case':<42} {'separate':>10} {'multi':>9}")
+    for card_type, samples in SAMPLE_PAYLOADS.items():
+        if card_types and card_type not in card_types:
+            continue
+        builder = CARD_SCENE_BUILDERS[card_type]
+        for sample_name, workout_data in samples.items():
+            def separate():
+                for format_key in FORMATS:
+                    CARD_RENDERERS[card_type](format_key, decode_workout(card_type, workout_data), DEFAULT_OPTIONS)
+
+            def multi():
+                model = decode_workout(card_type, workout_data)
+                render_scenes([builder(format_key, model, DEFAULT_OPTIONS) for format_key in FORMATS],
+                              DEFAULT_OPTIONS)
+
+            timings = {}
+            for name, fn in (('separate', separate), ('multi', multi)):
+                fn()
+                runs = []
+                for _ in range(iterations):
+                    start = time.perf_counter()
+                    fn()
+                    runs.append((time.perf_counter() - start) * 1000)
+                timings[name] = statistics.median(runs)
+            print(f"{card_type + '-' + sample_name:<42} {timings['separate']:>8.1f}ms {timings['multi']:>7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark share card rendering')
+    parser.add_argument('card_types', nargs='*', help='Restrict to these card types')
+    parser.add_argument('-n', '--iterations', type=int, default=5)
+    parser.add_argument('--check-golden', action='store_true',
+                        help='Run the golden-image harness before timing')
+    parser.add_argument('--telemetry', action='store_true',
+                        help='Time telemetry panels at increasing stroke counts instead of the sample matrix')
+    parser.add_argument('--stream', action='store_true',
+                        help='Compare peak decode memory of JSON and NDJSON telemetry bodies')
+    parser.add_argument('--decode', action='store_true',
+                        help='Time workoutData model decoding and rejection per sample')
+    parser.add_argument('--imports', action='store_true',
+                        help='Report the cold import time of each template module')
+    parser.add_argument('--outputs', action='store_true',
+                        help='Compare latency and size of PNG, SVG and PDF output per case')
+    parser.add_argument('--preview', action='store_true',
+                        help=f'Time editor preview renders against the {PREVIEW_BUDGET_MS}ms budget')
+    parser.add_argument('--multi', action='store_true',
+                        help='Compare per-format renders with one multi-target render per sample')
+    args = parser.parse_args()
+    card_types = args.card_types or None
+
+    if args.telemetry:
+        benchmark_telemetry(args.iterations)
+        return
+
+    if args.stream:
+        benchmark_stream()
+        return
+
+    if args.decode:
+        benchmark_decode(card_types, args.iterations)
+        return
+
+    if args.imports:
+        benchmark_imports(card_types)
+        return
+
+    if args.multi:
+        benchmark_multi(card_types, args.iterations)
+        return
+
+    if args.preview:
+        benchmark_preview(card_types, args.iterations)
+        return
+
+    if args.outputs:
+        benchmark_outputs(card_types, args.iterations)
+        return
+
+    if args.check_golden:
+        print("Checking golden images...\n")
+        failures = golden_images.run(card_types)
+        if failures:
+            print(f"\n✗ {len(failures)} case(s) drifted from their goldens - not benchmarking")
+            sys.exit(1)
+        print()
+
+    print(f"{'case':<42} {'min':>9} {'median':>9} {'p95':>9}")
+    for case_name, card_type, format_key, workout_data, options in iter_cases(card_types):
+        # Warm-up render (font map, imports) is excluded from the numbers
+        time_case(card_type, format_key, workout_data, options, 1)
+        timings = time_case(card_type, format_key, workout_data, options, args.iterations)
+        print(f"{case_name:<42} {min(timings):>7.1f}ms {statistics.median(timings):>7.1f}ms "
+              f"{percentile(timings, 95):>7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
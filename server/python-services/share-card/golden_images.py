@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression harness for share card rendering
+
+Renders every template/format/sample combination with deterministic grain and
+compares the result against the stored golden PNG in golden/. Comparison is
+perceptual: per-pixel differences are weighted by luminance and only pixels
+beyond a tolerance count towards the failure ratio, so anti-aliasing jitter
+does not fail the run but a shifted label does.
+
+With --incremental it instead checks dirty-region re-rendering: every case is
+rendered once with a cardKey under a variant of its options, re-rendered with
+the real options (repainting only the changed regions), and must match a full
+render pixel for pixel.
+
+Usage:
+    python golden_images.py                 # compare against goldens
+    python golden_images.py --update        # (re)record goldens
+    python golden_images.py --record-missing  # record only cases without a golden
+    python golden_images.py erg_summary_alt # restrict to card types
+    python golden_images.py --incremental   # incremental == full render
+
+Run inside the service image (fonts installed) so goldens match production.
+CI (.github/workflows/share-card-golden.yml) runs this through
+benchmark.py --check-golden on every change to the service, against the
+goldens committed in golden/; a case without one fails. Running that
+workflow manually records the missing goldens and commits them.
+"""
+
+import argparse
+import os
+import sys
+from io import BytesIO
+
+from PIL import Image, ImageChops
+
+from app import CARD_RENDERERS
+from samples import iter_cases
+from templates.base_template import set_grain_seed
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(SCRIPT_DIR, 'golden')
+DEFAULT_OUTPUT_DIR = '/tmp/share-card-golden-diffs'
+
+GOLDEN_SEED = 20260210
+
+# A pixel only counts as different when its luminance delta exceeds this (0-255)
+PIXEL_TOLERANCE = 12
+# Fraction of differing pixels allowed before a case fails
+MAX_DIFF_RATIO = 0.0005
+
+
+def render_case(card_type, format_key, workout_data, options):
+    """Render one case with seeded grain and return a decoded RGB image"""
+    set_grain_seed(GOLDEN_SEED)
+    try:
+        png_bytes = CARD_RENDERERS[card_type](format_key, workout_data, options)
+    finally:
+        set_grain_seed(None)
+    return Image.open(BytesIO(png_bytes)).convert('RGB')
+
+
+def compare_images(golden, actual, pixel_tolerance=PIXEL_TOLERANCE):
+    """
+    Perceptual comparison of two RGB images
+
+    Returns: (diff_ratio, max_delta, diff_mask) where diff_mask is an 'L' image
+             with 255 for every pixel beyond the tolerance
+    """
+    if golden.size != actual.size:
+        return 1.0, 255, None
+
+    # ImageChops.difference per channel, then ITU-R 601 luma weighting via convert('L')
+    delta = ImageChops.difference(golden, actual).convert('L')
+    histogram = delta.histogram()
+    total = golden.size[0] * golden.size[1]
+    differing = sum(histogram[pixel_tolerance + 1:])
+    max_delta = max((i for i, count in enumerate(histogram) if count), default=0)
+
+    diff_mask = delta.point(lambda v: 255 if v > pixel_tolerance else 0)
+    return differing / total, max_delta, diff_mask
+
+
+def write_diff_image(golden, actual, diff_mask, path):
+    """Write a diff image: dimmed golden with differing pixels highlighted in red"""
+    if diff_mask is None:
+        # Size mismatch - nothing to overlay, keep the actual render for inspection
+        actual.save(path)
+        return
+    base = Image.blend(golden, Image.new('RGB', golden.size, (0, 0, 0)), 0.7)
+    highlight = Image.new('RGB', golden.size, (255, 40, 40))
+    Image.composite(highlight, base, diff_mask).save(path)
+
+
+def run(card_types=None, update=False, output_dir=DEFAULT_OUTPUT_DIR,
+        pixel_tolerance=PIXEL_TOLERANCE, max_diff_ratio=MAX_DIFF_RATIO, record_missing=False):
+    """
+    Render and compare every case
+
+    Cases without a golden fail unless update is set, which (re)records them
+    all, or record_missing, which records just those and compares the rest.
+
+    Returns: list of failing case names (empty when everything matches)
+    """
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+    failures = []
+
+    for case_name, card_type, format_key, workout_data, options in iter_cases(card_types):
+        golden_path = os.path.join(GOLDEN_DIR, f'{case_name}.png')
+        actual = render_case(card_type, format_key, workout_data, options)
+
+        if update or (record_missing and not os.path.exists(golden_path)):
+            actual.save(golden_path)
+            print(f"  ● {case_name}: recorded golden")
+            continue
+        if not os.path.exists(golden_path):
+            # A missing golden checks nothing - fail until it is recorded on purpose
+            failures.append(case_name)
+            actual.save(os.path.join(output_dir, f'{case_name}.actual.png'))
+            print(f"  ✗ {case_name}: no golden in {GOLDEN_DIR} (record with --update)")
+            continue
+
+        golden = Image.open(golden_path).convert('RGB')
+        ratio, max_delta, diff_mask = compare_images(golden, actual, pixel_tolerance)
+
+        if ratio > max_diff_ratio:
+            failures.append(case_name)
+            actual.save(os.path.join(output_dir, f'{case_name}.actual.png'))
+            diff_path = os.path.join(output_dir, f'{case_name}.diff.png')
+            write_diff_image(golden, actual, diff_mask, diff_path)
+            print(f"  ✗ {case_name}: {ratio:.4%} pixels differ (max delta {max_delta}) → {diff_path}")
+        else:
+            print(f"  ✓ {case_name}: {ratio:.4%} pixels differ (max delta {max_delta})")
+
+    return failures
+
+
+# Option changes the incremental check starts from before re-rendering the real case
+INCREMENTAL_VARIANTS = (
+    {'showName': False},
+    {'showAttribution': False},
+    {'showName': False, 'showAttribution': False},
+)
+
+
+def run_incremental(card_types=None, output_dir=DEFAULT_OUTPUT_DIR):
+    """
+    Check that incremental re-renders are identical to full renders
+
+    Returns: list of failing case names
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    failures = []
+
+    for case_name, card_type, format_key, workout_data, options in iter_cases(card_types):
+        expected = render_case(card_type, format_key, workout_data, options)
+        for i, variant in enumerate(INCREMENTAL_VARIANTS):
+            card_key = f'golden-{case_name}-{i}'
+            render_case(card_type, format_key, workout_data, dict(options, cardKey=card_key, **variant))
+            actual = render_case(card_type, format_key, workout_data, dict(options, cardKey=card_key))
+
+            ratio, max_delta, diff_mask = compare_images(expected, actual, pixel_tolerance=0)
+            label = f"{case_name} from {variant}"
+            if max_delta:
+                failures.append(label)
+                diff_path = os.path.join(output_dir, f'{case_name}.incremental{i}.diff.png')
+                write_diff_image(expected, actual, diff_mask, diff_path)
+                print(f"  ✗ {label}: {ratio:.4%} pixels differ (max delta {max_delta}) → {diff_path}")
+            else:
+                print(f"  ✓ {label}")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Golden-image regression harness for share cards')
+    parser.add_argument('card_types', nargs='*', help='Restrict to these card types')
+    parser.add_argument('--update', action='store_true', help='Re-record golden images')
+    parser.add_argument('--record-missing', action='store_true',
+                        help='Record goldens only for cases that have none, compare the rest')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Check incremental re-renders against full renders instead of goldens')
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR, help='Where diff images are written')
+    parser.add_argument('--pixel-tolerance', type=int, default=PIXEL_TOLERANCE)
+    parser.add_argument('--max-diff-ratio', type=float, default=MAX_DIFF_RATIO)
+    args = parser.parse_args()
+
+    if args.incremental:
+        print("Checking incremental re-renders...\n")
+        failures = run_incremental(args.card_types or None, args.output_dir)
+        if failures:
+            print(f"\n✗ {len(failures)} incremental re-render(s) differ from a full render")
+            sys.exit(1)
+        print("\n✓ Incremental re-renders match full renders")
+        return
+
+    print("Rendering golden-image cases...\n")
+    failures = run(args.card_types or None, args.update, args.output_dir,
+                   args.pixel_tolerance, args.max_diff_ratio, args.record_missing)
+
+    if failures:
+        print(f"\n✗ {len(failures)} case(s) drifted from their goldens")
+        sys.exit(1)
+    print("\n✓ All cases match their goldens")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Sample payloads for every card template
+Shared by the golden-image harness and the benchmark suite so both exercise
+the exact same (cardType, sample) matrix.
+"""
+
+import json
+import math
+import random
+
+from templates.erg_summary import SAMPLE_ERG_SUMMARY
+from templates.erg_summary_alt import (
+    SAMPLE_ERG_CONTINUOUS, SAMPLE_ERG_INTERVALS, SAMPLE_ERG_JUST_ROW, SAMPLE_ERG_ODD_SPLITS
+)
+from templates.regatta_result import SAMPLE_REGATTA_RESULT
+from templates.regatta_summary import SAMPLE_REGATTA_SUMMARY
+from templates.season_recap import SAMPLE_SEASON_RECAP, SAMPLE_SEASON_WORKOUTS
+from templates.team_leaderboard import SAMPLE_LEADERBOARD
+
+FORMATS = ('1:1', '9:16')
+
+DEFAULT_OPTIONS = {
+    'showAttribution': True,
+    'showName': True,
+}
+
+# cardType -> {sample name -> workoutData}
+SAMPLE_PAYLOADS = {
+    'test': {'default': {}},
+    'erg_summary': {'2k': SAMPLE_ERG_SUMMARY},
+    'erg_summary_alt': {
+        'continuous': SAMPLE_ERG_CONTINUOUS,
+        'intervals': SAMPLE_ERG_INTERVALS,
+        'just_row': SAMPLE_ERG_JUST_ROW,
+        'odd_splits': SAMPLE_ERG_ODD_SPLITS,
+    },
+    'regatta_result': {'hocr': SAMPLE_REGATTA_RESULT},
+    'regatta_summary': {'hocr': SAMPLE_REGATTA_SUMMARY},
+    'season_recap': {'fall': SAMPLE_SEASON_RECAP, 'fall_raw': SAMPLE_SEASON_WORKOUTS},
+    'team_leaderboard': {'varsity': SAMPLE_LEADERBOARD},
+}
+
+
+def iter_cases(card_types=None):
+    """
+    Yield (case_name, card_type, format_key, workout_data, options) for every sample
+
+    Args:
+        card_types: Optional iterable restricting which card types are yielded
+    """
+    for card_type, samples in SAMPLE_PAYLOADS.items():
+        if card_types and card_type not in card_types:
+            continue
+        for sample_name, workout_data in samples.items():
+            for format_key in FORMATS:
+                case_name = f"{card_type}-{sample_name}-{format_key.replace(':', 'x')}"
+                yield case_name, card_type, format_key, workout_data, dict(DEFAULT_OPTIONS)
+
+
+def synthetic_telemetry(strokes, seed=0):
+    """
+    Deterministic per-stroke telemetry (series + force curves) for `strokes` strokes
+
+    Used to check that telemetry-driven panels cost the same to render whatever
+    the workout length.
+    """
+    rng = random.Random(seed)
+    t = 0.0
+    telemetry = {'timeSeriesS': [], 'wattsSeries': [], 'heartRateSeries': [],
+                 'strokeRateSeries': [], 'forceCurves': []}
+    for i in range(strokes):
+        rate = rng.randint(20, 32)
+        t += 60 / rate
+        peak = rng.uniform(160, 220)
+        readings = rng.randint(24, 40)
+        telemetry['timeSeriesS'].append(round(t, 1))
+        telemetry['wattsSeries'].append(int(220 + 25 * math.sin(i / 40) + rng.gauss(0, 8)))
+        telemetry['heartRateSeries'].append(int(140 + 40 * i / strokes))
+        telemetry['strokeRateSeries'].append(rate)
+        telemetry['forceCurves'].append([
+            round(peak * abs(math.sin(math.pi * k / (readings - 1))) ** 1.4 + rng.gauss(0, 4), 1)
+            for k in range(readings)
+        ])
+    return telemetry
+
+
+def telemetry_ndjson(telemetry):
+    """Encode telemetry as the NDJSON stroke lines /generate accepts (bytes, no header line)"""
+    strokes = zip(telemetry['timeSeriesS'], telemetry['wattsSeries'], telemetry['heartRateSeries'],
+                  telemetry['strokeRateSeries'], telemetry['forceCurves'])
+    return b''.join(
+        json.dumps({'t': t, 'watts': watts, 'heartRate': hr, 'strokeRate': rate, 'force': force},
+                   separators=(',', ':')).encode() + b'\n'
+        for t, watts, hr, rate, force in strokes
+    )
@@ -4,10 +4,17 @@ Provides reusable Cairo+Pango drawing functions for all card templates
 """
 
 import os
+import hashlib
 import cairocffi as cairo
 import pangocairocffi as pango
+import numpy as np
 from io import BytesIO
+from collections import OrderedDict, namedtuple
 import random
+import threading
+
+from templates.pixels import grain_pixels, surface_pixels, surface_rgb
+from templates.fonts import get_font_path, use_bundled_fonts
 
 # Color constants - Canvas design system colors
 DARK_BG = (0.03, 0.03, 0.04)  # #08080a
@@ -23,6 +30,52 @@ AMBER = (0.85, 0.65, 0.20)          # for accent highlights
 SLATE = (0.25, 0.27, 0.30)          # for subtle backgrounds
 DEEP_COPPER = (0.55, 0.35, 0.15)    # for darker accents
 
+PANGO_SCALE = 1024  # Pango uses 1/1024th of a point
+
+# Side of the repeating noise tile that stands in for full-canvas grain on vector output
+GRAIN_TILE_SIZE = 128
+
+# Grain noise source - reseed via set_grain_seed() for reproducible renders
+_grain_rng = random.Random()
+
+# Static layer display lists - layer key -> RecordingSurface (LRU bounded)
+_static_layers = OrderedDict()
+STATIC_LAYER_CACHE_SIZE = 256
+
+# Auto-fit results - (text, font, box, limits) -> FittedText (LRU bounded)
+_fitted_text = OrderedDict()
+FIT_CACHE_SIZE = 1024
+_fit_local = threading.local()
+
+# Decoded branding images - (source id, size) -> ImageSurface, LRU bounded by bytes.
+# size None is the full-resolution decode the scaled variants are made from.
+_branding_images = OrderedDict()
+_branding_lock = threading.Lock()
+BRANDING_IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+_branding_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+
+# Share-page QR codes - data -> (module count, merged module rects), LRU bounded
+_qr_codes = OrderedDict()
+QR_CACHE_SIZE = 1024
+
+# Branding image kind -> format -> box (width, height) it is drawn into
+BRANDING_IMAGE_SIZES = {
+    'team_logo': {'1:1': (160, 160), '9:16': (200, 200)},
+    'avatar': {'1:1': (144, 144), '9:16': (180, 180)},
+}
+
+ELLIPSIS = '\u2026'
+
+FittedText = namedtuple('FittedText', 'size lines width height overflow')
+FittedText.__doc__ = """
+Result of fit_text
+
+size: chosen font size in pixels
+lines: text of each line (last line ellipsized when overflow)
+width, height: widest line and total height in pixels
+overflow: True when the text did not fit even at the minimum size
+"""
+
 
 def hex_to_rgb(hex_color):
     """Convert hex color (#RRGGBB or RRGGBB) to RGB tuple (0-1 range)"""
@@ -33,23 +86,34 @@ def hex_to_rgb(hex_color):
     return (r, g, b)
 
 
-def get_font_path(font_file):
-    """Get absolute path to font file in fonts/ directory"""
-    script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    return os.path.join(script_dir, 'fonts', font_file)
-
-
-def setup_canvas(width, height):
+def setup_canvas(width, height, output='png', stream=None):
     """
     Create Cairo surface and context
 
+    Args:
+        output: 'png' for an ARGB32 image surface, or 'svg' / 'pdf' for a vector
+                surface one unit per canvas pixel
+        stream: File-like object vector surfaces write into; the document is
+                complete once surface.finish() is called
+
     Returns: (surface, ctx)
     """
-    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    if output == 'svg':
+        surface = cairo.SVGSurface(stream, width, height)
+        surface.set_document_unit(cairo.SVG_UNIT_PX)
+    elif output == 'pdf':
+        surface = cairo.PDFSurface(stream, width, height)
+    else:
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
     ctx = cairo.Context(surface)
     return surface, ctx
 
 
+def is_vector_target(ctx):
+    """True when ctx draws onto an SVG or PDF surface (no pixel buffer to post-process)"""
+    return isinstance(ctx.get_target(), (cairo.SVGSurface, cairo.PDFSurface))
+
+
 def draw_background(ctx, width, height, color=DARK_BG):
     """Fill background with solid color"""
     ctx.set_source_rgb(*color)
@@ -57,6 +121,171 @@ def draw_background(ctx, width, height, color=DARK_BG):
     ctx.fill()
 
 
+def font_description_string(font_family, font_size, weight='Regular'):
+    """
+    Build a Pango font description string
+
+    Pango uses point sizes, so pixel sizes are converted assuming 96 DPI.
+    """
+    font_pt = int(font_size * 0.75)
+    if font_family == 'IBM Plex Mono':
+        return f"IBM Plex Mono {weight} {font_pt}"
+    return f"IBM Plex Sans {weight} {font_pt}"
+
+
+def create_text_layout(ctx, text, font_family, font_size, weight='Regular'):
+    """
+    Create a Pango layout for a single run of text
+
+    Returns: pangocffi Layout bound to ctx
+    """
+    use_bundled_fonts()
+    layout = pango.create_layout(ctx)
+    layout._set_font_description(create_font_description(font_family, font_size, weight))
+    layout._set_text(text)
+    return layout
+
+
+def create_font_description(font_family, font_size, weight='Regular'):
+    """Returns: pangocffi FontDescription for a family/pixel size/weight"""
+    # Use pangocffi low-level API to create font description from string
+    # (families resolve against the fonts registered in templates.fonts)
+    from pangocffi import pango as pango_lib, FontDescription
+    font_desc_str = font_description_string(font_family, font_size, weight)
+    font_desc_ptr = pango_lib.pango_font_description_from_string(font_desc_str.encode('utf-8'))
+    return FontDescription(font_desc_ptr)
+
+
+def layout_pixel_size(layout):
+    """Logical size of a layout in pixels: (width, height)"""
+    width_units, height_units = layout.get_size()
+    return width_units / PANGO_SCALE, height_units / PANGO_SCALE
+
+
+def _fit_context():
+    # Pango layouts are not thread-safe - one scratch context per thread
+    ctx = getattr(_fit_local, 'ctx', None)
+    if ctx is None:
+        ctx = _fit_local.ctx = cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 1, 1))
+    return ctx
+
+
+def _wrap_lines(text, font_family, font_size, weight, max_width):
+    """
+    Wrap text at max_width with real Pango metrics
+
+    Returns: ([(line text, line width)], line height, broke_inside_word)
+    """
+    layout = create_text_layout(_fit_context(), text, font_family, font_size, weight)
+    layout.width = round(max_width * PANGO_SCALE)
+
+    raw = text.encode('utf-8')
+    line = layout.get_iter()
+    starts, widths = [], []
+    while True:
+        starts.append(line.get_index())
+        widths.append(line.get_line_extents()[1].width / PANGO_SCALE)
+        if not line.next_line():
+            break
+    ends = starts[1:] + [len(raw)]
+    lines = [(raw[a:b].decode('utf-8').strip(), w) for a, b, w in zip(starts, ends, widths)]
+
+    # Pango falls back to breaking inside a word that is wider than the box
+    broke_inside_word = any(
+        not (raw[:a].decode('utf-8')[-1:].isspace() or raw[:a].endswith(b'-')) for a in starts[1:]
+    )
+    return lines, layout_pixel_size(layout)[1] / len(lines), broke_inside_word
+
+
+def _ellipsize(text, font_family, font_size, weight, max_width):
+    """Longest prefix of text that fits max_width with an ellipsis appended"""
+    ctx = _fit_context()
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        candidate = text[:mid].rstrip() + ELLIPSIS
+        if layout_pixel_size(create_text_layout(ctx, candidate, font_family, font_size, weight))[0] <= max_width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + ELLIPSIS
+
+
+def fit_text(text, font_family, max_width, max_size, min_size=None, weight='Regular',
+             max_lines=1, max_height=None, line_height=None):
+    """
+    Fit text into a box: the largest font size whose word-wrapped lines fit
+
+    Binary-searches integer pixel sizes between min_size and max_size, wrapping
+    with real Pango metrics at each step. Results are memoized per text, font
+    and box, so repeated titles and names are only fitted once. When even
+    min_size does not fit, the text is cut to max_lines and ellipsized.
+
+    Args:
+        text: Text to fit
+        font_family: 'IBM Plex Sans' or 'IBM Plex Mono'
+        max_width: Box width in pixels
+        max_size: Preferred (largest) font size in pixels
+        min_size: Smallest acceptable size (defaults to max_size - wrap only)
+        max_lines: Maximum number of lines
+        max_height: Optional box height in pixels
+        line_height: Line step as a multiple of font size (defaults to Pango's line height)
+
+    Returns: FittedText
+    """
+    min_size = max_size if min_size is None else min_size
+    key = (text, font_family, weight, max_width, max_height, max_size, min_size, max_lines, line_height)
+    fitted = _fitted_text.get(key)
+    if fitted is not None:
+        _fitted_text.move_to_end(key)
+        return fitted
+
+    def attempt(size):
+        lines, natural_step, broke_inside_word = _wrap_lines(text, font_family, size, weight, max_width)
+        step = size * line_height if line_height else natural_step
+        height = step * len(lines)
+        fits = (len(lines) <= max_lines and not broke_inside_word
+                and max(w for _, w in lines) <= max_width
+                and (max_height is None or height <= max_height))
+        return fits, lines, height
+
+    fits, lines, height = attempt(max_size)
+    size = max_size
+    if not fits:
+        lo, hi = min_size, max_size - 1
+        best = None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            result = attempt(mid)
+            if result[0]:
+                best = (mid,) + result
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        if best is not None:
+            size, fits, lines, height = best
+        else:
+            size = min_size
+            _, lines, height = attempt(min_size)
+
+    if fits:
+        fitted = FittedText(size, [t for t, _ in lines], max(w for _, w in lines), height, False)
+    else:
+        # Keep what fits and ellipsize the remainder into the last line
+        kept = [t for t, _ in lines[:max_lines - 1]]
+        rest = ' '.join(t for t, _ in lines[max_lines - 1:])
+        if max_height is not None:
+            kept = kept[:max(0, int(max_height / (height / len(lines))) - 1)]
+        kept.append(_ellipsize(rest, font_family, size, weight, max_width))
+        widths = [layout_pixel_size(create_text_layout(_fit_context(), t, font_family, size, weight))[0] for t in kept]
+        fitted = FittedText(size, kept, max(widths), height / len(lines) * len(kept), True)
+
+    _fitted_text[key] = fitted
+    if len(_fitted_text) > FIT_CACHE_SIZE:
+        _fitted_text.popitem(last=False)
+    return fitted
+
+
 def draw_text(ctx, text, font_family, font_size, x, y, color=TEXT_PRIMARY, weight='Regular', align='left'):
     """
     Draw text using Pango with font loading and alignment
@@ -73,35 +302,8 @@ def draw_text(ctx, text, font_family, font_size, x, y, color=TEXT_PRIMARY, weigh
 
     Returns: (text_width, text_height) for layout calculations
     """
-    # Create Pango layout
-    layout = pango.create_layout(ctx)
-
-    # Map font family and weight to font description
-    # Pango uses point sizes, convert from pixels (assuming 96 DPI)
-    font_pt = int(font_size * 0.75)
-
-    # Build font description
-    # For now, use system fonts that Pango can find
-    # In Docker, fonts will be registered via fc-cache
-    if font_family == 'IBM Plex Mono':
-        font_desc_str = f"IBM Plex Mono {weight} {font_pt}"
-    else:  # IBM Plex Sans
-        font_desc_str = f"IBM Plex Sans {weight} {font_pt}"
-
-    # Use pangocffi low-level API to create font description from string
-    from pangocffi import pango as pango_lib, FontDescription
-    font_desc_ptr = pango_lib.pango_font_description_from_string(font_desc_str.encode('utf-8'))
-    font_desc = FontDescription(font_desc_ptr)
-    layout._set_font_description(font_desc)
-
-    # Set text
-    layout._set_text(text)
-
-    # Get text dimensions (get_size returns logical size, divide by PANGO_SCALE for pixels)
-    width_units, height_units = layout.get_size()
-    PANGO_SCALE = 1024  # Pango uses 1/1024th of a point
-    text_width = width_units / PANGO_SCALE
-    text_height = height_units / PANGO_SCALE
+    layout = create_text_layout(ctx, text, font_family, font_size, weight)
+    text_width, text_height = layout_pixel_size(layout)
 
     # Apply alignment offset
     if align == 'center':
@@ -117,6 +319,17 @@ def draw_text(ctx, text, font_family, font_size, x, y, color=TEXT_PRIMARY, weigh
     return text_width, text_height
 
 
+def draw_diagonal_background(ctx, width, height):
+    """Fill background with the dark diagonal gradient shared by the editorial cards"""
+    gradient = cairo.LinearGradient(0, 0, width, height)
+    gradient.add_color_stop_rgb(0, 0.03, 0.03, 0.04)
+    gradient.add_color_stop_rgb(0.5, 0.08, 0.06, 0.08)
+    gradient.add_color_stop_rgb(1, 0.12, 0.08, 0.06)
+    ctx.set_source(gradient)
+    ctx.rectangle(0, 0, width, height)
+    ctx.fill()
+
+
 def draw_gradient_rect(ctx, x, y, w, h, color_start, color_end, direction='vertical'):
     """
     Draw rectangle with linear gradient
@@ -173,6 +386,230 @@ def draw_panel(ctx, x, y, w, h, radius, bg_color, border_color=None):
         ctx.stroke()
 
 
+def has_static_layer(key):
+    """True when a display list for key has already been recorded"""
+    return key in _static_layers
+
+
+def draw_static_layer(ctx, key, width, height, draw_fn):
+    """
+    Draw a request-independent block from a cached display list
+
+    The first call records everything draw_fn draws into a Cairo RecordingSurface;
+    later calls with the same key replay it instead of re-running text layout
+    and path construction. Replay happens at the caller's point in the draw
+    order, so z-order is unchanged.
+
+    Args:
+        ctx: Cairo context to replay onto
+        key: Hashable cache key - must include the format and every option the
+             block depends on (e.g. team color), since the recording is reused verbatim
+        width, height: Canvas size (recording extents)
+        draw_fn: Callable taking a Cairo context that draws the static block
+    """
+    layer = _static_layers.get(key)
+    if layer is None:
+        layer = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, (0, 0, width, height))
+        draw_fn(cairo.Context(layer))
+        _static_layers[key] = layer
+        if len(_static_layers) > STATIC_LAYER_CACHE_SIZE:
+            _static_layers.popitem(last=False)
+    else:
+        _static_layers.move_to_end(key)
+
+    ctx.set_source_surface(layer, 0, 0)
+    ctx.paint()
+
+
+def _branding_source_id(source):
+    """Cache identity of an image: content hash for bytes, path + mtime + size for files"""
+    if isinstance(source, (bytes, bytearray)):
+        return ('sha1', hashlib.sha1(source).hexdigest())
+    path = os.path.abspath(source)
+    stat = os.stat(path)
+    return ('path', path, stat.st_mtime_ns, stat.st_size)
+
+
+def image_to_surface(image):
+    """Pillow RGB/RGBA image -> premultiplied ARGB32 ImageSurface"""
+    width, height = image.size
+    rgba = np.asarray(image.convert('RGBa'), dtype=np.uint32)
+    pixels = (rgba[..., 3] << 24) | (rgba[..., 0] << 16) | (rgba[..., 1] << 8) | rgba[..., 2]
+
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    surface.flush()
+    surface_pixels(surface)[...] = pixels
+    surface.mark_dirty()
+    return surface
+
+
+def _scale_box(image_size, box, fit):
+    """Pixel size of an image scaled into box: 'contain' fits inside, 'cover' fills and crops"""
+    (iw, ih), (bw, bh) = image_size, box
+    scale = (min if fit == 'contain' else max)(bw / iw, bh / ih)
+    return max(1, round(iw * scale)), max(1, round(ih * scale))
+
+
+def _decode_branding_image(source):
+    """Decode a PNG/JPEG (path or bytes) into a full-resolution premultiplied surface"""
+    from PIL import Image, ImageOps
+
+    image = Image.open(BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+    return image_to_surface(ImageOps.exif_transpose(image).convert('RGBA'))
+
+
+def _scale_branding_image(original, box, fit):
+    """Resample a decoded surface into box ('cover' is cropped to the box, centred)"""
+    ow, oh = original.get_width(), original.get_height()
+    sw, sh = _scale_box((ow, oh), box, fit)
+    width, height = box if fit == 'cover' else (sw, sh)
+
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    ctx = cairo.Context(surface)
+    ctx.translate((width - sw) / 2, (height - sh) / 2)
+    ctx.scale(sw / ow, sh / oh)
+    pattern = cairo.SurfacePattern(original)
+    pattern.set_filter(cairo.FILTER_BEST)
+    pattern.set_extend(cairo.EXTEND_PAD)
+    ctx.set_source(pattern)
+    ctx.paint()
+    surface.flush()
+    return surface
+
+
+def _cache_branding_image(key, surface):
+    """Insert under _branding_lock, evicting least recently used surfaces past the byte budget"""
+    nbytes = surface.get_stride() * surface.get_height()
+    # Another thread may have decoded the same image meanwhile
+    if key in _branding_images or nbytes > BRANDING_IMAGE_CACHE_BYTES:
+        return
+    _branding_images[key] = surface
+    _branding_stats['bytes'] += nbytes
+    while _branding_stats['bytes'] > BRANDING_IMAGE_CACHE_BYTES:
+        _, evicted = _branding_images.popitem(last=False)
+        _branding_stats['bytes'] -= evicted.get_stride() * evicted.get_height()
+        _branding_stats['evictions'] += 1
+
+
+def load_branding_image(source, kind, format_key, fit='contain'):
+    """
+    Decoded, premultiplied and pre-scaled team logo / avatar surface
+
+    Decoding (PNG or JPEG, via Pillow) and resampling happen once per image:
+    a miss decodes the source and scales it for every format of its kind, so
+    rendering the other format later is a cache hit. Scaling is done by Cairo
+    in premultiplied space, so transparent edges don't pick up dark fringes.
+    Cached surfaces are reused as-is, which also keeps Image node signatures
+    stable across renders.
+
+    Args:
+        source: Local file path, or the image file's bytes
+        kind: Key of BRANDING_IMAGE_SIZES ('team_logo', 'avatar')
+        format_key: '1:1' or '9:16'
+        fit: 'contain' scales inside the box, 'cover' fills it and crops the overflow
+
+    Returns: cairo.ImageSurface sized for the kind's box in that format
+    """
+    source_id = _branding_source_id(source)
+    boxes = BRANDING_IMAGE_SIZES[kind]
+    key = (source_id, boxes[format_key], fit)
+    with _branding_lock:
+        surface = _branding_images.get(key)
+        if surface is not None:
+            _branding_images.move_to_end(key)
+            _branding_stats['hits'] += 1
+            return surface
+        _branding_stats['misses'] += 1
+        original = _branding_images.get((source_id, None, None))
+
+    # Decode and resample outside the lock; the full-resolution surface is
+    # kept too, so a new fit or size never decodes again
+    if original is None:
+        original = _decode_branding_image(source)
+    variants = {box: _scale_branding_image(original, box, fit) for box in set(boxes.values())}
+
+    with _branding_lock:
+        _cache_branding_image((source_id, None, None), original)
+        for box, variant in variants.items():
+            _cache_branding_image((source_id, box, fit), variant)
+    return variants[boxes[format_key]]
+
+
+def branding_image_stats():
+    """Branding image cache counters: hits, misses, evictions, entries and bytes held"""
+    with _branding_lock:
+        return dict(_branding_stats, entries=len(_branding_images))
+
+
+def _merge_qr_modules(matrix):
+    """
+    Cover the dark modules with few rectangles: horizontal runs per row,
+    extended downward while the next row has the identical run
+    """
+    rects = []
+    growing = {}    # (x0, x1) -> first row of a run still being extended
+    for y, row in enumerate(matrix + [[]]):
+        runs = set()
+        x = 0
+        while x < len(row):
+            if row[x]:
+                start = x
+                while x < len(row) and row[x]:
+                    x += 1
+                runs.add((start, x))
+            x += 1
+        for run in [run for run in growing if run not in runs]:
+            top = growing.pop(run)
+            rects.append((run[0], top, run[1] - run[0], y - top))
+        for run in runs:
+            growing.setdefault(run, y)
+    return tuple(rects)
+
+
+def qr_code_rects(data):
+    """
+    QR code for data as (module count, rects), rects (x, y, w, h) in module units
+
+    The matrix (error correction M, no quiet zone) is generated and merged
+    once per data string and kept in an LRU, so cards in a batch that share
+    a URL - or re-render it - never re-encode.
+    """
+    entry = _qr_codes.get(data)
+    if entry is None:
+        import qrcode
+
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=0)
+        qr.add_data(data)
+        qr.make(fit=True)
+        matrix = qr.get_matrix()
+        entry = _qr_codes[data] = (len(matrix), _merge_qr_modules(matrix))
+        if len(_qr_codes) > QR_CACHE_SIZE:
+            _qr_codes.popitem(last=False)
+    else:
+        _qr_codes.move_to_end(data)
+    return entry
+
+
+def draw_qr_code(ctx, data, x, y, size, color=DARK_BG):
+    """
+    Draw a QR code for data filling a size x size square at (x, y)
+
+    All modules go into one path and one fill, so abutting rectangles leave
+    no antialiasing seams at fractional module sizes. The caller provides the
+    light background and quiet zone.
+    """
+    modules, rects = qr_code_rects(data)
+    ctx.save()
+    ctx.translate(x, y)
+    ctx.scale(size / modules, size / modules)
+    ctx.new_path()
+    for rect in rects:
+        ctx.rectangle(*rect)
+    ctx.set_source_rgb(*color)
+    ctx.fill()
+    ctx.restore()
+
+
 def draw_accent_stripe(ctx, x, y, w, h, color):
     """Draw accent stripe/highlight for team color injection"""
     ctx.set_source_rgb(*color)
@@ -180,30 +617,68 @@ def draw_accent_stripe(ctx, x, y, w, h, color):
     ctx.fill()
 
 
-def draw_grain_texture(ctx, width, height, opacity=0.03):
+def set_grain_seed(seed=None):
     """
-    Draw subtle noise/grain overlay for premium feel
+    Seed the grain noise generator
+
+    Golden-image comparisons need byte-stable output, so the harness seeds
+    the grain before every render. Passing None restores random grain.
+    """
+    _grain_rng.seed(seed)
+
+
+def create_grain_surface(width, height, opacity=0.03):
+    """
+    Generate the noise/grain overlay as its own surface
 
     Args:
         opacity: Grain opacity (0-1), default 0.03 per user decision
+
+    Returns: cairo.ImageSurface ready to composite with draw_grain_surface()
     """
-    # Create noise pattern
+    # One noise value per 4x4 cell, drawn column by column like the original
+    # per-cell fills so seeded renders keep their grain
+    columns, rows = -(-width // 4), -(-height // 4)
+    random_value = _grain_rng.random
+    noise = np.array([random_value() for _ in range(columns * rows)]).reshape(columns, rows).T * opacity
+
     grain_surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
-    grain_ctx = cairo.Context(grain_surface)
+    grain_surface.flush()
+    surface_pixels(grain_surface)[...] = grain_pixels(noise, 4, width, height)
+    grain_surface.mark_dirty()
+    return grain_surface
 
-    # Generate random noise
-    for i in range(0, width, 4):
-        for j in range(0, height, 4):
-            noise = random.random() * opacity
-            grain_ctx.set_source_rgba(1, 1, 1, noise)
-            grain_ctx.rectangle(i, j, 4, 4)
-            grain_ctx.fill()
 
-    # Composite onto main context
+def draw_grain_surface(ctx, grain_surface):
+    """Composite a grain surface from create_grain_surface() onto ctx"""
     ctx.set_source_surface(grain_surface, 0, 0)
     ctx.paint()
 
 
+def draw_grain_tile(ctx, grain_tile):
+    """
+    Cover ctx with a small grain surface repeated edge to edge
+
+    Vector output uses this instead of a full-canvas grain surface: the
+    document embeds one GRAIN_TILE_SIZE image instead of a canvas-sized one.
+    """
+    pattern = cairo.SurfacePattern(grain_tile)
+    pattern.set_extend(cairo.EXTEND_REPEAT)
+    pattern.set_filter(cairo.FILTER_NEAREST)
+    ctx.set_source(pattern)
+    ctx.paint()
+
+
+def draw_grain_texture(ctx, width, height, opacity=0.03):
+    """
+    Draw subtle noise/grain overlay for premium feel
+
+    Args:
+        opacity: Grain opacity (0-1), default 0.03 per user decision
+    """
+    draw_grain_surface(ctx, create_grain_surface(width, height, opacity))
+
+
 def draw_gradient_text(ctx, text, font_family, font_size, x, y, color_start, color_end):
     """
     Draw text with gradient fill
@@ -219,25 +694,8 @@ def draw_gradient_text(ctx, text, font_family, font_size, x, y, color_start, col
 
     Returns: (text_width, text_height)
     """
-    # Create Pango layout
-    layout = pango.create_layout(ctx)
-    font_pt = int(font_size * 0.75)
-
-    if font_family == 'IBM Plex Mono':
-        font_desc_str = f"IBM Plex Mono Regular {font_pt}"
-    else:
-        font_desc_str = f"IBM Plex Sans Regular {font_pt}"
-
-    from pangocffi import pango as pango_lib, FontDescription
-    font_desc_ptr = pango_lib.pango_font_description_from_string(font_desc_str.encode('utf-8'))
-    font_desc = FontDescription(font_desc_ptr)
-    layout._set_font_description(font_desc)
-    layout._set_text(text)
-
-    width_units, height_units = layout.get_size()
-    PANGO_SCALE = 1024
-    text_width = width_units / PANGO_SCALE
-    text_height = height_units / PANGO_SCALE
+    layout = create_text_layout(ctx, text, font_family, font_size)
+    text_width, text_height = layout_pixel_size(layout)
 
     # Create gradient
     gradient = cairo.LinearGradient(x, y, x + text_width, y)
@@ -267,6 +725,13 @@ def draw_horizontal_rule(ctx, x, y, width, color, thickness=2):
     ctx.fill()
 
 
+def branding_position(width, height, format_key):
+    """Return (x, y) anchor of the centered "Made with oarbit" attribution"""
+    if format_key == '1:1':
+        return width / 2, height - 80  # Bottom center
+    return width / 2, height - 120  # 9:16 - bottom center with more padding
+
+
 def draw_oarbit_branding(ctx, width, height, format_key, options):
     """
     Draw "Made with oarbit" attribution
@@ -278,94 +743,93 @@ def draw_oarbit_branding(ctx, width, height, format_key, options):
     if not options.get('showAttribution', True):
         return
 
-    # Position based on format
-    if format_key == '1:1':
-        x = width / 2
-        y = height - 80  # Bottom center
-    else:  # 9:16
-        x = width / 2
-        y = height - 120  # Bottom center with more padding
-
-    # Draw branding text
-    draw_text(
-        ctx,
-        "Made with oarbit",
-        "IBM Plex Sans",
-        28,
-        x, y,
-        TEXT_MUTED,
-        weight='Regular',
-        align='center'
+    x, y = branding_position(width, height, format_key)
+
+    # Draw branding text (identical on every card of this format)
+    draw_static_layer(
+        ctx, ('branding', format_key), width, height,
+        lambda layer_ctx: draw_text(
+            layer_ctx,
+            "Made with oarbit",
+            "IBM Plex Sans",
+            28,
+            x, y,
+            TEXT_MUTED,
+            weight='Regular',
+            align='center'
+        )
     )
 
 
-def surface_to_png_bytes(surface):
-    """Write Cairo surface to PNG bytes"""
+def surface_to_png_bytes(surface, compress_level=None):
+    """
+    Write Cairo surface to PNG bytes
+
+    Args:
+        compress_level: zlib level (0-9) to encode an opaque card through Pillow
+                        instead of Cairo's fixed default - 1 is several times faster
+    """
     buffer = BytesIO()
-    surface.write_to_png(buffer)
+    if compress_level is None:
+        surface.write_to_png(buffer)
+    else:
+        surface.flush()
+        surface_rgb(surface).save(buffer, format='PNG', compress_level=compress_level)
     return buffer.getvalue()
 
 
-def render_test_card(format_key, workout_data=None, options=None):
+def build_test_card_scene(format_key, workout_data=None, options=None):
     """
-    Render a test card to verify the rendering pipeline
+    Build the pipeline test card scene
 
-    This is called by app.py when cardType='test'
     Tests: background, panels, text rendering, gradients, branding
 
-    Args:
-        format_key: '1:1' or '9:16'
-        workout_data: Ignored for test card
-        options: Dict with rendering options
-
-    Returns: PNG bytes
+    Returns: unresolved Scene
     """
+    # Imported here - scene builds on the helpers in this module
+    from templates.scene import Scene, Group, Text, Rect, Gradient, Shape
+
     if options is None:
         options = {}
 
-    # Get dimensions (defined locally to avoid circular import)
-    DIMENSIONS = {
-        '1:1': (2160, 2160),
-        '9:16': (2160, 3840),
-    }
-    width, height = DIMENSIONS[format_key]
-
-    # Setup canvas
-    surface, ctx = setup_canvas(width, height)
+    scene = Scene('test', format_key)
+    width, height = scene.width, scene.height
 
-    # Draw background
-    draw_background(ctx, width, height, DARK_BG)
+    # Background
+    scene.add(Rect(0, 0, width, height, DARK_BG))
 
-    # Draw main panel (warm accent panel style)
+    # Main panel (warm accent panel style)
     panel_padding = 120
     panel_width = width - (panel_padding * 2)
     panel_height = 400
 
     # Gradient panel background (dark to slightly lighter)
-    draw_gradient_rect(
-        ctx,
+    scene.add(Gradient(
         panel_padding, 200,
         panel_width, panel_height,
         (0.05, 0.05, 0.06),  # Slightly lighter than DARK_BG
         (0.08, 0.08, 0.10),
         direction='vertical'
-    )
+    ))
 
     # Panel border
-    draw_rounded_rect(ctx, panel_padding, 200, panel_width, panel_height, 24)
-    ctx.set_source_rgb(*COPPER)
-    ctx.set_line_width(2)
-    ctx.stroke()
+    def draw_border(ctx):
+        draw_rounded_rect(ctx, panel_padding, 200, panel_width, panel_height, 24)
+        ctx.set_source_rgb(*COPPER)
+        ctx.set_line_width(2)
+        ctx.stroke()
+    scene.add(Shape(draw_border, bbox=(panel_padding - 1, 199, panel_width + 2, panel_height + 2),
+                    signature=('panel_border',)))
 
     # Accent stripe at top
-    draw_accent_stripe(ctx, panel_padding + 24, 200, 120, 6, COPPER)
+    scene.add(Rect(panel_padding + 24, 200, 120, 6, COPPER))
 
     # Test text samples at different sizes
-    draw_text(ctx, "Share Card Test", "IBM Plex Sans", 72, width / 2, 280, TEXT_PRIMARY, weight='Bold', align='center')
-    draw_text(ctx, "Cairo+Pango rendering pipeline", "IBM Plex Sans", 32, width / 2, 380, TEXT_SECONDARY, weight='Regular', align='center')
+    scene.add(Text("Share Card Test", "IBM Plex Sans", 72, width / 2, 280, TEXT_PRIMARY, weight='Bold', align='center'))
+    scene.add(Text("Cairo+Pango rendering pipeline", "IBM Plex Sans", 32, width / 2, 380, TEXT_SECONDARY, weight='Regular', align='center'))
 
     # Test monospace font for data display
-    draw_text(ctx, "Split: 1:45.3", "IBM Plex Mono", 28, width / 2, 480, TEXT_PRIMARY, weight='Regular', align='center')
+    scene.add(Text("Split: 1:45.3", "IBM Plex Mono", 28, width / 2, 480, TEXT_PRIMARY, weight='Regular', align='center'))
 
     # Test color palette
     color_y = 700
@@ -377,21 +841,38 @@ def render_test_card(format_key, workout_data=None, options=None):
         ("Secondary", TEXT_SECONDARY),
     ]
 
+    palette = scene.add(Group(key='palette'))
     color_x_start = (width - (len(colors) * 180)) / 2
     for i, (name, color) in enumerate(colors):
         x = color_x_start + (i * 180)
         # Color swatch
-        ctx.set_source_rgb(*color)
-        ctx.rectangle(x, color_y, 120, 80)
-        ctx.fill()
+        palette.add(Rect(x, color_y, 120, 80, color))
         # Label
-        draw_text(ctx, name, "IBM Plex Sans", 20, x + 60, color_y + 100, TEXT_MUTED, align='center')
+        palette.add(Text(name, "IBM Plex Sans", 20, x + 60, color_y + 100, TEXT_MUTED, align='center'))
 
     # Add subtle grain texture
-    draw_grain_texture(ctx, width, height, opacity=0.03)
+    scene.add_grain(opacity=0.03)
 
     # Add branding
-    draw_oarbit_branding(ctx, width, height, format_key, options)
+    scene.add_branding(options)
+    scene.add_share_qr(options)
+
+    return scene
+
+
+def render_test_card(format_key, workout_data=None, options=None):
+    """
+    Render a test card to verify the rendering pipeline
+
+    This is called by app.py when cardType='test'
+
+    Args:
+        format_key: '1:1' or '9:16'
+        workout_data: Ignored for test card
+        options: Dict with rendering options
+
+    Returns: PNG bytes
+    """
+    from templates.scene import render_scene
 
-    # Convert to PNG bytes
-    return surface_to_png_bytes(surface)
+    return render_scene(build_test_card_scene(format_key, workout_data, options), options)
@@ -4,16 +4,13 @@ Data-forward layout with warm copper accents and geometric precision
 """
 
 from templates.base_template import (
-    setup_canvas, draw_background, draw_text, draw_gradient_rect,
-    draw_rounded_rect, draw_panel, draw_accent_stripe, draw_grain_texture,
-    draw_oarbit_branding, surface_to_png_bytes,
+    draw_background, draw_gradient_rect,
     DARK_BG, COPPER, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED
 )
-
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
+from templates.scene import (
+    Scene, render_scene, Group, Text, Rect, Panel, Shape, Table, Column, fitted_line
+)
+from templates.models import ErgSummaryData
 
 
 def format_time(seconds):
@@ -31,7 +28,108 @@ def format_pace(seconds_per_500m):
     return f"{mins}:{secs:04.1f}"
 
 
-def render_erg_summary(format_key, workout_data, options):
+# Layout constants shared by the static layers and the data-bound drawing
+HEADER_HEIGHT = 480
+GRID_Y = HEADER_HEIGHT + 100
+GRID_Y2 = GRID_Y + 200
+GRID_SPACING = 380
+SPLITS_Y = GRID_Y2 + 220
+PANEL_PADDING = 120
+
+
+def metric_grid_positions(width):
+    """Return ([row 1 x positions], [row 2 x positions]) for the metric grid"""
+    row1_start_x = (width - (3 * GRID_SPACING)) / 2 + (GRID_SPACING / 2)
+    row2_start_x = (width - (2 * GRID_SPACING * 1.2)) / 2 + (GRID_SPACING * 0.6)
+    return (
+        [row1_start_x + (i * GRID_SPACING) for i in range(3)],
+        [row2_start_x + (i * GRID_SPACING * 1.2) for i in range(2)],
+    )
+
+
+def splits_column_x(width, is_story):
+    """Return x positions of the splits table columns (Split, Pace, Watts, SR[, HR])"""
+    panel_width = width - (PANEL_PADDING * 2)
+    xs = [
+        PANEL_PADDING + 120,
+        PANEL_PADDING + panel_width * 0.35,
+        PANEL_PADDING + panel_width * 0.55,
+        PANEL_PADDING + panel_width * 0.75,
+    ]
+    if is_story:
+        xs.append(PANEL_PADDING + panel_width * 0.88)
+    return xs
+
+
+def draw_header_background(ctx, width, height):
+    """Static layer: dark background with the copper header gradient"""
+    draw_background(ctx, width, height, DARK_BG)
+    draw_gradient_rect(
+        ctx, 0, 0, width, HEADER_HEIGHT,
+        (0.72, 0.45, 0.20),  # Copper
+        (0.08, 0.08, 0.10),  # Fade to dark
+        direction='vertical'
+    )
+
+
+def metric_label_nodes(width):
+    """Static nodes: labels under the metric grid values"""
+    row1_xs, row2_xs = metric_grid_positions(width)
+    nodes = [
+        Text(label, "IBM Plex Sans", 28, x, GRID_Y + 70, TEXT_MUTED, weight='Regular', align='center')
+        for x, label in zip(row1_xs, ("Avg Power", "Avg HR", "Avg SR"))
+    ]
+    nodes += [
+        Text(label, "IBM Plex Sans", 28, x, GRID_Y2 + 70, TEXT_MUTED, weight='Regular', align='center')
+        for x, label in zip(row2_xs, ("Distance", "Duration"))
+    ]
+    return nodes
+
+
+def splits_header_nodes(width, is_story):
+    """Static nodes: "Splits" title and column headers"""
+    header_y = SPLITS_Y + 70
+    nodes = [Text("Splits", "IBM Plex Sans", 40, width / 2, header_y, TEXT_PRIMARY, weight='Bold', align='center')]
+
+    col_header_y = header_y + 80
+    labels = ["Split", "Pace", "Watts", "SR", "HR"]
+    nodes += [
+        Text(label, "IBM Plex Sans", 28, x, col_header_y, TEXT_MUTED, weight='SemiBold', align='left')
+        for x, label in zip(splits_column_x(width, is_story), labels)
+    ]
+    return nodes
+
+
+def draw_geometric_accents(ctx, width, height):
+    """Static layer: chamfered corners and ruled-line texture"""
+    # Chamfered corner accent (top right)
+    accent_size = 80
+    ctx.set_source_rgb(*COPPER)
+    ctx.move_to(width - accent_size, 0)
+    ctx.line_to(width, 0)
+    ctx.line_to(width, accent_size)
+    ctx.close_path()
+    ctx.fill()
+
+    # Bottom left chamfered corner
+    ctx.set_source_rgb(*COPPER)
+    ctx.move_to(0, height - accent_size)
+    ctx.line_to(0, height)
+    ctx.line_to(accent_size, height)
+    ctx.close_path()
+    ctx.fill()
+
+    # Subtle ruled lines as texture
+    ctx.set_source_rgba(0.72, 0.45, 0.20, 0.15)  # Copper with low opacity
+    ctx.set_line_width(2)
+    for i in range(3):
+        y_pos = 40 + (i * 12)
+        ctx.move_to(width - 300, y_pos)
+        ctx.line_to(width - 120, y_pos)
+        ctx.stroke()
+
+
+def build_erg_summary_scene(format_key, workout_data, options):
     """
     Design A: Evolved v5 - Data-forward precision instrument
 
@@ -43,225 +141,171 @@ def render_erg_summary(format_key, workout_data, options):
     - Splits table (abbreviated for square, full for story)
     - Geometric shapes as decorative elements
     - Clean, structured dashboard feel
+
+    Returns: unresolved Scene
     """
-    width, height = DIMENSIONS[format_key]
+    workout = ErgSummaryData.coerce(workout_data)
+    scene = Scene('erg_summary', format_key)
+    width, height = scene.width, scene.height
     is_story = format_key == '9:16'
 
-    # Setup canvas
-    surface, ctx = setup_canvas(width, height)
-    draw_background(ctx, width, height, DARK_BG)
-
     # --- TOP SECTION: Copper gradient panel ---
-    header_height = 480
-    draw_gradient_rect(
-        ctx, 0, 0, width, header_height,
-        (0.72, 0.45, 0.20),  # Copper
-        (0.08, 0.08, 0.10),  # Fade to dark
-        direction='vertical'
-    )
+    scene.add(Group([
+        Shape(lambda ctx: draw_header_background(ctx, width, height)),
+    ], static_key=('background',)))
+    scene.add_photo_background(options)
 
     # Workout title at top
     title_y = 100
-    draw_text(
-        ctx, workout_data['title'], "IBM Plex Sans", 64,
-        width / 2, title_y, TEXT_PRIMARY, weight='Bold', align='center'
-    )
+    scene.add(fitted_line(
+        workout.title, "IBM Plex Sans", width / 2, title_y, width - 240, 64, 44,
+        TEXT_PRIMARY, weight='Bold', align='center', key='title'
+    ))
 
     # Date below title
     date_y = title_y + 90
-    draw_text(
-        ctx, workout_data['date'], "IBM Plex Sans", 32,
-        width / 2, date_y, TEXT_SECONDARY, weight='Regular', align='center'
-    )
+    scene.add(Text(
+        workout.date, "IBM Plex Sans", 32,
+        width / 2, date_y, TEXT_SECONDARY, weight='Regular', align='center', key='date'
+    ))
 
     # --- HERO METRIC (adaptive based on workout type) ---
     hero_y = 280
 
     # Determine hero metric based on workout type
-    if '2k' in workout_data['type'].lower() or 'test' in workout_data['type'].lower():
+    workout_type = workout.type.lower()
+    if '2k' in workout_type or 'test' in workout_type:
         # For test pieces: show total time as hero
-        hero_value = workout_data['total_time']
+        hero_value = workout.total_time
         hero_label = "Total Time"
     else:
         # For steady-state: show avg pace as hero
-        hero_value = workout_data['avg_pace']
+        hero_value = workout.avg_pace
         hero_label = "Avg Pace"
 
-    # Draw hero metric (large)
-    draw_text(
-        ctx, hero_value, "IBM Plex Mono", 140,
-        width / 2, hero_y, TEXT_PRIMARY, weight='Bold', align='center'
-    )
+    # Hero metric (large)
+    scene.add(Text(
+        hero_value, "IBM Plex Mono", 140,
+        width / 2, hero_y, TEXT_PRIMARY, weight='Bold', align='center', key='hero'
+    ))
 
-    # Draw hero label
+    # Hero label
     label_y = hero_y + 170
-    draw_text(
-        ctx, hero_label, "IBM Plex Sans", 36,
-        width / 2, label_y, TEXT_SECONDARY, weight='Regular', align='center'
-    )
+    scene.add(Text(
+        hero_label, "IBM Plex Sans", 36,
+        width / 2, label_y, TEXT_SECONDARY, weight='Regular', align='center', key='hero_label'
+    ))
 
     # --- COPPER ACCENT STRIPE (separator) ---
-    stripe_y = header_height
-    draw_accent_stripe(ctx, 0, stripe_y, width, 6, COPPER)
+    scene.add(Rect(0, HEADER_HEIGHT, width, 6, COPPER))
 
     # --- SECONDARY METRICS GRID ---
-    grid_y = stripe_y + 100
-    grid_spacing = 380
-
-    # Row 1: Watts, HR, Stroke Rate
-    metrics_row1 = [
-        (f"{workout_data['avg_watts']}w", "Avg Power"),
-        (f"{workout_data['avg_heart_rate']} bpm", "Avg HR"),
-        (f"{workout_data['avg_stroke_rate']} spm", "Avg SR"),
+    row1_xs, row2_xs = metric_grid_positions(width)
+
+    # Row 1: Watts, HR, Stroke Rate / Row 2: Distance, Duration
+    metric_values = [
+        (row1_xs[0], GRID_Y, f"{workout.avg_watts}w"),
+        (row1_xs[1], GRID_Y, f"{workout.avg_heart_rate} bpm"),
+        (row1_xs[2], GRID_Y, f"{workout.avg_stroke_rate} spm"),
+        (row2_xs[0], GRID_Y2, f"{workout.distance_m:,}m"),
+        (row2_xs[1], GRID_Y2, format_time(workout.duration_seconds)),
     ]
 
-    row1_start_x = (width - (len(metrics_row1) * grid_spacing)) / 2 + (grid_spacing / 2)
-
-    for i, (value, label) in enumerate(metrics_row1):
-        x = row1_start_x + (i * grid_spacing)
+    scene.add(Group([
+        Text(value, "IBM Plex Mono", 52, x, y, TEXT_PRIMARY, weight='SemiBold', align='center')
+        for x, y, value in metric_values
+    ], key='metrics'))
 
-        # Value
-        draw_text(
-            ctx, value, "IBM Plex Mono", 52,
-            x, grid_y, TEXT_PRIMARY, weight='SemiBold', align='center'
-        )
-
-        # Label
-        draw_text(
-            ctx, label, "IBM Plex Sans", 28,
-            x, grid_y + 70, TEXT_MUTED, weight='Regular', align='center'
-        )
-
-    # Row 2: Distance, Duration
-    grid_y2 = grid_y + 200
-    metrics_row2 = [
-        (f"{workout_data['distance_m']:,}m", "Distance"),
-        (format_time(workout_data['duration_seconds']), "Duration"),
-    ]
-
-    row2_start_x = (width - (len(metrics_row2) * grid_spacing * 1.2)) / 2 + (grid_spacing * 0.6)
-
-    for i, (value, label) in enumerate(metrics_row2):
-        x = row2_start_x + (i * grid_spacing * 1.2)
-
-        # Value
-        draw_text(
-            ctx, value, "IBM Plex Mono", 52,
-            x, grid_y2, TEXT_PRIMARY, weight='SemiBold', align='center'
-        )
-
-        # Label
-        draw_text(
-            ctx, label, "IBM Plex Sans", 28,
-            x, grid_y2 + 70, TEXT_MUTED, weight='Regular', align='center'
-        )
+    scene.add(Group(metric_label_nodes(width), static_key=('metric_labels',)))
 
     # --- SPLITS TABLE ---
-    splits_y = grid_y2 + 220
+    splits_y = SPLITS_Y
 
     # Panel for splits
-    panel_padding = 120
+    panel_padding = PANEL_PADDING
     panel_width = width - (panel_padding * 2)
 
     # Determine number of splits to show
-    splits_to_show = workout_data['splits'][:4] if not is_story else workout_data['splits']
+    splits_to_show = workout.splits[:4] if not is_story else workout.splits
 
     # Calculate panel height based on splits
     splits_row_height = 80
     splits_header_height = 100
     panel_height = splits_header_height + (len(splits_to_show) * splits_row_height) + 80
 
-    # Draw panel
-    draw_panel(
-        ctx, panel_padding, splits_y, panel_width, panel_height,
-        radius=24, bg_color=(0.05, 0.05, 0.06), border_color=COPPER
-    )
-
-    # Splits table header
-    header_y = splits_y + 70
-    draw_text(
-        ctx, "Splits", "IBM Plex Sans", 40,
-        width / 2, header_y, TEXT_PRIMARY, weight='Bold', align='center'
-    )
-
-    # Column headers
-    col_header_y = header_y + 80
-    col_positions = [
-        (panel_padding + 120, "Split"),
-        (panel_padding + panel_width * 0.35, "Pace"),
-        (panel_padding + panel_width * 0.55, "Watts"),
-        (panel_padding + panel_width * 0.75, "SR"),
-    ]
+    scene.add(Panel(
+        panel_padding, splits_y, panel_width, panel_height, 24,
+        (0.05, 0.05, 0.06), border_color=COPPER, key='splits_panel'
+    ))
 
-    if is_story:
-        col_positions.append((panel_padding + panel_width * 0.88, "HR"))
-
-    for x, label in col_positions:
-        draw_text(
-            ctx, label, "IBM Plex Sans", 28,
-            x, col_header_y, TEXT_MUTED, weight='SemiBold', align='left'
-        )
+    # Splits table header + column headers
+    scene.add(Group(splits_header_nodes(width, is_story), static_key=('splits_headers',)))
 
     # Splits rows
-    row_y = col_header_y + 60
+    table = scene.add(Table(
+        [Column(x, size=32) for x in splits_column_x(width, is_story)], key='splits'
+    ))
+    row_y = splits_y + 70 + 80 + 60
     for split in splits_to_show:
-        row_data = [
-            (panel_padding + 120, f"#{split['split_number']}"),
-            (panel_padding + panel_width * 0.35, split['pace']),
-            (panel_padding + panel_width * 0.55, f"{split['watts']}"),
-            (panel_padding + panel_width * 0.75, f"{split['stroke_rate']}"),
+        values = [
+            f"#{split.split_number}",
+            split.pace,
+            f"{split.watts}",
+            f"{split.stroke_rate}",
         ]
 
         if is_story:
-            row_data.append((panel_padding + panel_width * 0.88, f"{split['heart_rate']}"))
-
-        for x, value in row_data:
-            draw_text(
-                ctx, str(value), "IBM Plex Mono", 32,
-                x, row_y, TEXT_PRIMARY, weight='Regular', align='left'
-            )
+            values.append(f"{split.heart_rate}" if split.heart_rate is not None else '--')
 
+        table.add_row(row_y, [str(value) for value in values])
         row_y += splits_row_height
 
     # --- ATHLETE NAME (if enabled) ---
     if options.get('showName', True):
         name_y = row_y + 120 if not is_story else row_y + 80
-        draw_text(
-            ctx, workout_data.get('athlete_name', 'Athlete'), "IBM Plex Sans", 36,
-            width / 2, name_y, TEXT_SECONDARY, weight='SemiBold', align='center'
-        )
+        scene.add(fitted_line(
+            workout.athlete_name, "IBM Plex Sans", width / 2, name_y, width - 240, 36, 28,
+            TEXT_SECONDARY, weight='SemiBold', align='center', key='athlete_name'
+        ))
 
     # --- GEOMETRIC DECORATIVE ELEMENTS ---
-    # Chamfered corner accent (top right)
-    accent_size = 80
-    ctx.set_source_rgb(*COPPER)
-    ctx.move_to(width - accent_size, 0)
-    ctx.line_to(width, 0)
-    ctx.line_to(width, accent_size)
-    ctx.close_path()
-    ctx.fill()
-
-    # Bottom left chamfered corner
-    ctx.set_source_rgb(*COPPER)
-    ctx.move_to(0, height - accent_size)
-    ctx.line_to(0, height)
-    ctx.line_to(accent_size, height)
-    ctx.close_path()
-    ctx.fill()
-
-    # Subtle ruled lines as texture
-    ctx.set_source_rgba(0.72, 0.45, 0.20, 0.15)  # Copper with low opacity
-    ctx.set_line_width(2)
-    for i in range(3):
-        y_pos = 40 + (i * 12)
-        ctx.move_to(width - 300, y_pos)
-        ctx.line_to(width - 120, y_pos)
-        ctx.stroke()
+    scene.add(Group([
+        Shape(lambda ctx: draw_geometric_accents(ctx, width, height)),
+    ], static_key=('accents',)))
 
     # --- GRAIN TEXTURE ---
-    draw_grain_texture(ctx, width, height, opacity=0.03)
+    scene.add_grain(opacity=0.03)
 
     # --- BRANDING ---
-    draw_oarbit_branding(ctx, width, height, format_key, options)
+    scene.add_branding(options)
+    scene.add_share_qr(options)
+
+    return scene
 
-    return surface_to_png_bytes(surface)
+
+def render_erg_summary(format_key, workout_data, options):
+    """Render Design A. Returns: PNG bytes"""
+    return render_scene(build_erg_summary_scene(format_key, workout_data, options), options)
+
+
+# Sample data for testing
+SAMPLE_ERG_SUMMARY = {
+    'title': '2000m Erg Test',
+    'type': '2k_test',
+    'total_time': '6:22.1',
+    'avg_pace': '1:35.5',
+    'avg_watts': 312,
+    'avg_heart_rate': 185,
+    'avg_stroke_rate': 32,
+    'distance_m': 2000,
+    'duration_seconds': 382.1,
+    'machine_type': 'rower',
+    'date': '2026-02-10',
+    'athlete_name': 'Marcus Chen',
+    'splits': [
+        {'split_number': 1, 'distance_m': 500, 'time_seconds': 94.2, 'pace': '1:34.2', 'watts': 322, 'stroke_rate': 34, 'heart_rate': 172},
+        {'split_number': 2, 'distance_m': 500, 'time_seconds': 95.8, 'pace': '1:35.8', 'watts': 308, 'stroke_rate': 32, 'heart_rate': 182},
+        {'split_number': 3, 'distance_m': 500, 'time_seconds': 96.1, 'pace': '1:36.1', 'watts': 305, 'stroke_rate': 31, 'heart_rate': 188},
+        {'split_number': 4, 'distance_m': 500, 'time_seconds': 96.0, 'pace': '1:36.0', 'watts': 306, 'stroke_rate': 33, 'heart_rate': 192},
+    ],
+}
@@ -13,17 +13,23 @@ Machine-aware display:
 
 import math
 from datetime import datetime
+import cairocffi as cairo
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect,
-    draw_rounded_rect, draw_grain_texture, draw_oarbit_branding,
-    surface_to_png_bytes, hex_to_rgb,
+    draw_diagonal_background, hex_to_rgb,
     DARK_BG, GOLD, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE, COPPER, TEAL
 )
-
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
+from templates.scene import (
+    Scene, render_scene, Group, Text, TextUnderline, Rect, Panel, Gradient, Shape, Table, Column,
+    fitted_line, fitted_cell
+)
+from templates.split_analysis import (
+    SplitAnalysis, bucket_splits, split_analysis, ROUND_BUCKET_METERS, ROUND_BUCKET_SECONDS
+)
+from templates.models import ErgWorkoutData
+from templates.telemetry import (
+    SPARKLINE_METRICS, sparkline_points, draw_sparkline,
+    force_curve_bands, force_curve_paths, draw_force_curve
+)
 
 MACHINE_LABELS = {
     'rower': 'ERG',
@@ -45,7 +51,7 @@ TEST_DISTANCES = {500, 1000, 2000, 5000, 6000}
 # ─────────────────────────────────────────────
 
 def _machine(data):
-    return (data.get('rawMachineType') or data.get('machineType') or 'rower').lower()
+    return (data.raw_machine_type or data.machine_type or 'rower').lower()
 
 
 def is_bike(data):
@@ -171,86 +177,72 @@ def format_date(iso_date):
 # ─────────────────────────────────────────────
 
 def is_interval(data):
-    return data.get('isInterval', False) or 'interval' in (data.get('workoutType') or '').lower()
+    return data.is_interval or 'interval' in str(data.workout_type or '').lower()
 
 
 def is_fixed_time_type(data):
     """Splits/intervals where TIME is the fixed dimension (distance varies)"""
-    wt = data.get('workoutType', '')
-    return wt in ('FixedTimeSplits', 'FixedTimeInterval')
+    return data.workout_type in ('FixedTimeSplits', 'FixedTimeInterval')
 
 
 def is_fixed_dist_type(data):
     """Splits/intervals where DISTANCE is the fixed dimension (time varies)"""
-    wt = data.get('workoutType', '')
-    return wt in ('FixedDistanceSplits', 'FixedDistanceInterval')
+    return data.workout_type in ('FixedDistanceSplits', 'FixedDistanceInterval')
 
 
-def has_uniform_rest(splits):
-    """Check if all intervals have the same rest time.
+def has_uniform_rest(analysis):
+    """Check if all intervals have the same rest time. Returns (uniform, rest_tenths).
     Excludes last interval's rest (PM5 records cooldown, not a real rest).
     """
-    work_splits = splits[:-1] if len(splits) > 1 else splits
-    rest_times = [s.get('restTime') for s in work_splits if s.get('restTime')]
-    if not rest_times:
-        return True, None
-    if len(set(rest_times)) == 1:
-        return True, rest_times[0]
-    return False, None
+    return analysis.uniform_rest, analysis.uniform_rest_value
 
 
-def has_valuable_rest_data(splits):
+def has_valuable_rest_data(analysis):
     """Check if any interval has recovery HR worth showing"""
-    return any(s.get('heartRateRest') for s in splits)
+    return analysis.has_rest_hr
 
 
 # ─────────────────────────────────────────────
 # Title Builder
 # ─────────────────────────────────────────────
 
-def build_title(data):
+def build_title(data, analysis=None):
     """Build concise workout title in coach whiteboard style.
     Machine type is shown separately on the card.
     Examples: "7x11' / 1'r", "1,169m", "5x2K / ~56\"r", "10'"
     """
-    wtype = data.get('workoutType', '')
-    splits = data.get('splits', [])
-    distance = data.get('distanceM')
-    duration = data.get('durationSeconds')
+    wtype = data.workout_type
+    splits = data.splits
+    analysis = analysis or split_analysis(splits)
+    distance = data.distance_m
+    duration = data.duration_seconds
 
     # Check for inferred title from JustRow workouts
     is_just_row = wtype == 'JustRow' or wtype == 0
-    inferred_pattern = data.get('inferredPattern', {})
-    if is_just_row and inferred_pattern.get('inferredTitle'):
-        return inferred_pattern['inferredTitle']
+    inferred_pattern = data.inferred_pattern
+    if is_just_row and inferred_pattern and inferred_pattern.inferred_title:
+        return inferred_pattern.inferred_title
 
     # ── Interval workouts ──
     if is_interval(data) and splits:
-        n = len(splits)
-
-        if wtype == 'FixedDistanceInterval':
-            distances = [s.get('distanceM') for s in splits if s.get('distanceM')]
-            if distances and len(set(distances)) == 1:
-                d = distances[0]
-                rest = _rest_label(splits)
-                return f"{n}x{format_distance(d)}{rest}"
-
-        if wtype == 'FixedTimeInterval':
-            times = [s.get('timeSeconds') for s in splits if s.get('timeSeconds')]
-            if times and len(set(int(t) for t in times)) == 1:
-                t = format_time_coach(times[0])
-                rest = _rest_label(splits)
-                return f"{n}x{t}{rest}"
+        n = analysis.count
+
+        if wtype == 'FixedDistanceInterval' and analysis.uniform_distance:
+            rest = _rest_label(analysis)
+            return f"{n}x{format_distance(analysis.uniform_distance)}{rest}"
+
+        if wtype == 'FixedTimeInterval' and analysis.uniform_time:
+            t = format_time_coach(analysis.uniform_time)
+            rest = _rest_label(analysis)
+            return f"{n}x{t}{rest}"
 
         if wtype in ('VariableInterval', 'VariableIntervalUndefinedRest'):
-            distances = [s.get('distanceM') for s in splits if s.get('distanceM')]
-            if distances and len(set(distances)) == 1:
-                d = distances[0]
-                rest = _rest_label(splits, approx=True)
-                return f"{n}x{format_distance(d)}{rest}"
+            if analysis.uniform_distance:
+                rest = _rest_label(analysis, approx=True)
+                return f"{n}x{format_distance(analysis.uniform_distance)}{rest}"
             return f"{n} pieces"
 
-        rest = _rest_label(splits)
+        rest = _rest_label(analysis)
         return f"{n} intervals{rest}"
 
     # ── Continuous pieces ──
@@ -265,22 +257,19 @@ def build_title(data):
     return machine_label(data)
 
 
-def _rest_label(splits, approx=False):
+def _rest_label(analysis, approx=False):
     """Build rest portion of title in coach style: ' / 1'r' or ' / ~56\"r'.
     Excludes last interval's rest (PM5 records cooldown, not a real rest).
     """
-    work_splits = splits[:-1] if len(splits) > 1 else splits
-    rest_times = [s.get('restTime') for s in work_splits if s.get('restTime')]
-    if not rest_times:
+    if not analysis.rest_times:
         return ''
-    if len(set(rest_times)) == 1:
-        formatted = format_rest_coach(rest_times[0])
+    if analysis.uniform_rest:
+        formatted = format_rest_coach(analysis.uniform_rest_value)
         if approx:
             return f" / ~{formatted}"
         return f" / {formatted}"
     # Variable rest — show approximate average
-    avg_rest = sum(rest_times) / len(rest_times)
-    return f" / ~{format_rest_coach(avg_rest)}"
+    return f" / ~{format_rest_coach(analysis.avg_rest)}"
 
 
 # ─────────────────────────────────────────────
@@ -289,11 +278,11 @@ def _rest_label(splits, approx=False):
 
 def get_hero(data):
     """Return (value_string, label_string) for the hero metric."""
-    distance = data.get('distanceM')
-    duration = data.get('durationSeconds')
-    avg_pace_tenths = data.get('avgPaceTenths')
-    avg_watts = data.get('avgWatts')
-    wtype = data.get('workoutType', '')
+    distance = data.distance_m
+    duration = data.duration_seconds
+    avg_pace_tenths = data.avg_pace_tenths
+    avg_watts = data.avg_watts
+    wtype = data.workout_type
 
     # Test distances: TOTAL TIME is king (only for continuous pieces, not intervals)
     if distance and distance in TEST_DISTANCES and not is_interval(data):
@@ -315,43 +304,34 @@ def get_hero(data):
 # Splits / Intervals Table Header
 # ─────────────────────────────────────────────
 
-def build_table_header(data, splits):
+def build_table_header(data, analysis):
     """Build descriptive section header like 'SPLITS (9 x 5:00)' or 'INTERVALS (7 x 11:00 / 1:00r)'"""
-    n = len(splits)
-    wtype = data.get('workoutType', '')
+    n = analysis.count
+    wtype = data.workout_type
 
     if is_interval(data):
+        rest = analysis.uniform_rest_value
+        rest_str = f" / {format_rest_tenths(rest)}r" if rest else ""
+
         # Fixed time intervals
-        if wtype == 'FixedTimeInterval':
-            times = [s.get('timeSeconds') for s in splits if s.get('timeSeconds')]
-            if times and len(set(int(t) for t in times)) == 1:
-                uniform, rest = has_uniform_rest(splits)
-                rest_str = f" / {format_rest_tenths(rest)}r" if rest else ""
-                return f"INTERVALS ({n} x {format_time_clean(times[0])}{rest_str})"
+        if wtype == 'FixedTimeInterval' and analysis.uniform_time:
+            return f"INTERVALS ({n} x {format_time_clean(analysis.uniform_time)}{rest_str})"
 
         # Fixed distance intervals
-        if wtype == 'FixedDistanceInterval':
-            distances = [s.get('distanceM') for s in splits if s.get('distanceM')]
-            if distances and len(set(distances)) == 1:
-                uniform, rest = has_uniform_rest(splits)
-                rest_str = f" / {format_rest_tenths(rest)}r" if rest else ""
-                return f"INTERVALS ({n} x {format_distance(distances[0])}{rest_str})"
+        if wtype == 'FixedDistanceInterval' and analysis.uniform_distance:
+            return f"INTERVALS ({n} x {format_distance(analysis.uniform_distance)}{rest_str})"
 
         # Variable
         return f"INTERVALS ({n} pieces)"
 
     # Continuous splits
     # Fixed time splits — show split duration
-    if wtype in ('FixedTimeSplits', 'JustRow'):
-        times = [s.get('timeSeconds') for s in splits if s.get('timeSeconds')]
-        if times and len(set(int(t) for t in times)) == 1:
-            return f"SPLITS ({n} x {format_time_clean(times[0])})"
+    if wtype in ('FixedTimeSplits', 'JustRow') and analysis.uniform_time:
+        return f"SPLITS ({n} x {format_time_clean(analysis.uniform_time)})"
 
     # Fixed distance splits
-    if wtype == 'FixedDistanceSplits':
-        distances = [s.get('distanceM') for s in splits if s.get('distanceM')]
-        if distances and len(set(distances)) == 1:
-            return f"SPLITS ({n} x {format_distance(distances[0])})"
+    if wtype == 'FixedDistanceSplits' and analysis.uniform_distance:
+        return f"SPLITS ({n} x {format_distance(analysis.uniform_distance)})"
 
     return f"SPLITS ({n})"
 
@@ -360,17 +340,9 @@ def build_table_header(data, splits):
 # Visual Helpers
 # ─────────────────────────────────────────────
 
-def compute_pace_stats(splits):
-    paces = [s.get('paceTenths') for s in splits if s.get('paceTenths')]
-    if not paces:
-        return None, {}
-    avg = sum(paces) / len(paces)
-    devs = {}
-    for i, s in enumerate(splits):
-        p = s.get('paceTenths')
-        if p and avg > 0:
-            devs[i] = (p - avg) / avg
-    return avg, devs
+def compute_pace_stats(analysis):
+    """Returns (average pace, {split index: relative deviation})"""
+    return analysis.avg_pace, analysis.pace_devs
 
 
 def draw_wave_pattern(ctx, width, height, color, opacity=0.08):
@@ -388,6 +360,34 @@ def draw_wave_pattern(ctx, width, height, color, opacity=0.08):
     ctx.restore()
 
 
+def draw_card_background(ctx, width, height):
+    """Static layer: diagonal gradient, warm glow behind the data area and wave pattern"""
+    draw_diagonal_background(ctx, width, height)
+
+    # Warmer background glow behind data area
+    radial_bg = cairo.RadialGradient(width / 2, height * 0.4, 0, width / 2, height * 0.4, width * 0.6)
+    radial_bg.add_color_stop_rgba(0, 0.12, 0.09, 0.07, 0.15)  # Warmer center
+    radial_bg.add_color_stop_rgba(1, 0.03, 0.03, 0.04, 0)     # Fade to edges
+    ctx.set_source(radial_bg)
+    ctx.paint()
+
+    draw_wave_pattern(ctx, width, height, GOLD, opacity=0.06)
+
+
+def draw_corner_decorations(ctx, width, height):
+    """Static layer: rose glow bottom-right and gold dot top-right"""
+    radial = cairo.RadialGradient(width - 200, height - 200, 0, width - 200, height - 200, 300)
+    radial.add_color_stop_rgba(0, *ROSE, 0.08)
+    radial.add_color_stop_rgba(1, *ROSE, 0)
+    ctx.set_source(radial)
+    ctx.arc(width - 200, height - 200, 300, 0, 2 * math.pi)
+    ctx.fill()
+
+    ctx.set_source_rgba(*GOLD, 0.3)
+    ctx.arc(width - 140, 100, 40, 0, 2 * math.pi)
+    ctx.fill()
+
+
 def draw_pace_dot(ctx, x, y, deviation, radius=8):
     if deviation is None:
         return
@@ -410,27 +410,27 @@ def get_table_columns(data):
     Each column: (key, header_label, width_weight, align, format_fn)
     Columns are laid out proportionally across the available width.
     """
-    wtype = data.get('workoutType', '')
+    wtype = data.workout_type
     pu = pace_unit_short(data)
     rl = rate_label(data).lower()
     bike = is_bike(data)
 
     # Column key → (header, format_fn)
     def fmt_dist(s):
-        d = s.get('distanceM')
+        d = s.distance_m
         return f"{d:,}m" if d else '--'
     def fmt_time(s):
-        return format_time_clean(s.get('timeSeconds'))
+        return format_time_clean(s.time_seconds)
     def fmt_pace(s):
-        return format_pace(s.get('paceTenths'), data)
+        return format_pace(s.pace_tenths, data)
     def fmt_watts(s):
-        w = s.get('watts')
+        w = s.watts
         return f"{w}" if w else '--'
     def fmt_rate(s):
-        sr = s.get('strokeRate')
+        sr = s.stroke_rate
         return f"{sr}" if sr is not None else '--'
     def fmt_hr(s):
-        hr = s.get('heartRate')
+        hr = s.heart_rate
         return f"{hr}" if hr is not None else '--'
 
     pace_hdr = f'PACE ({pu})'
@@ -473,86 +473,89 @@ def get_table_columns(data):
         ]
 
 
-def draw_table_header(ctx, columns, col_positions, y, width):
-    """Draw column headers for the data table (raised from 24px to 40px)."""
+def add_table_header(group, columns, col_positions, y, width):
+    """Add column headers for the data table (raised from 24px to 40px). Returns new y position."""
     # #N header
-    draw_text(ctx, "#", "IBM Plex Sans", 40,
-              col_positions[0][0] - 80, y, TEXT_MUTED, weight='SemiBold', align='left')
+    group.add(Text("#", "IBM Plex Sans", 40,
+                   col_positions[0][0] - 80, y, TEXT_MUTED, weight='SemiBold', align='left'))
 
     for i, (key, header, fmt_fn, align) in enumerate(columns):
         x = col_positions[i][0]
-        draw_text(ctx, header, "IBM Plex Sans", 40,
-                  x, y, TEXT_MUTED, weight='SemiBold', align=align)
+        group.add(Text(header, "IBM Plex Sans", 40,
+                       x, y, TEXT_MUTED, weight='SemiBold', align=align))
 
     # Subtle divider line below headers
-    ctx.set_source_rgba(*TEXT_MUTED, 0.2)
-    ctx.rectangle(col_positions[0][0] - 90, y + 38, width - 2 * (col_positions[0][0] - 90), 1)
-    ctx.fill()
+    group.add(Rect(col_positions[0][0] - 90, y + 38, width - 2 * (col_positions[0][0] - 90), 1,
+                   TEXT_MUTED, alpha=0.2))
 
     return y + 52
 
 
-def draw_data_row(ctx, split, i, data, columns, col_positions, pace_devs, y):
-    """Draw a single data row (interval or split). Returns new y position."""
-    return draw_data_row_dynamic(ctx, split, i, data, columns, col_positions, pace_devs, y, 30, 66)
-
+def get_row_columns(columns, col_positions, font_size):
+    """Table columns for data rows: #N, then data columns with column-specific colors."""
+    row_columns = [Column(col_positions[0][0] - 80, 'left', "IBM Plex Mono", font_size, TEXT_SECONDARY, 'SemiBold')]
 
-def draw_data_row_dynamic(ctx, split, i, data, columns, col_positions, pace_devs, y, font_size, row_h):
-    """Draw a single data row with dynamic font size, row height, and column-specific colors."""
-    split_num = split.get('splitNumber', i + 1)
-
-    # Pace dot
-    dev = pace_devs.get(i)
-    if dev is not None:
-        draw_pace_dot(ctx, col_positions[0][0] - 100, y + font_size * 0.5, dev)
-
-    # #N
-    draw_text(ctx, f"{split_num}", "IBM Plex Mono", font_size,
-              col_positions[0][0] - 80, y, TEXT_SECONDARY, weight='SemiBold', align='left')
-
-    # Data columns with color coding
     for ci, (key, header, fmt_fn, align) in enumerate(columns):
-        x = col_positions[ci][0]
-        val = fmt_fn(split)
-
         # Determine color based on column type
         if ci == 0:
             # First column always white bold
-            color = TEXT_PRIMARY
-            weight = 'Bold'
-            size_adjust = 2
+            color, weight, size_adjust = TEXT_PRIMARY, 'Bold', 2
         elif key == 'watts':
-            color = GOLD
-            weight = 'SemiBold'
-            size_adjust = 0
+            color, weight, size_adjust = GOLD, 'SemiBold', 0
         elif key == 'hr':
-            color = ROSE
-            weight = 'SemiBold'
-            size_adjust = 0
+            color, weight, size_adjust = ROSE, 'SemiBold', 0
         elif key == 'rate':
-            color = TEAL
-            weight = 'SemiBold'
-            size_adjust = 0
+            color, weight, size_adjust = TEAL, 'SemiBold', 0
         elif key == 'pace':
-            color = TEXT_PRIMARY
-            weight = 'Regular'
-            size_adjust = 0
+            color, weight, size_adjust = TEXT_PRIMARY, 'Regular', 0
         else:
-            color = TEXT_SECONDARY
-            weight = 'Regular'
-            size_adjust = 0
+            color, weight, size_adjust = TEXT_SECONDARY, 'Regular', 0
+
+        row_columns.append(Column(col_positions[ci][0], align, "IBM Plex Mono", font_size + size_adjust, color, weight))
 
-        draw_text(ctx, val, "IBM Plex Mono", font_size + size_adjust,
-                  x, y, color, weight=weight, align=align)
+    return row_columns
+
+
+def bucket_labels(buckets, analysis):
+    """
+    Row labels for aggregated buckets: where each ends ("2K", "25'") when every
+    bucket ends on a round 1000m / 5-minute point, else their last split numbers
+
+    Labels never mix the two styles, and odd end points ("6,993m") never
+    reach the narrow # column.
+    """
+    if analysis.uniform_distance and all(b.end_distance_m % ROUND_BUCKET_METERS == 0 for b in buckets):
+        return [format_distance(b.end_distance_m) for b in buckets]
+    if analysis.uniform_time and all(round(b.end_seconds) % ROUND_BUCKET_SECONDS == 0 for b in buckets):
+        return [format_time_coach(b.end_seconds) for b in buckets]
+    return [f"{b.split_number}" for b in buckets]
+
+
+def add_data_row(table, split, i, columns, col_positions, pace_devs, y, font_size, row_h):
+    """Add a single data row (interval or split) to the table. Returns new y position."""
+    split_num = split.split_number if split.split_number is not None else i + 1
+    number_cell = f"{split_num}"
+    if split.label:
+        # Aggregated rows: shrink the bucket label into the narrow # column
+        number_cell = fitted_cell(split.label, "IBM Plex Mono", 76, font_size, 28, 'SemiBold', TEXT_SECONDARY)
+
+    # Pace dot
+    dev = pace_devs.get(i)
+    if dev is not None:
+        dot_x, dot_y = col_positions[0][0] - 100, y + font_size * 0.5
+        table.add(Shape(lambda ctx: draw_pace_dot(ctx, dot_x, dot_y, dev),
+                         bbox=(dot_x - 8, dot_y - 8, 16, 16), signature=('pace_dot', dev)))
+
+    table.add_row(y, [number_cell] + [fmt_fn(split) for key, header, fmt_fn, align in columns])
 
     return y + row_h
 
 
-def draw_rest_row(ctx, split, col_positions, width, y):
-    """Draw a rest row with recovery data (raised font from 22px to 32px, TEAL color). Returns new y position."""
-    rest_time = split.get('restTime')
-    rest_hr = split.get('heartRateRest')
-    rest_dist = split.get('restDistance')
+def add_rest_row(group, split, col_positions, y):
+    """Add a rest row with recovery data (raised font from 22px to 32px, TEAL color). Returns new y position."""
+    rest_time = split.rest_time
+    rest_hr = split.heart_rate_rest
+    rest_dist = split.rest_distance
 
     parts = []
     if rest_time:
@@ -561,7 +564,7 @@ def draw_rest_row(ctx, split, col_positions, width, y):
         parts.append(f"{rest_dist}m")
     if rest_hr:
         parts.append(f"HR {rest_hr}")
-        hr_ending = split.get('heartRateEnding')
+        hr_ending = split.heart_rate_ending
         if hr_ending and rest_hr:
             delta = hr_ending - rest_hr
             if delta > 0:
@@ -571,105 +574,174 @@ def draw_rest_row(ctx, split, col_positions, width, y):
         return y + 8
 
     left_edge = col_positions[0][0] - 80
-    draw_text(ctx, "  ".join(parts), "IBM Plex Sans", 32,
-              left_edge, y, TEAL, weight='Regular', align='left')
+    group.add(Text("  ".join(parts), "IBM Plex Sans", 32,
+                   left_edge, y, TEAL, weight='Regular', align='left'))
     return y + 44
 
 
+def size_table_rows(n_data_rows, show_rest_rows, avail_height):
+    """Scale data/rest row heights and font to fill the available height.
+    Returns (data_row_h, rest_row_h, data_font).
+    """
+    n_rest_rows = max(0, n_data_rows - 1) if show_rest_rows else 0  # no rest after last
+
+    # Calculate ideal row height to fill space
+    total_content_units = n_data_rows + n_rest_rows * 0.5  # rest rows are ~half height
+    if total_content_units > 0:
+        ideal_row_h = avail_height / total_content_units
+    else:
+        ideal_row_h = 80
+
+    # Clamp row height between reasonable bounds (raised minimums)
+    data_row_h = max(75, min(120, int(ideal_row_h)))
+    rest_row_h = max(40, min(60, int(ideal_row_h * 0.5)))
+
+    # Scale font size with row height (raised minimum from 28px to 44px, max from 42px to 52px)
+    data_font = max(44, min(52, int(data_row_h * 0.42)))
+
+    # Check if all rows fit
+    total_h = n_data_rows * data_row_h + n_rest_rows * rest_row_h
+    if total_h > avail_height:
+        # Too many rows — shrink toward the minimums (raised minimums)
+        scale = avail_height / total_h
+        data_row_h = max(60, int(data_row_h * scale))
+        rest_row_h = max(32, int(rest_row_h * scale))
+        data_font = max(44, int(data_font * scale))
+
+    return data_row_h, rest_row_h, data_font
+
+
+SPARKLINE_HEIGHT = 150
+SPARKLINE_COLORS = {'pace': GOLD, 'watts': GOLD, 'heartRate': ROSE, 'strokeRate': TEAL}
+
+
+def sparkline_metric(options):
+    """Metric requested by options['sparkline'] (True means pace), None when off or unknown"""
+    metric = options.get('sparkline')
+    if metric is True:
+        return 'pace'
+    return metric if metric in SPARKLINE_METRICS else None
+
+
+def add_sparkline(scene, telemetry, metric, y, width):
+    """Add a labelled per-stroke sparkline band. Returns new y position (unchanged without telemetry)."""
+    margin = 160
+    chart_y = y + 50
+    points = sparkline_points(telemetry, metric, margin, chart_y, width - 2 * margin, SPARKLINE_HEIGHT)
+    if not points:
+        return y
+
+    color = SPARKLINE_COLORS[metric]
+    baseline = chart_y + SPARKLINE_HEIGHT
+    scene.add(Text(SPARKLINE_METRICS[metric][1], "IBM Plex Sans", 32,
+                   margin, y, TEXT_MUTED, weight='SemiBold', align='left', key='sparkline_label'))
+    scene.add(Shape(lambda ctx: draw_sparkline(ctx, points, baseline, color),
+                    bbox=(margin - 4, chart_y - 4, width - 2 * margin + 8, SPARKLINE_HEIGHT + 8),
+                    signature=('sparkline', metric, points), key='sparkline'))
+    return baseline + 60
+
+
+FORCE_CURVE_HEIGHT = 220
+
+
+def add_force_curve(scene, telemetry, y, width):
+    """Add the averaged force-curve panel. Returns new y position (unchanged without force curves)."""
+    if telemetry is None:
+        return y
+    # Streamed telemetry arrives with its bands already folded
+    bands = telemetry.force_curve_bands or force_curve_bands(telemetry.force_curves)
+    if bands is None:
+        return y
+
+    margin = 160
+    chart_y = y + 50
+    paths = force_curve_paths(bands, margin, chart_y, width - 2 * margin, FORCE_CURVE_HEIGHT)
+    strokes = bands['strokes']
+
+    scene.add(Text("FORCE CURVE", "IBM Plex Sans", 32,
+                   margin, y, TEXT_MUTED, weight='SemiBold', align='left', key='force_curve_label'))
+    scene.add(Text(f"{strokes:,} stroke{'s' if strokes != 1 else ''}", "IBM Plex Sans", 32,
+                   width - margin, y, TEXT_MUTED, weight='Regular', align='right', key='force_curve_strokes'))
+    scene.add(Shape(lambda ctx: draw_force_curve(ctx, paths, COPPER),
+                    bbox=(margin - 4, chart_y - 4, width - 2 * margin + 8, FORCE_CURVE_HEIGHT + 8),
+                    signature=('force_curve', paths), key='force_curve'))
+    return chart_y + FORCE_CURVE_HEIGHT + 60
+
+
 # ─────────────────────────────────────────────
 # Main Renderer
 # ─────────────────────────────────────────────
 
-def render_erg_summary_alt(format_key, workout_data, options):
-    width, height = DIMENSIONS[format_key]
-    is_story = format_key == '9:16'
-
-    surface, ctx = setup_canvas(width, height)
+def build_erg_summary_alt_scene(format_key, workout_data, options):
+    """Build the Design B scene graph. Returns: unresolved Scene"""
+    workout = ErgWorkoutData.coerce(workout_data)
+    scene = Scene('erg_summary_alt', format_key)
+    width, height = scene.width, scene.height
 
     # ── Background ──
-    import cairocffi as cairo
-    gradient = cairo.LinearGradient(0, 0, width, height)
-    gradient.add_color_stop_rgb(0, 0.03, 0.03, 0.04)
-    gradient.add_color_stop_rgb(0.5, 0.08, 0.06, 0.08)
-    gradient.add_color_stop_rgb(1, 0.12, 0.08, 0.06)
-    ctx.set_source(gradient)
-    ctx.rectangle(0, 0, width, height)
-    ctx.fill()
-
-    # Warmer background glow behind data area
-    radial_bg = cairo.RadialGradient(width / 2, height * 0.4, 0, width / 2, height * 0.4, width * 0.6)
-    radial_bg.add_color_stop_rgba(0, 0.12, 0.09, 0.07, 0.15)  # Warmer center
-    radial_bg.add_color_stop_rgba(1, 0.03, 0.03, 0.04, 0)     # Fade to edges
-    ctx.set_source(radial_bg)
-    ctx.paint()
-
-    draw_wave_pattern(ctx, width, height, GOLD, opacity=0.06)
+    scene.add(Group([
+        Shape(lambda ctx: draw_card_background(ctx, width, height)),
+    ], static_key=('background',)))
+    scene.add_photo_background(options)
 
     # ── Extract data ──
-    splits = workout_data.get('splits', [])
-    distance_m = workout_data.get('distanceM')
-    duration_sec = workout_data.get('durationSeconds')
-    avg_watts = workout_data.get('avgWatts')
-    avg_hr = workout_data.get('avgHeartRate')
-    stroke_rate = workout_data.get('strokeRate')
-    calories = workout_data.get('calories')
-    drag_factor = workout_data.get('dragFactor')
-    intervals = is_interval(workout_data)
-    avg_pace_tenths = workout_data.get('avgPaceTenths')
-
-    _, pace_devs = compute_pace_stats(splits)
+    splits = workout.splits
+    distance_m = workout.distance_m
+    duration_sec = workout.duration_seconds
+    avg_watts = workout.avg_watts
+    avg_hr = workout.avg_heart_rate
+    stroke_rate = workout.stroke_rate
+    calories = workout.calories
+    drag_factor = workout.drag_factor
+    intervals = is_interval(workout)
+    avg_pace_tenths = workout.avg_pace_tenths
+
+    analysis = split_analysis(splits)
+    _, pace_devs = compute_pace_stats(analysis)
 
     # ── Date + Machine Label ──
-    date_str = format_date(workout_data.get('date', ''))
-    mlabel = machine_label(workout_data)
-    draw_text(ctx, date_str, "IBM Plex Sans", 36,
-              120, 140, TEXT_MUTED, weight='Regular', align='left')
-    draw_text(ctx, mlabel, "IBM Plex Sans", 36,
-              width - 120, 140, TEXT_MUTED, weight='SemiBold', align='right')
+    date_str = format_date(workout.date)
+    mlabel = machine_label(workout)
+    scene.add(Text(date_str, "IBM Plex Sans", 36,
+                   120, 140, TEXT_MUTED, weight='Regular', align='left', key='date'))
+    scene.add(Text(mlabel, "IBM Plex Sans", 36,
+                   width - 120, 140, TEXT_MUTED, weight='SemiBold', align='right', key='machine'))
 
     # ── Hero: Workout Title (no machine type) ──
-    title = build_title(workout_data)
-
-    # Auto-size based on title length (raised minimum from 80px to 100px)
-    title_len = len(title)
-    if title_len <= 12:
-        hero_font_size = 200
-    elif title_len <= 18:
-        hero_font_size = 160
-    elif title_len <= 24:
-        hero_font_size = 120
-    else:
-        hero_font_size = 100
+    title = build_title(workout, analysis)
 
-    # Calculate hero section dimensions for panel background
+    # Auto-fit the title inside the hero panel (raised minimum from 80px to 100px)
     hero_y = 300
+    panel_padding = 80
+    title_text = fitted_line(title, "IBM Plex Sans", width / 2, hero_y, width - 2 * (panel_padding + 60),
+                             200, 100, TEXT_PRIMARY, weight='Bold', align='center', key='title')
+    hero_font_size = title_text.size
+
+    # Calculate hero section dimensions for panel background
     metrics_y = hero_y + int(hero_font_size * 1.5)
 
-    # Draw subtle panel background behind hero section
-    panel_padding = 80
+    # Subtle panel background behind hero section
     panel_y = hero_y - 60
     panel_height = metrics_y - panel_y + 320  # Covers hero + summary stats
-    draw_rounded_rect(ctx, panel_padding, panel_y, width - 2 * panel_padding, panel_height, 24)
-    ctx.set_source_rgba(*SLATE, 0.3)
-    ctx.fill()
+    scene.add(Panel(panel_padding, panel_y, width - 2 * panel_padding, panel_height, 24,
+                    SLATE, alpha=0.3, key='hero_panel'))
 
-    # Draw hero title
-    draw_text(ctx, title, "IBM Plex Sans", hero_font_size,
-              width / 2, hero_y, TEXT_PRIMARY, weight='Bold', align='center')
+    # Hero title
+    scene.add(title_text)
 
     # ── Secondary Metrics — 2x2 grid ──
-    rl = rate_label(workout_data)
+    rl = rate_label(workout)
 
     # Build 4 summary stats — hero metric first, then complementary stats
     stats = []
-    hero_value, hero_label = get_hero(workout_data)
+    hero_value, hero_label = get_hero(workout)
     hero_is_watts = 'WATTS' in hero_label.upper()
     stats.append((hero_value, hero_label))
 
     if not hero_is_watts and avg_watts is not None:
         stats.append((str(avg_watts), "WATTS"))
     elif hero_is_watts and avg_pace_tenths:
-        stats.append((format_pace(avg_pace_tenths, workout_data), f"AVG PACE {pace_unit(workout_data)}"))
+        stats.append((format_pace(avg_pace_tenths, workout), f"AVG PACE {pace_unit(workout)}"))
     elif duration_sec:
         stats.append((format_time_clean(duration_sec), "TOTAL TIME"))
 
@@ -678,7 +750,7 @@ def render_erg_summary_alt(format_key, workout_data, options):
     if avg_hr is not None:
         stats.append((str(avg_hr), "AVG HR"))
 
-    # Draw as 2x2 grid (raised stat values to 72px, labels to 36px)
+    # 2x2 grid (raised stat values to 72px, labels to 36px)
     stat_font = 72
     stat_gap = 140
     if len(stats) >= 4:
@@ -691,35 +763,47 @@ def render_erg_summary_alt(format_key, workout_data, options):
     else:
         positions = [(240 + i * 480, metrics_y, 'left') for i in range(len(stats))]
 
+    stats_group = scene.add(Group(key='stats'))
     for i, (val, lbl) in enumerate(stats[:4]):
         if i < len(positions):
             x, y, align = positions[i]
             color = GOLD if i % 2 == 0 else ROSE
-            draw_text(ctx, val, "IBM Plex Mono", stat_font,
-                      x, y, color, weight='Bold', align=align)
-            draw_text(ctx, lbl, "IBM Plex Sans", 36,
-                      x, y + 90, TEXT_MUTED, weight='SemiBold', align=align)
+            stats_group.add(Text(val, "IBM Plex Mono", stat_font,
+                                 x, y, color, weight='Bold', align=align))
+            stats_group.add(Text(lbl, "IBM Plex Sans", 36,
+                                 x, y + 90, TEXT_MUTED, weight='SemiBold', align=align))
 
     # ── Splits / Intervals Table or Extended Summary ──
+    # Determine how much vertical space the header section used
+    stats_rows = 2 if len(stats) >= 4 else 1
+    table_start_y = metrics_y + stats_rows * stat_gap + 100
+
+    # ── Stroke Sparkline (optional, from per-stroke telemetry) ──
+    metric = sparkline_metric(options)
+    if metric:
+        table_start_y = add_sparkline(scene, workout.telemetry, metric, table_start_y, width)
+
+    # ── Force Curve (optional, mean + percentile bands over every stroke) ──
+    if options.get('forceCurve'):
+        table_start_y = add_force_curve(scene, workout.telemetry, table_start_y, width)
+
     if splits:
-        # Determine how much vertical space the header section used
-        stats_rows = 2 if len(stats) >= 4 else 1
-        table_start_y = metrics_y + stats_rows * stat_gap + 100
 
         # Enhanced gradient accent bar (wider, thicker, GOLD→COPPER gradient)
         bar_w = int(width * 0.8)  # 80% of card width
         bar_h = 6  # 6px height
-        draw_gradient_rect(ctx, (width - bar_w) / 2, table_start_y, bar_w, bar_h, GOLD, COPPER, direction='horizontal')
+        scene.add(Gradient((width - bar_w) / 2, table_start_y, bar_w, bar_h, GOLD, COPPER, direction='horizontal'))
 
         # Detect short workouts (1-3 splits, JustRow or FixedTimeSplits)
-        wtype = workout_data.get('workoutType', '')
+        wtype = workout.workout_type
         is_short_workout = len(splits) <= 3 and wtype in ('JustRow', 'FixedTimeSplits')
 
         if is_short_workout:
             # Extended summary layout for short workouts (no table)
+            summary = scene.add(Group(key='summary'))
             summary_y = table_start_y + 80
-            draw_text(ctx, "WORKOUT SUMMARY", "IBM Plex Sans", 40,
-                      width / 2, summary_y, TEXT_PRIMARY, weight='Bold', align='center')
+            summary.add(Text("WORKOUT SUMMARY", "IBM Plex Sans", 40,
+                             width / 2, summary_y, TEXT_PRIMARY, weight='Bold', align='center'))
 
             # 6-8 stat summary in 2-column grid
             extended_stats = []
@@ -728,11 +812,11 @@ def render_erg_summary_alt(format_key, workout_data, options):
             if duration_sec:
                 extended_stats.append(("Total Time", format_time_clean(duration_sec)))
             if avg_pace_tenths:
-                extended_stats.append(("Avg Pace", f"{format_pace(avg_pace_tenths, workout_data)} {pace_unit(workout_data)}"))
+                extended_stats.append(("Avg Pace", f"{format_pace(avg_pace_tenths, workout)} {pace_unit(workout)}"))
             if avg_watts:
                 extended_stats.append(("Avg Watts", str(avg_watts)))
             if stroke_rate:
-                extended_stats.append(("Avg " + rate_label(workout_data), str(stroke_rate)))
+                extended_stats.append(("Avg " + rate_label(workout), str(stroke_rate)))
             if avg_hr:
                 extended_stats.append(("Avg Heart Rate", str(avg_hr)))
             if calories:
@@ -740,9 +824,8 @@ def render_erg_summary_alt(format_key, workout_data, options):
             if drag_factor:
                 extended_stats.append(("Drag Factor", str(drag_factor)))
 
-            # Draw in 2-column layout
+            # 2-column layout
             col_y = summary_y + 80
-            col_gap = 180
             row_height = 120
             left_x = 300
             right_x = width - 300
@@ -753,35 +836,35 @@ def render_erg_summary_alt(format_key, workout_data, options):
                 else:
                     x, align = right_x, 'right'
 
-                draw_text(ctx, value, "IBM Plex Mono", 64,
-                          x, col_y, GOLD if i % 4 < 2 else ROSE, weight='Bold', align=align)
-                draw_text(ctx, label, "IBM Plex Sans", 36,
-                          x, col_y + 80, TEXT_SECONDARY, weight='SemiBold', align=align)
+                summary.add(Text(value, "IBM Plex Mono", 64,
+                                 x, col_y, GOLD if i % 4 < 2 else ROSE, weight='Bold', align=align))
+                summary.add(Text(label, "IBM Plex Sans", 36,
+                                 x, col_y + 80, TEXT_SECONDARY, weight='SemiBold', align=align))
 
                 if i % 2 == 1:
                     col_y += row_height
 
             # Optional: inline splits as descriptive line
             if len(splits) > 1:
-                splits_text = "Splits: " + " | ".join([format_pace(s.get('paceTenths'), workout_data) for s in splits if s.get('paceTenths')])
+                splits_text = "Splits: " + " | ".join(format_pace(p, workout) for p in analysis.paces)
                 col_y += 60
-                draw_text(ctx, splits_text, "IBM Plex Mono", 40,
-                          width / 2, col_y, TEXT_MUTED, weight='Regular', align='center')
+                summary.add(Text(splits_text, "IBM Plex Mono", 40,
+                                 width / 2, col_y, TEXT_MUTED, weight='Regular', align='center'))
 
         else:
             # Standard table layout for longer workouts
             # Section header with pattern description (raised from 30px to 40px)
-            header_text = build_table_header(workout_data, splits)
+            header_text = build_table_header(workout, analysis)
             header_y = table_start_y + 50
-            draw_text(ctx, header_text, "IBM Plex Sans", 40,
-                      width / 2, header_y, TEXT_PRIMARY, weight='Bold', align='center')
+            scene.add(Text(header_text, "IBM Plex Sans", 40,
+                           width / 2, header_y, TEXT_PRIMARY, weight='Bold', align='center', key='table_title'))
 
             # Decide rest row strategy for intervals
-            uniform_rest, uniform_rest_val = has_uniform_rest(splits)
-            show_rest_rows = intervals and (not uniform_rest or has_valuable_rest_data(splits))
+            uniform_rest, uniform_rest_val = has_uniform_rest(analysis)
+            show_rest_rows = intervals and (not uniform_rest or has_valuable_rest_data(analysis))
 
             # Set up column positions with symmetric margins and near-equal widths
-            columns = get_table_columns(workout_data)
+            columns = get_table_columns(workout)
             margin = 160  # Symmetric margins (was asymmetric 140)
             table_width = width - 2 * margin
             n_cols = len(columns)
@@ -802,90 +885,149 @@ def render_erg_summary_alt(format_key, workout_data, options):
 
             # Column headers
             col_header_y = header_y + 60
-            cy = draw_table_header(ctx, columns, col_positions, col_header_y, width)
+            cy = add_table_header(scene.add(Group(key='table_header')), columns, col_positions, col_header_y, width)
 
             # ── Dynamic sizing: scale row height to fill available space ──
             branding_reserve = 220  # athlete name + branding at bottom
             avail_height = height - cy - branding_reserve
 
-            # Estimate total rows needed (data rows + rest rows)
-            n_data_rows = len(splits)
-            n_rest_rows = 0
-            if intervals and show_rest_rows:
-                n_rest_rows = max(0, n_data_rows - 1)  # no rest after last
-
-            # Calculate ideal row height to fill space
-            total_content_units = n_data_rows + n_rest_rows * 0.5  # rest rows are ~half height
-            if total_content_units > 0:
-                ideal_row_h = avail_height / total_content_units
-            else:
-                ideal_row_h = 80
-
-            # Clamp row height between reasonable bounds (raised minimums)
-            data_row_h = max(75, min(120, int(ideal_row_h)))
-            rest_row_h = max(40, min(60, int(ideal_row_h * 0.5)))
-
-            # Scale font size with row height (raised minimum from 28px to 44px, max from 42px to 52px)
-            data_font = max(44, min(52, int(data_row_h * 0.42)))
-
-            # Check if all splits fit
-            total_h = n_data_rows * data_row_h + n_rest_rows * rest_row_h
-            if total_h > avail_height:
-                # Too many rows — shrink to fit or truncate (raised minimums)
-                scale = avail_height / total_h
-                data_row_h = max(60, int(data_row_h * scale))
-                rest_row_h = max(32, int(rest_row_h * scale))
-                data_font = max(44, int(data_font * scale))
+            data_row_h, rest_row_h, data_font = size_table_rows(len(splits), show_rest_rows, avail_height)
 
+            # Too many rows for the card — aggregate consecutive splits into a fixed row budget
+            # instead of cutting the table off. Rest rows don't apply to aggregated rows.
             max_rows = max(1, int(avail_height / (data_row_h + (rest_row_h if show_rest_rows else 8))))
-            show = splits[:max_rows]
-            truncated = len(splits) > max_rows
-
-            is_last_interval_in_workout = lambda idx: idx == len(splits) - 1
-            for i, s in enumerate(show):
-                cy = draw_data_row_dynamic(ctx, s, i, workout_data, columns, col_positions,
-                                           pace_devs, cy, data_font, data_row_h)
+            rows = bucket_splits(splits, max_rows, analysis)
+            if rows is not splits:
+                show_rest_rows = False
+                data_row_h, rest_row_h, data_font = size_table_rows(len(rows), False, avail_height)
+                pace_devs = SplitAnalysis(rows).pace_devs
+                for row, label in zip(rows, bucket_labels(rows, analysis)):
+                    row.label = label
+
+            table = scene.add(Table(get_row_columns(columns, col_positions, data_font), key='splits'))
+            is_last_interval_in_workout = lambda idx: idx == len(rows) - 1
+            for i, s in enumerate(rows):
+                cy = add_data_row(table, s, i, columns, col_positions, pace_devs, cy, data_font, data_row_h)
                 if intervals and show_rest_rows and not is_last_interval_in_workout(i):
-                    cy = draw_rest_row(ctx, s, col_positions, width, cy)
+                    cy = add_rest_row(table, s, col_positions, cy)
                     cy += rest_row_h - 44  # adjust for rest_row's own 44px
                 elif intervals:
                     cy += max(4, data_row_h - data_font * 2)
 
-            if truncated:
-                remaining = len(splits) - max_rows
-                word = "interval" if intervals else "split"
-                draw_text(ctx, f"+ {remaining} more {word}{'s' if remaining != 1 else ''}",
-                          "IBM Plex Sans", 36,
-                          width / 2, cy + 10, TEXT_MUTED, weight='Regular', align='center')
-
     # ── Athlete Name (raised from 44px to 54px) ──
     if options.get('showName', True):
-        athlete = workout_data.get('athlete')
+        athlete = workout.athlete
         if athlete:
-            name = f"{athlete.get('firstName', '')} {athlete.get('lastName', '')}".strip()
+            name = f"{athlete.first_name} {athlete.last_name}".strip()
         else:
             name = options.get('athleteName', 'Athlete')
 
         name_y = height - 200
-        nw, nh = draw_text(ctx, name, "IBM Plex Sans", 54,
-                           width / 2, name_y, TEXT_SECONDARY, weight='SemiBold', align='center')
-        ctx.set_source_rgba(*GOLD, 0.4)
-        ctx.rectangle((width - nw - 40) / 2, name_y + nh + 20, nw + 40, 3)
-        ctx.fill()
+        name_text = scene.add(fitted_line(name, "IBM Plex Sans", width / 2, name_y, width - 320, 54, 40,
+                                          TEXT_SECONDARY, weight='SemiBold', align='center',
+                                          key='athlete_name'))
+        scene.add(TextUnderline(name_text, GOLD, alpha=0.4))
 
     # ── Decorative Elements ──
-    radial = cairo.RadialGradient(width - 200, height - 200, 0, width - 200, height - 200, 300)
-    radial.add_color_stop_rgba(0, *ROSE, 0.08)
-    radial.add_color_stop_rgba(1, *ROSE, 0)
-    ctx.set_source(radial)
-    ctx.arc(width - 200, height - 200, 300, 0, 2 * math.pi)
-    ctx.fill()
+    scene.add(Group([
+        Shape(lambda ctx: draw_corner_decorations(ctx, width, height)),
+    ], static_key=('decorations',)))
+
+    scene.add_grain(opacity=0.03)
+    scene.add_branding(options)
+    scene.add_share_qr(options)
+
+    return scene
 
-    ctx.set_source_rgba(*GOLD, 0.3)
-    ctx.arc(width - 140, 100, 40, 0, 2 * math.pi)
-    ctx.fill()
 
-    draw_grain_texture(ctx, width, height, opacity=0.03)
-    draw_oarbit_branding(ctx, width, height, format_key, options)
+def render_erg_summary_alt(format_key, workout_data, options):
+    """Render Design B. Returns: PNG bytes"""
+    return render_scene(build_erg_summary_alt_scene(format_key, workout_data, options), options)
+
+
+# Sample data for testing (shape matches serializeWorkoutForPython in shareCardService.js)
+SAMPLE_ERG_CONTINUOUS = {
+    'date': '2026-02-10T14:30:00.000Z',
+    'distanceM': 2000,
+    'durationSeconds': 382.1,
+    'avgPaceTenths': 955.3,
+    'avgWatts': 312,
+    'avgHeartRate': 185,
+    'strokeRate': 32,
+    'calories': 121,
+    'dragFactor': 118,
+    'machineType': 'rower',
+    'workoutType': 'FixedDistanceSplits',
+    'rawMachineType': 'rower',
+    'isInterval': False,
+    'splits': [
+        {'splitNumber': 1, 'distanceM': 500, 'timeSeconds': 94.2, 'paceTenths': 942, 'watts': 322, 'strokeRate': 34, 'heartRate': 172},
+        {'splitNumber': 2, 'distanceM': 500, 'timeSeconds': 95.8, 'paceTenths': 958, 'watts': 308, 'strokeRate': 32, 'heartRate': 182},
+        {'splitNumber': 3, 'distanceM': 500, 'timeSeconds': 96.1, 'paceTenths': 961, 'watts': 305, 'strokeRate': 31, 'heartRate': 188},
+        {'splitNumber': 4, 'distanceM': 500, 'timeSeconds': 96.0, 'paceTenths': 960, 'watts': 306, 'strokeRate': 33, 'heartRate': 192},
+    ],
+    'athlete': {'firstName': 'Marcus', 'lastName': 'Chen'},
+}
+
+SAMPLE_ERG_INTERVALS = {
+    'date': '2026-02-12T07:15:00.000Z',
+    'distanceM': 7700,
+    'durationSeconds': 1848.0,
+    'avgPaceTenths': 1200.0,
+    'avgWatts': 203,
+    'avgHeartRate': 168,
+    'strokeRate': 22,
+    'machineType': 'rower',
+    'workoutType': 'FixedTimeInterval',
+    'rawMachineType': 'rower',
+    'isInterval': True,
+    'splits': [
+        {'splitNumber': i + 1, 'distanceM': 2740 + d, 'timeSeconds': 660.0, 'paceTenths': round(6600 / (2740 + d) * 500, 1),
+         'watts': 198 + d // 4, 'strokeRate': 22, 'heartRate': 164 + i, 'restTime': 600,
+         'heartRateEnding': 170 + i, 'heartRateRest': 128 + i}
+        for i, d in enumerate([0, 12, 18, 9, 25, 31, 44])
+    ],
+    'athlete': {'firstName': 'Marcus', 'lastName': 'Chen'},
+}
 
-    return surface_to_png_bytes(surface)
+# 30 x 700m: buckets never span a round 1000m, so rows are labelled by split number
+SAMPLE_ERG_ODD_SPLITS = {
+    'date': '2026-02-16T06:40:00.000Z',
+    'distanceM': 21000,
+    'durationSeconds': 4874.5,
+    'avgPaceTenths': 1160.6,
+    'avgWatts': 224,
+    'avgHeartRate': 158,
+    'strokeRate': 21,
+    'machineType': 'rower',
+    'workoutType': 'FixedDistanceSplits',
+    'rawMachineType': 'rower',
+    'isInterval': False,
+    'splits': [
+        {'splitNumber': i + 1, 'distanceM': 700, 'timeSeconds': round(162.4 + d, 1),
+         'paceTenths': round((162.4 + d) / 700 * 5000), 'watts': 224 - round(d * 4),
+         'strokeRate': 21 + i % 2, 'heartRate': 150 + i // 3}
+        for i, d in enumerate([1.2, -0.4, 0.3, 0.8, -1.1, 0.0, 0.6, -0.2, 1.5, 0.4, -0.7, 0.9, 0.1, -0.3, 1.0,
+                               0.5, -0.9, 0.2, 0.7, -0.5, 1.3, 0.0, -0.6, 0.8, 0.3, -1.2, 0.4, 0.6, -0.8, -2.4])
+    ],
+    'athlete': {'firstName': 'Marcus', 'lastName': 'Chen'},
+}
+
+SAMPLE_ERG_JUST_ROW = {
+    'date': '2026-02-14T18:02:00.000Z',
+    'distanceM': 1169,
+    'durationSeconds': 300.0,
+    'avgPaceTenths': 1283.1,
+    'avgWatts': 166,
+    'avgHeartRate': 141,
+    'strokeRate': 20,
+    'calories': 52,
+    'machineType': 'rower',
+    'workoutType': 'JustRow',
+    'rawMachineType': 'rower',
+    'isInterval': False,
+    'splits': [
+        {'splitNumber': 1, 'distanceM': 1169, 'timeSeconds': 300.0, 'paceTenths': 1283, 'watts': 166, 'strokeRate': 20, 'heartRate': 141},
+    ],
+    'athlete': {'firstName': 'Marcus', 'lastName': 'Chen'},
+}
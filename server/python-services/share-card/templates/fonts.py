@@ -0,0 +1,103 @@
+"""
+Fonts - registers the bundled IBM Plex files with Pango at startup
+Instead of scanning every fontconfig directory on the host (and relying on
+fc-cache having been run at build time), a private fontconfig configuration
+is built from the exact files in fonts/. FreeType maps each file once, and
+Pango only ever matches against these few faces plus the symbol fallbacks.
+"""
+
+import ctypes.util
+import os
+import threading
+
+from cffi import FFI
+
+# Bundled faces - every file must exist, or the service refuses to start
+BUNDLED_FONTS = (
+    'IBMPlexSans-Regular.ttf',
+    'IBMPlexSans-SemiBold.ttf',
+    'IBMPlexSans-Bold.ttf',
+    'IBMPlexMono-Regular.ttf',
+    'IBMPlexMono-Bold.ttf',
+)
+
+# System fonts for glyphs IBM Plex lacks (arrows, star, medal emoji) - used when installed
+FALLBACK_FONTS = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf',
+)
+
+_ffi = FFI()
+_ffi.cdef("""
+    typedef int FcBool;
+    typedef unsigned char FcChar8;
+    typedef struct _FcConfig FcConfig;
+    FcConfig *FcConfigCreate (void);
+    FcBool FcConfigAppFontAddFile (FcConfig *config, const FcChar8 *file);
+
+    void *pango_cairo_font_map_get_default (void);
+    void pango_fc_font_map_set_config (void *fcfontmap, FcConfig *fcconfig);
+""")
+
+# Private fontconfig configuration holding only the registered files
+_config = None
+_pango_libs = None
+_config_lock = threading.Lock()
+_local = threading.local()
+
+
+def _dlopen(names):
+    for name in names:
+        try:
+            return _ffi.dlopen(ctypes.util.find_library(name) or name)
+        except OSError:
+            pass
+    raise OSError(f"dlopen() failed to load {' / '.join(names)}")
+
+
+def get_font_path(font_file):
+    """Get absolute path to font file in fonts/ directory"""
+    script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(script_dir, 'fonts', font_file)
+
+
+def register_fonts():
+    """
+    Build the private font configuration from BUNDLED_FONTS (once per process)
+
+    Raises:
+        FileNotFoundError: A bundled font file is missing
+        RuntimeError: fontconfig could not load a font file
+    """
+    global _config, _pango_libs
+    with _config_lock:
+        if _config is not None:
+            return
+        missing = [name for name in BUNDLED_FONTS if not os.path.isfile(get_font_path(name))]
+        if missing:
+            raise FileNotFoundError(f"Bundled fonts missing from {get_font_path('')}: {', '.join(missing)}")
+
+        fontconfig = _dlopen(['fontconfig', 'fontconfig-1'])
+        config = fontconfig.FcConfigCreate()
+        paths = [get_font_path(name) for name in BUNDLED_FONTS]
+        paths += [path for path in FALLBACK_FONTS if os.path.isfile(path)]
+        for path in paths:
+            if not fontconfig.FcConfigAppFontAddFile(config, path.encode()):
+                raise RuntimeError(f"fontconfig could not load {path}")
+        _pango_libs = (_dlopen(['pangocairo-1.0', 'pangocairo-1.0-0']), _dlopen(['pangoft2-1.0', 'pangoft2-1.0-0']))
+        _config = config
+
+
+def use_bundled_fonts():
+    """
+    Point this thread's default Pango font map at the registered fonts
+
+    Pango keeps one default font map per thread, so every thread that creates
+    layouts calls this first; repeat calls are free.
+    """
+    if getattr(_local, 'ready', False):
+        return
+    register_fonts()
+    pangocairo, pangoft2 = _pango_libs
+    pangoft2.pango_fc_font_map_set_config(pangocairo.pango_cairo_font_map_get_default(), _config)
+    _local.ready = True
@@ -0,0 +1,216 @@
+"""
+Glyph Atlas - pre-rendered sprites for numbers, trend arrows and medals
+Numeric values in IBM Plex Mono and the handful of symbols the cards use
+(↑ ↓ ★ 🥇 🥈 🥉) are rendered through Pango once per font face into one atlas
+surface, the first time a template draws a run of them in that face. Text made only of atlas characters is then composited sprite by
+sprite instead of being shaped, which also skips Pango's fallback-font lookup
+for the arrows and colour emoji on every card. Anything else is shaped as usual,
+as is everything on SVG/PDF output, where text should stay vector glyphs.
+"""
+
+import math
+from collections import OrderedDict
+
+import cairocffi as cairo
+import pangocairocffi as pango
+
+from templates.base_template import create_text_layout, is_vector_target, PANGO_SCALE
+
+# Characters every atlas face carries: table numbers, times and counts
+ATLAS_DIGITS = '0123456789:.,'
+# Symbols, only carried by the faces that draw them
+ATLAS_SYMBOLS = '↑↓★🥇🥈🥉'
+# Colour emoji keep their own colours; every other sprite is a coverage mask
+ATLAS_COLOR_GLYPHS = frozenset('🥇🥈🥉')
+
+# Horizontal subpixel positions each glyph is pre-rendered at (quarter pixels)
+SUBPIXEL_PHASES = 4
+
+# Families whose digits are drawn from the atlas; other families only use it
+# for runs that contain a symbol (proportional digits keep Pango's kerning)
+ATLAS_DIGIT_FAMILIES = frozenset({"IBM Plex Mono"})
+
+# Built atlases - (family, size, weight) -> {char: Glyph}, LRU bounded
+_atlases = OrderedDict()
+ATLAS_CACHE_SIZE = 64
+# Composed runs - (text, family, size, weight) -> GlyphRun or None
+_runs = OrderedDict()
+RUN_CACHE_SIZE = 4096
+
+
+class Glyph:
+    """
+    One atlas character
+
+    Attributes:
+        advance: Pen advance in pixels
+        ascent, height: Logical ascent and height of the character's line
+        sprites: Per subpixel phase, (sub-surface, dx, dy) with dx/dy the sprite's
+                 offset from the whole-pixel pen position and baseline; empty for spaces
+        color: True for colour emoji, painted as-is instead of used as a mask
+    """
+    __slots__ = ('advance', 'ascent', 'height', 'sprites', 'color')
+
+    def __init__(self, advance, ascent, height, color):
+        self.advance = advance
+        self.ascent = ascent
+        self.height = height
+        self.sprites = ()
+        self.color = color
+
+
+class GlyphRun:
+    """
+    A string composed from atlas sprites, measured like a single-line layout
+
+    width is the sum of advances; ascent and height follow Pango's line
+    metrics (tallest ascent plus deepest descent of the glyphs used). The
+    text and face are kept so vector output can shape real glyphs instead.
+    """
+    __slots__ = ('glyphs', 'width', 'ascent', 'height', 'text', 'face')
+
+    def __init__(self, glyphs, text, face):
+        self.glyphs = glyphs
+        self.text = text
+        self.face = face
+        self.width = sum(g.advance for g in glyphs)
+        self.ascent = max(g.ascent for g in glyphs)
+        self.height = self.ascent + max(g.height - g.ascent for g in glyphs)
+
+    def draw(self, ctx, x, y):
+        """Draw with the top-left at (x, y), masking the context's current source like show_layout"""
+        if is_vector_target(ctx):
+            ctx.move_to(x, y)
+            pango.show_layout(ctx, create_text_layout(ctx, self.text, *self.face))
+            return
+        source = ctx.get_source()
+        baseline = round(y + self.ascent)
+        pen = x
+        for glyph in self.glyphs:
+            if glyph.sprites:
+                left = math.floor(pen)
+                phase = round((pen - left) * SUBPIXEL_PHASES)
+                if phase == SUBPIXEL_PHASES:
+                    left, phase = left + 1, 0
+                sprite, dx, dy = glyph.sprites[phase]
+                if glyph.color:
+                    ctx.set_source_surface(sprite, left + dx, baseline + dy)
+                    ctx.paint()
+                    ctx.set_source(source)
+                else:
+                    ctx.mask_surface(sprite, left + dx, baseline + dy)
+            pen += glyph.advance
+
+
+def _build_atlas(family, size, weight, chars):
+    """Render every character of a face at each subpixel phase into one surface"""
+    scratch = cairo.Context(cairo.ImageSurface(cairo.FORMAT_ARGB32, 1, 1))
+    glyphs = {}
+    boxes = []      # (char, phase, x0, y0, w, h) in pixels, y relative to the baseline
+    for char in ' ' + chars:
+        layout = create_text_layout(scratch, char, family, size, weight)
+        ink, logical = layout.get_extents()
+        baseline = layout.get_baseline() / PANGO_SCALE
+        glyph = Glyph(logical.width / PANGO_SCALE, baseline, logical.height / PANGO_SCALE,
+                      char in ATLAS_COLOR_GLYPHS)
+        glyphs[char] = glyph
+        if char == ' ' or not ink.width:
+            continue
+        ink_left, ink_top = ink.x / PANGO_SCALE, ink.y / PANGO_SCALE - baseline
+        ink_right = ink_left + ink.width / PANGO_SCALE
+        ink_bottom = ink_top + ink.height / PANGO_SCALE
+        for phase in range(SUBPIXEL_PHASES):
+            offset = phase / SUBPIXEL_PHASES
+            # One pixel of slack on every side for antialiasing
+            x0 = math.floor(ink_left + offset) - 1
+            y0 = math.floor(ink_top) - 1
+            boxes.append((char, phase, x0, y0,
+                          math.ceil(ink_right + offset) + 1 - x0, math.ceil(ink_bottom) + 1 - y0))
+
+    if boxes:
+        atlas = cairo.ImageSurface(cairo.FORMAT_ARGB32, sum(b[4] for b in boxes), max(b[5] for b in boxes))
+        ctx = cairo.Context(atlas)
+        ctx.set_source_rgb(1, 1, 1)
+        sprites = {}
+        left = 0
+        for char, phase, x0, y0, w, h in boxes:
+            layout = create_text_layout(ctx, char, family, size, weight)
+            # Pen at (left - x0 + phase offset), baseline at row -y0
+            ctx.move_to(left - x0 + phase / SUBPIXEL_PHASES, -y0 - glyphs[char].ascent)
+            pango.show_layout(ctx, layout)
+            sprites.setdefault(char, []).append((atlas.create_for_rectangle(left, 0, w, h), x0, y0))
+            left += w
+        atlas.flush()
+        for char, phase_sprites in sprites.items():
+            glyphs[char].sprites = tuple(phase_sprites)
+    return glyphs
+
+
+def atlas_chars(text, family):
+    """Characters a face's atlas needs to compose text, or None when text is shaped by Pango"""
+    chars = set(text) - {' '}
+    if not chars or not chars <= set(ATLAS_DIGITS + ATLAS_SYMBOLS):
+        return None
+    if chars & set(ATLAS_SYMBOLS):
+        return ATLAS_DIGITS + ATLAS_SYMBOLS
+    return ATLAS_DIGITS if family in ATLAS_DIGIT_FAMILIES else None
+
+
+def face_atlas(family, size, weight, chars=ATLAS_DIGITS):
+    """{char: Glyph} for a face, covering at least chars (built on first use, rebuilt if it lacks some)"""
+    face = (family, size, weight)
+    glyphs = _atlases.get(face)
+    if glyphs is not None and all(char in glyphs for char in chars):
+        _atlases.move_to_end(face)
+        return glyphs
+    if glyphs is not None:
+        # Keep what the face already had: a digits atlas asked for symbols grows to both
+        chars = ''.join(dict.fromkeys(''.join(glyphs) + chars)).replace(' ', '')
+    glyphs = _atlases[face] = _build_atlas(family, size, weight, chars)
+    _atlases.move_to_end(face)
+    if len(_atlases) > ATLAS_CACHE_SIZE:
+        _atlases.popitem(last=False)
+    return glyphs
+
+
+def glyph_run(text, family, size, weight):
+    """GlyphRun for text made only of atlas characters (see atlas_chars), else None"""
+    key = (text, family, size, weight)
+    if key in _runs:
+        _runs.move_to_end(key)
+        return _runs[key]
+    run = None
+    chars = atlas_chars(text, family)
+    if chars is not None:
+        glyphs = face_atlas(family, size, weight, chars)
+        run = GlyphRun([glyphs[char] for char in text], text, (family, size, weight))
+    _runs[key] = run
+    if len(_runs) > RUN_CACHE_SIZE:
+        _runs.popitem(last=False)
+    return run
+
+
+def warm_glyph_atlas(card_types=None):
+    """
+    Build the atlases of every face the sample cards draw numbers and symbols
+    in (worker warm-up, see registry.preload_templates)
+
+    Resolving each sample scene runs its text through glyph_run, so the faces
+    come from the templates themselves; faces only real payloads reach (other
+    auto-fit sizes, say) are built on their first card. samples.py imports
+    every template module, so warming up loads them all.
+
+    Args:
+        card_types: Optional iterable restricting which card types' samples are resolved
+    """
+    from samples import SAMPLE_PAYLOADS, DEFAULT_OPTIONS, FORMATS
+    from templates.models import decode_workout
+    from templates.registry import CARD_SCENE_BUILDERS
+
+    for card_type, samples in SAMPLE_PAYLOADS.items():
+        if card_types and card_type not in card_types:
+            continue
+        for workout_data in samples.values():
+            model = decode_workout(card_type, workout_data)
+            for format_key in FORMATS:
+                CARD_SCENE_BUILDERS[card_type](format_key, model, dict(DEFAULT_OPTIONS)).resolve()
@@ -0,0 +1,95 @@
+"""
+Heatmap - GitHub-style daily training volume calendar
+The day grid and its colour levels are computed as arrays in one pass, then
+rasterized into a buffer a few pixels per day. Cards composite that buffer
+with one scaled blit instead of drawing ~365 rounded rects.
+"""
+
+import cairocffi as cairo
+import numpy as np
+
+from templates.base_template import GOLD, COPPER, SLATE
+from templates.pixels import surface_pixels
+
+# Most recent weeks shown; a full year fits in 53 Monday-first columns
+HEATMAP_MAX_WEEKS = 53
+
+# Buffer pixels per day cell, and gap pixels between cells
+HEATMAP_CELL = 4
+HEATMAP_GAP = 1
+
+# Colour level -> (rgb, alpha); level 0 is a rest day, 1-4 are volume quartiles
+HEATMAP_LEVELS = (
+    (SLATE, 0.45),
+    (COPPER, 0.35),
+    (COPPER, 0.7),
+    (GOLD, 0.75),
+    (GOLD, 1.0),
+)
+
+
+def _premultiplied_argb(rgb, alpha):
+    """Cairo ARGB32 pixel value (premultiplied, native endian) for an rgb + alpha"""
+    a = round(alpha * 255)
+    r, g, b = (round(c * alpha * 255) for c in rgb)
+    return (a << 24) | (r << 16) | (g << 8) | b
+
+
+# Palette index 0 is transparent (outside the season); 1.. are HEATMAP_LEVELS
+HEATMAP_PALETTE = np.array([0] + [_premultiplied_argb(rgb, a) for rgb, a in HEATMAP_LEVELS], dtype=np.uint32)
+
+
+def volume_levels(days, meters):
+    """
+    Colour level of every day cell, shaped (7, weeks), Monday in row 0
+
+    days is a datetime64[D] array, meters the matching distances (NaN or a
+    missing column counts as zero). Active days are split into quartiles of
+    daily volume (levels 1-4), rest days are level 0, and cells before the
+    first or after the last workout are -1. Returns None without workouts.
+    """
+    if not len(days):
+        return None
+    meters = np.zeros(len(days)) if meters is None else np.nan_to_num(meters)
+
+    day_numbers = days.astype(np.int64)
+    first, last = int(day_numbers.min()), int(day_numbers.max())
+    # 1970-01-01 was a Thursday: (day + 3) % 7 is 0 on Mondays
+    start = max(first - (first + 3) % 7, last - (last + 3) % 7 - 7 * (HEATMAP_MAX_WEEKS - 1))
+    weeks = (last - start) // 7 + 1
+
+    shown = day_numbers >= start
+    totals = np.bincount(day_numbers[shown] - start, weights=meters[shown], minlength=weeks * 7)
+
+    active = totals > 0
+    levels = np.zeros(weeks * 7, dtype=np.int8)
+    if active.any():
+        thresholds = np.quantile(totals[active], (0.25, 0.5, 0.75))
+        levels[active] = 1 + np.searchsorted(thresholds, totals[active], side='left')
+
+    cell_day = start + np.arange(weeks * 7)
+    levels[(cell_day < first) | (cell_day > last)] = -1
+    return levels.reshape(weeks, 7).T
+
+
+def heatmap_surface(levels):
+    """
+    Rasterize a volume_levels() grid into a small ARGB32 surface
+
+    Every pixel is looked up from (row, column) -> cell -> palette in one
+    vectorised gather; the one-pixel gaps between cells stay transparent.
+    """
+    pitch = HEATMAP_CELL + HEATMAP_GAP
+    rows, weeks = levels.shape
+    height, width = rows * pitch - HEATMAP_GAP, weeks * pitch - HEATMAP_GAP
+
+    ys, xs = np.arange(height), np.arange(width)
+    pixels = HEATMAP_PALETTE[levels[ys // pitch][:, xs // pitch] + 1]
+    gap = (ys % pitch == HEATMAP_CELL)[:, None] | (xs % pitch == HEATMAP_CELL)[None, :]
+    pixels[gap] = 0
+
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, width, height)
+    surface.flush()
+    surface_pixels(surface)[...] = pixels
+    surface.mark_dirty()
+    return surface
@@ -0,0 +1,463 @@
+"""
+Request Models - typed, slotted workoutData per card type
+Decoded and validated in one pass before any surface is allocated, so a bad
+payload is rejected with a 400 instead of failing halfway through a card.
+Renderers read attributes off these objects rather than indexing raw dicts.
+"""
+
+import numpy as np
+
+# Marks a field the payload must provide
+REQUIRED = object()
+
+
+class PayloadError(ValueError):
+    """workoutData failed validation; the message names the offending field"""
+
+
+# ─────────────────────────────────────────────
+# Field kinds: fn(value, path) -> decoded value
+# ─────────────────────────────────────────────
+
+def _type_name(value):
+    return type(value).__name__
+
+
+def text(value, path):
+    if not isinstance(value, str):
+        raise PayloadError(f"{path}: expected a string, got {_type_name(value)}")
+    return value
+
+
+def number(value, path):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise PayloadError(f"{path}: expected a number, got {_type_name(value)}")
+    return value
+
+
+def integer(value, path):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise PayloadError(f"{path}: expected an integer, got {_type_name(value)}")
+    return value
+
+
+def flag(value, path):
+    if not isinstance(value, bool):
+        raise PayloadError(f"{path}: expected a boolean, got {_type_name(value)}")
+    return value
+
+
+def label(value, path):
+    """Display value: strings pass through, numbers are formatted"""
+    if isinstance(value, str):
+        return value
+    return str(number(value, path))
+
+
+def code(value, path):
+    """Enum-like value the upstream API sends as either a name or a number"""
+    if isinstance(value, str):
+        return value
+    return integer(value, path)
+
+
+def column(value, path):
+    """Numeric column decoded straight to a float array; nulls become NaN"""
+    if not isinstance(value, list):
+        raise PayloadError(f"{path}: expected a list, got {_type_name(value)}")
+    try:
+        values = np.array(value, dtype=float)
+    except (TypeError, ValueError):
+        raise PayloadError(f"{path}: expected a list of numbers") from None
+    if values.ndim != 1:
+        raise PayloadError(f"{path}: expected a flat list of numbers")
+    return values
+
+
+def date_column(value, path):
+    """ISO date/datetime strings decoded to a datetime64[D] array (time of day dropped)"""
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise PayloadError(f"{path}: expected a list of ISO date strings")
+    try:
+        return np.array([item[:10] for item in value], dtype='datetime64[D]')
+    except ValueError:
+        raise PayloadError(f"{path}: expected a list of ISO date strings") from None
+
+
+def text_column(value, path):
+    """Column of optional strings, kept as a tuple"""
+    if not isinstance(value, list) or not all(item is None or isinstance(item, str) for item in value):
+        raise PayloadError(f"{path}: expected a list of strings")
+    return tuple(value)
+
+
+def list_of(kind):
+    """Kind for a list whose items are all of `kind`; decoded to a tuple"""
+    def decode(value, path):
+        if not isinstance(value, list):
+            raise PayloadError(f"{path}: expected a list, got {_type_name(value)}")
+        return tuple(kind(item, f"{path}[{i}]") for i, item in enumerate(value))
+    return decode
+
+
+def optional(kind):
+    """Kind that also accepts null (decoded to None), for list items that may be missing"""
+    def decode(value, path):
+        return None if value is None else kind(value, path)
+    return decode
+
+
+# ─────────────────────────────────────────────
+# Base Model
+# ─────────────────────────────────────────────
+
+class Model:
+    """
+    Slotted record decoded from a JSON object
+
+    Subclasses declare __slots__ and FIELDS, a tuple of
+    (attribute, payload key, kind, default); default REQUIRED rejects payloads
+    that omit the key. A null value counts as absent. Keys not listed in
+    FIELDS are dropped. Models are themselves kinds (Model.decode), so they
+    nest inside other models and list_of().
+    """
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, **values):
+        for attr, key, kind, default in self.FIELDS:
+            setattr(self, attr, values.get(attr, None if default is REQUIRED else default))
+
+    @classmethod
+    def decode(cls, raw, path):
+        if not isinstance(raw, dict):
+            raise PayloadError(f"{path}: expected an object, got {_type_name(raw)}")
+        obj = cls.__new__(cls)
+        for attr, key, kind, default in cls.FIELDS:
+            value = raw.get(key)
+            if value is None:
+                if default is REQUIRED:
+                    raise PayloadError(f"{path}.{key}: required")
+                value = default
+            else:
+                value = kind(value, f"{path}.{key}")
+            setattr(obj, attr, value)
+        return obj
+
+    @classmethod
+    def coerce(cls, workout_data):
+        """Decode a raw workoutData dict; already-decoded models pass through"""
+        if isinstance(workout_data, cls):
+            return workout_data
+        return cls.decode(workout_data if workout_data is not None else {}, 'workoutData')
+
+    def __repr__(self):
+        fields = ', '.join(f"{attr}={getattr(self, attr)!r}" for attr, *_ in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+# ─────────────────────────────────────────────
+# erg_summary (Design A)
+# ─────────────────────────────────────────────
+
+class SummarySplit(Model):
+    __slots__ = ('split_number', 'pace', 'watts', 'stroke_rate', 'heart_rate')
+    FIELDS = (
+        ('split_number', 'split_number', integer, REQUIRED),
+        ('pace', 'pace', label, REQUIRED),
+        ('watts', 'watts', number, REQUIRED),
+        ('stroke_rate', 'stroke_rate', number, REQUIRED),
+        ('heart_rate', 'heart_rate', number, None),
+    )
+
+
+class ErgSummaryData(Model):
+    __slots__ = ('title', 'date', 'type', 'total_time', 'avg_pace', 'avg_watts', 'avg_heart_rate',
+                 'avg_stroke_rate', 'distance_m', 'duration_seconds', 'athlete_name', 'splits')
+    FIELDS = (
+        ('title', 'title', text, REQUIRED),
+        ('date', 'date', text, REQUIRED),
+        ('type', 'type', text, REQUIRED),
+        ('total_time', 'total_time', label, REQUIRED),
+        ('avg_pace', 'avg_pace', label, REQUIRED),
+        ('avg_watts', 'avg_watts', number, REQUIRED),
+        ('avg_heart_rate', 'avg_heart_rate', number, REQUIRED),
+        ('avg_stroke_rate', 'avg_stroke_rate', number, REQUIRED),
+        ('distance_m', 'distance_m', number, REQUIRED),
+        ('duration_seconds', 'duration_seconds', number, REQUIRED),
+        ('athlete_name', 'athlete_name', text, 'Athlete'),
+        ('splits', 'splits', list_of(SummarySplit.decode), REQUIRED),
+    )
+
+
+# ─────────────────────────────────────────────
+# erg_summary_alt (Design B) - shape of serializeWorkoutForPython
+# ─────────────────────────────────────────────
+
+class ErgSplit(Model):
+    """
+    One split or interval; aggregated table rows (bucket_splits) are ErgSplits
+    too, with end_distance_m, end_seconds and label filled in
+    """
+    __slots__ = ('split_number', 'distance_m', 'time_seconds', 'pace_tenths', 'watts', 'stroke_rate',
+                 'heart_rate', 'calories', 'interval_type', 'rest_time', 'rest_distance',
+                 'heart_rate_max', 'heart_rate_min', 'heart_rate_ending', 'heart_rate_rest',
+                 'end_distance_m', 'end_seconds', 'label')
+    FIELDS = (
+        ('split_number', 'splitNumber', integer, None),
+        ('distance_m', 'distanceM', number, None),
+        ('time_seconds', 'timeSeconds', number, None),
+        ('pace_tenths', 'paceTenths', number, None),
+        ('watts', 'watts', number, None),
+        ('stroke_rate', 'strokeRate', number, None),
+        ('heart_rate', 'heartRate', number, None),
+        ('calories', 'calories', number, None),
+        ('interval_type', 'intervalType', text, None),
+        ('rest_time', 'restTime', number, None),
+        ('rest_distance', 'restDistance', number, None),
+        ('heart_rate_max', 'heartRateMax', number, None),
+        ('heart_rate_min', 'heartRateMin', number, None),
+        ('heart_rate_ending', 'heartRateEnding', number, None),
+        ('heart_rate_rest', 'heartRateRest', number, None),
+        ('end_distance_m', 'endDistanceM', number, None),
+        ('end_seconds', 'endSeconds', number, None),
+        ('label', 'label', text, None),
+    )
+
+
+class Athlete(Model):
+    __slots__ = ('first_name', 'last_name')
+    FIELDS = (
+        ('first_name', 'firstName', text, ''),
+        ('last_name', 'lastName', text, ''),
+    )
+
+
+class InferredPattern(Model):
+    __slots__ = ('inferred_title',)
+    FIELDS = (
+        ('inferred_title', 'inferredTitle', text, None),
+    )
+
+
+class Telemetry(Model):
+    """
+    Per-stroke columns, decoded to float arrays (missing readings are NaN)
+
+    force_curve_bands and series_points are not read from the payload:
+    streamed sessions arrive already folded (TelemetryAccumulator) - force
+    curves into bands, each column into {column: (t, values)} min/max points -
+    and decoded payloads leave both None.
+    """
+    __slots__ = ('time_s', 'watts', 'heart_rate', 'stroke_rate', 'force_curves',
+                 'force_curve_bands', 'series_points')
+    FIELDS = (
+        ('time_s', 'timeSeriesS', column, None),
+        ('watts', 'wattsSeries', column, None),
+        ('heart_rate', 'heartRateSeries', column, None),
+        ('stroke_rate', 'strokeRateSeries', column, None),
+        ('force_curves', 'forceCurves', list_of(optional(column)), None),
+    )
+
+    def __init__(self, force_curve_bands=None, series_points=None, **values):
+        super().__init__(**values)
+        self.force_curve_bands = force_curve_bands
+        self.series_points = series_points
+
+    @classmethod
+    def decode(cls, raw, path):
+        telemetry = super().decode(raw, path)
+        telemetry.force_curve_bands = None
+        telemetry.series_points = None
+        return telemetry
+
+
+class ErgWorkoutData(Model):
+    __slots__ = ('date', 'distance_m', 'duration_seconds', 'avg_pace_tenths', 'avg_watts', 'avg_heart_rate',
+                 'stroke_rate', 'calories', 'drag_factor', 'machine_type', 'raw_machine_type',
+                 'workout_type', 'is_interval', 'splits', 'athlete', 'inferred_pattern', 'telemetry')
+    FIELDS = (
+        ('date', 'date', text, ''),
+        ('distance_m', 'distanceM', number, None),
+        ('duration_seconds', 'durationSeconds', number, None),
+        ('avg_pace_tenths', 'avgPaceTenths', number, None),
+        ('avg_watts', 'avgWatts', number, None),
+        ('avg_heart_rate', 'avgHeartRate', number, None),
+        ('stroke_rate', 'strokeRate', number, None),
+        ('calories', 'calories', number, None),
+        ('drag_factor', 'dragFactor', number, None),
+        ('machine_type', 'machineType', text, None),
+        ('raw_machine_type', 'rawMachineType', text, None),
+        ('workout_type', 'workoutType', code, ''),
+        ('is_interval', 'isInterval', flag, False),
+        ('splits', 'splits', list_of(ErgSplit.decode), ()),
+        ('athlete', 'athlete', Athlete.decode, None),
+        ('inferred_pattern', 'inferredPattern', InferredPattern.decode, None),
+        ('telemetry', 'telemetry', Telemetry.decode, None),
+    )
+
+
+# ─────────────────────────────────────────────
+# Regatta cards
+# ─────────────────────────────────────────────
+
+class RegattaResultData(Model):
+    __slots__ = ('regatta_name', 'location', 'date', 'event_name', 'placement', 'total_entries', 'time',
+                 'margin_ahead', 'margin_behind', 'crew_list', 'event_type')
+    FIELDS = (
+        ('regatta_name', 'regatta_name', text, 'Regatta'),
+        ('location', 'location', text, ''),
+        ('date', 'date', text, ''),
+        ('event_name', 'event_name', text, ''),
+        ('placement', 'placement', integer, 1),
+        ('total_entries', 'total_entries', integer, 0),
+        ('time', 'time', label, '--:--'),
+        ('margin_ahead', 'margin_ahead', number, None),
+        ('margin_behind', 'margin_behind', number, None),
+        ('crew_list', 'crew_list', list_of(text), ()),
+        ('event_type', 'event_type', text, ''),
+    )
+
+
+class RaceResult(Model):
+    __slots__ = ('event_name', 'placement', 'time', 'margin')
+    FIELDS = (
+        ('event_name', 'event_name', text, ''),
+        ('placement', 'placement', integer, 0),
+        ('time', 'time', label, ''),
+        ('margin', 'margin', label, ''),
+    )
+
+
+class RegattaSummaryData(Model):
+    __slots__ = ('regatta_name', 'location', 'date', 'races')
+    FIELDS = (
+        ('regatta_name', 'regatta_name', text, 'Regatta'),
+        ('location', 'location', text, ''),
+        ('date', 'date', text, ''),
+        ('races', 'races', list_of(RaceResult.decode), ()),
+    )
+
+
+# ─────────────────────────────────────────────
+# season_recap
+# ─────────────────────────────────────────────
+
+class BiggestImprovement(Model):
+    __slots__ = ('test_type', 'delta_seconds')
+    FIELDS = (
+        ('test_type', 'test_type', text, ''),
+        ('delta_seconds', 'delta_seconds', number, 0),
+    )
+
+
+class Improvement(Model):
+    __slots__ = ('test_type', 'old_time', 'new_time', 'delta')
+    FIELDS = (
+        ('test_type', 'test_type', text, ''),
+        ('old_time', 'old_time', label, ''),
+        ('new_time', 'new_time', label, ''),
+        ('delta', 'delta', label, ''),
+    )
+
+
+class SeasonWorkouts(Model):
+    """
+    A season's raw workouts as parallel columns, one entry per workout
+
+    Only date is required; every other column must match its length.
+    """
+    __slots__ = ('date', 'distance_m', 'duration_seconds', 'calories', 'machine_type', 'is_interval')
+    FIELDS = (
+        ('date', 'date', date_column, REQUIRED),
+        ('distance_m', 'distanceM', column, None),
+        ('duration_seconds', 'durationSeconds', column, None),
+        ('calories', 'calories', column, None),
+        ('machine_type', 'machineType', text_column, None),
+        ('is_interval', 'isInterval', column, None),
+    )
+
+    @classmethod
+    def decode(cls, raw, path):
+        obj = super().decode(raw, path)
+        count = len(obj.date)
+        for attr, key, kind, default in cls.FIELDS:
+            values = getattr(obj, attr)
+            if values is not None and len(values) != count:
+                raise PayloadError(f"{path}.{key}: expected {count} entries (one per date), got {len(values)}")
+        return obj
+
+
+class SeasonRecapData(Model):
+    """
+    Season recap totals; with `workouts` set they are computed from the raw
+    workout columns instead (see templates/season_stats.py)
+    """
+    __slots__ = ('season_name', 'date_range', 'total_meters', 'total_minutes', 'workout_count', 'prs_set',
+                 'total_calories', 'avg_weekly_meters', 'favorite_machine', 'biggest_improvement',
+                 'improvements', 'athlete_name', 'workouts')
+    FIELDS = (
+        ('season_name', 'season_name', text, 'Season'),
+        ('date_range', 'date_range', text, ''),
+        ('total_meters', 'total_meters', number, 0),
+        ('total_minutes', 'total_minutes', number, 0),
+        ('workout_count', 'workout_count', integer, 0),
+        ('prs_set', 'prs_set', integer, 0),
+        ('total_calories', 'total_calories', number, 0),
+        ('avg_weekly_meters', 'avg_weekly_meters', number, 0),
+        ('favorite_machine', 'favorite_machine', text, 'RowErg'),
+        ('biggest_improvement', 'biggest_improvement', BiggestImprovement.decode, None),
+        ('improvements', 'improvements', list_of(Improvement.decode), ()),
+        ('athlete_name', 'athlete_name', text, ''),
+        ('workouts', 'workouts', SeasonWorkouts.decode, None),
+    )
+
+
+# ─────────────────────────────────────────────
+# team_leaderboard
+# ─────────────────────────────────────────────
+
+class LeaderboardEntry(Model):
+    __slots__ = ('rank', 'athlete_name', 'metric_value', 'trend')
+    FIELDS = (
+        ('rank', 'rank', integer, 0),
+        ('athlete_name', 'athlete_name', text, ''),
+        ('metric_value', 'metric_value', label, ''),
+        ('trend', 'trend', text, ''),
+    )
+
+
+class LeaderboardData(Model):
+    __slots__ = ('team_name', 'period', 'leaderboard_type', 'entries')
+    FIELDS = (
+        ('team_name', 'team_name', text, 'Team'),
+        ('period', 'period', text, ''),
+        ('leaderboard_type', 'leaderboard_type', text, 'Leaderboard'),
+        ('entries', 'entries', list_of(LeaderboardEntry.decode), ()),
+    )
+
+
+# cardType -> workoutData model ('test' ignores workoutData and has none)
+WORKOUT_MODELS = {
+    'erg_summary': ErgSummaryData,
+    'erg_summary_alt': ErgWorkoutData,
+    'regatta_result': RegattaResultData,
+    'regatta_summary': RegattaSummaryData,
+    'season_recap': SeasonRecapData,
+    'team_leaderboard': LeaderboardData,
+}
+
+
+def decode_workout(card_type, workout_data):
+    """
+    Decode workoutData into card_type's model
+
+    Returns workout_data unchanged for card types without a model.
+    Raises PayloadError naming the first invalid field.
+    """
+    model = WORKOUT_MODELS.get(card_type)
+    if model is None:
+        return workout_data
+    return model.coerce(workout_data)
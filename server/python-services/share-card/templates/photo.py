@@ -0,0 +1,105 @@
+"""
+Photo backgrounds - a user's own photo, blurred and darkened behind the card
+A phone photo is far larger than a blurred background needs, so JPEGs are
+decoded in draft mode straight to the nearest DCT scale above the working
+size, and the crop, blur and darken run in Pillow's C code on that small
+buffer. The result is cached per photo content and format, so re-rendering
+a card with the same photo skips decoding and effects entirely.
+"""
+
+import binascii
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from templates.base_template import image_to_surface
+from templates.models import PayloadError
+
+# Backgrounds are processed at 1/PHOTO_WORK_SCALE of the canvas and scaled up
+# when drawn - after the blur the difference is invisible
+PHOTO_WORK_SCALE = 4
+# Gaussian blur radius, in working-size pixels
+PHOTO_BLUR_RADIUS = 6
+# Share of brightness removed so card text stays readable on any photo
+PHOTO_DARKEN = 0.55
+
+# Processed backgrounds - (content hash, canvas size, blur, darken) -> ImageSurface, LRU bounded by bytes
+_photos = OrderedDict()
+_photos_lock = threading.Lock()
+PHOTO_CACHE_BYTES = 32 * 1024 * 1024
+_photo_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+
+# EXIF orientation tag; values 5-8 swap width and height
+EXIF_ORIENTATION = 0x0112
+
+
+def _decode_photo(data, size):
+    """
+    Decode, crop to size, blur and darken a photo - Pillow image in RGB
+
+    JPEG draft mode needs the size in the file's own orientation, and the
+    smallest DCT scale that still covers the crop.
+    """
+    from PIL import Image, ImageFilter, ImageOps
+
+    image = Image.open(BytesIO(data))
+    width, height = size
+    if image.getexif().get(EXIF_ORIENTATION, 1) >= 5:
+        width, height = height, width
+    scale = max(width / image.width, height / image.height)
+    image.draft('RGB', (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+
+    image = ImageOps.exif_transpose(image).convert('RGB')
+    image = ImageOps.fit(image, size, Image.BILINEAR)
+    image = image.filter(ImageFilter.GaussianBlur(PHOTO_BLUR_RADIUS))
+    factor = 1 - PHOTO_DARKEN
+    return image.point([round(v * factor) for v in range(256)] * 3)
+
+
+def photo_background(photo, width, height):
+    """
+    Processed background surface for a photo, at working size for a width x height canvas
+
+    Args:
+        photo: The image file's bytes, or a base64 string of them (as sent in options)
+
+    Raises:
+        PayloadError: The photo is not valid base64 or not a decodable image
+    """
+    content = photo.encode('utf-8') if isinstance(photo, str) else photo
+    key = (hashlib.sha1(content).hexdigest(), (width, height), PHOTO_BLUR_RADIUS, PHOTO_DARKEN)
+    with _photos_lock:
+        surface = _photos.get(key)
+        if surface is not None:
+            _photos.move_to_end(key)
+            _photo_stats['hits'] += 1
+            return surface
+        _photo_stats['misses'] += 1
+
+    from PIL import Image
+
+    try:
+        data = binascii.a2b_base64(content) if isinstance(photo, str) else content
+        image = _decode_photo(data, (width // PHOTO_WORK_SCALE, height // PHOTO_WORK_SCALE))
+    except (binascii.Error, OSError, ValueError, Image.DecompressionBombError) as e:
+        raise PayloadError(f"backgroundPhoto: not a readable image ({e})")
+    surface = image_to_surface(image)
+
+    nbytes = surface.get_stride() * surface.get_height()
+    with _photos_lock:
+        if key not in _photos:
+            _photos[key] = surface
+            _photo_stats['bytes'] += nbytes
+            while _photo_stats['bytes'] > PHOTO_CACHE_BYTES:
+                _, evicted = _photos.popitem(last=False)
+                _photo_stats['bytes'] -= evicted.get_stride() * evicted.get_height()
+                _photo_stats['evictions'] += 1
+    return surface
+
+
+def photo_cache_stats():
+    """Photo background cache counters: hits, misses, evictions, entries and bytes held"""
+    with _photos_lock:
+        return dict(_photo_stats, entries=len(_photos))
@@ -0,0 +1,47 @@
+"""
+Pixels - NumPy/Pillow access to Cairo image surface buffers
+An ImageSurface's buffer is exposed as a NumPy array that shares its memory,
+so whole surfaces (grain, heatmaps, decoded images) are filled with one
+vectorised assignment instead of thousands of small Cairo fills.
+
+Pixels are Cairo ARGB32: one native-endian uint32 per pixel with premultiplied
+alpha.
+"""
+
+import sys
+
+import numpy as np
+
+
+def surface_pixels(surface):
+    """
+    (h, w) uint32 view of an ARGB32 surface's pixels (row padding excluded)
+
+    Writes go straight into the surface: flush() it before and mark_dirty()
+    it after.
+    """
+    rows = np.ndarray((surface.get_height(), surface.get_stride() // 4), dtype=np.uint32,
+                      buffer=surface.get_data())
+    return rows[:, :surface.get_width()]
+
+
+def surface_rgb(surface):
+    """Pillow RGB copy of an opaque surface (alpha dropped) - for encoders that take straight colour"""
+    from PIL import Image
+
+    rawmode = 'BGRX' if sys.byteorder == 'little' else 'XRGB'
+    size = (surface.get_width(), surface.get_height())
+    return Image.frombuffer('RGB', size, surface.get_data(), 'raw', rawmode, surface.get_stride(), 1)
+
+
+def grain_pixels(noise, cell, width, height):
+    """
+    Grain overlay pixels: white at each noise alpha (0-1), one value per cell x cell block
+
+    noise is shaped (rows, columns) of cells; the result is a (height, width)
+    uint32 ARGB32 array, matching Cairo's own rounding of a solid white fill.
+    """
+    # Cairo stores colour as 16 bits per channel and keeps the high byte
+    level = ((noise * (65536 - 1e-5)).astype(np.uint32) >> 8)
+    pixels = level * np.uint32(0x01010101)
+    return np.repeat(np.repeat(pixels, cell, axis=0), cell, axis=1)[:height, :width]
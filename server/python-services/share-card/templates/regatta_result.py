@@ -10,17 +10,12 @@ Placement badge styling:
 """
 
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect, draw_rounded_rect,
-    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes,
+    draw_diagonal_background,
     DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE
 )
+from templates.scene import Scene, render_scene, Group, Text, Panel, Shape, fitted_line, fitted_text
+from templates.models import RegattaResultData
 from datetime import datetime
-import cairocffi as cairo
-
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
 
 
 def format_date(iso_date):
@@ -56,27 +51,24 @@ def get_placement_suffix(placement):
         return 'th'
 
 
-def draw_placement_badge(ctx, placement, width, y):
-    """Draw centered placement badge with appropriate styling"""
+def placement_badge_node(placement, width, y):
+    """Centered placement badge text with appropriate styling"""
     placement_str = f"{placement}{get_placement_suffix(placement)}"
     color = get_placement_color(placement)
 
-    # Draw placement with appropriate size
+    # Placement with appropriate size
     if placement <= 3:
         # Podium placements - larger, bold
-        draw_text(ctx, placement_str, "IBM Plex Sans", 280,
-                  width / 2, y, color, weight='Bold', align='center')
-    else:
-        # 4th+ placements - smaller, muted
-        draw_text(ctx, placement_str, "IBM Plex Sans", 200,
-                  width / 2, y, TEXT_MUTED, weight='Bold', align='center')
+        return Text(placement_str, "IBM Plex Sans", 280,
+                    width / 2, y, color, weight='Bold', align='center', key='placement')
+    # 4th+ placements - smaller, muted
+    return Text(placement_str, "IBM Plex Sans", 200,
+                width / 2, y, TEXT_MUTED, weight='Bold', align='center', key='placement')
 
-    return y + 320
 
-
-def render_regatta_result(format_key, workout_data, options):
+def build_regatta_result_scene(format_key, workout_data, options):
     """
-    Render single regatta result card
+    Build single regatta result card scene
 
     Data expected:
     {
@@ -96,60 +88,58 @@ def render_regatta_result(format_key, workout_data, options):
     if options is None:
         options = {}
 
-    width, height = DIMENSIONS[format_key]
+    scene = Scene('regatta_result', format_key)
+    width, height = scene.width, scene.height
     is_story = format_key == '9:16'
 
-    surface, ctx = setup_canvas(width, height)
-
     # Background - dark with subtle gradient
-    gradient = cairo.LinearGradient(0, 0, width, height)
-    gradient.add_color_stop_rgb(0, 0.03, 0.03, 0.04)
-    gradient.add_color_stop_rgb(0.5, 0.08, 0.06, 0.08)
-    gradient.add_color_stop_rgb(1, 0.12, 0.08, 0.06)
-    ctx.set_source(gradient)
-    ctx.rectangle(0, 0, width, height)
-    ctx.fill()
+    scene.add(Group([
+        Shape(lambda ctx: draw_diagonal_background(ctx, width, height)),
+    ], static_key=('background',)))
+    scene.add_photo_background(options)
 
     # Extract data
-    regatta_name = workout_data.get('regatta_name', 'Regatta')
-    location = workout_data.get('location', '')
-    date = workout_data.get('date', '')
-    event_name = workout_data.get('event_name', '')
-    placement = workout_data.get('placement', 1)
-    total_entries = workout_data.get('total_entries', 0)
-    time = workout_data.get('time', '--:--')
-    margin_ahead = workout_data.get('margin_ahead')
-    margin_behind = workout_data.get('margin_behind')
-    crew_list = workout_data.get('crew_list', [])
-    event_type = workout_data.get('event_type', '')
+    workout = RegattaResultData.coerce(workout_data)
+    regatta_name = workout.regatta_name
+    location = workout.location
+    date = workout.date
+    event_name = workout.event_name
+    placement = workout.placement
+    total_entries = workout.total_entries
+    time = workout.time
+    margin_ahead = workout.margin_ahead
+    margin_behind = workout.margin_behind
+    crew_list = workout.crew_list
+    event_type = workout.event_type
 
     # ── Header Section ──
     y = 120
 
     # Regatta name
-    draw_text(ctx, regatta_name, "IBM Plex Sans", 52,
-              width / 2, y, TEXT_PRIMARY, weight='Bold', align='center')
+    scene.add(fitted_line(regatta_name, "IBM Plex Sans", width / 2, y, width - 240, 52, 36,
+                          TEXT_PRIMARY, weight='Bold', align='center', key='regatta_name'))
     y += 80
 
     # Location + Date
     location_date = f"{location} • {format_date(date)}"
-    draw_text(ctx, location_date, "IBM Plex Sans", 36,
-              width / 2, y, TEXT_SECONDARY, weight='Regular', align='center')
+    scene.add(fitted_line(location_date, "IBM Plex Sans", width / 2, y, width - 240, 36, 28,
+                          TEXT_SECONDARY, weight='Regular', align='center', key='location_date'))
     y += 100
 
     # Event name
-    draw_text(ctx, event_name, "IBM Plex Sans", 44,
-              width / 2, y, TEXT_MUTED, weight='SemiBold', align='center')
+    scene.add(fitted_line(event_name, "IBM Plex Sans", width / 2, y, width - 240, 44, 32,
+                          TEXT_MUTED, weight='SemiBold', align='center', key='event_name'))
     y += 120
 
     # ── Placement Badge ──
-    y = draw_placement_badge(ctx, placement, width, y)
+    scene.add(placement_badge_node(placement, width, y))
+    y += 320
 
     # Total entries context
     if total_entries > 0:
         entries_text = f"out of {total_entries} {'entries' if total_entries != 1 else 'entry'}"
-        draw_text(ctx, entries_text, "IBM Plex Sans", 36,
-                  width / 2, y, TEXT_MUTED, weight='Regular', align='center')
+        scene.add(Text(entries_text, "IBM Plex Sans", 36,
+                  width / 2, y, TEXT_MUTED, weight='Regular', align='center'))
         y += 100
 
     # ── Time Panel ──
@@ -157,17 +147,15 @@ def render_regatta_result(format_key, workout_data, options):
     panel_width = width - (panel_padding * 2)
     panel_height = 280
 
-    draw_rounded_rect(ctx, panel_padding, y, panel_width, panel_height, 24)
-    ctx.set_source_rgba(*SLATE, 0.4)
-    ctx.fill()
+    scene.add(Panel(panel_padding, y, panel_width, panel_height, 24, SLATE, alpha=0.4, key='time_panel'))
 
     # Time value
-    draw_text(ctx, time, "IBM Plex Mono", 120,
-              width / 2, y + 60, GOLD, weight='Bold', align='center')
+    scene.add(Text(time, "IBM Plex Mono", 120,
+              width / 2, y + 60, GOLD, weight='Bold', align='center'))
 
     # Time label
-    draw_text(ctx, "FINISH TIME", "IBM Plex Sans", 40,
-              width / 2, y + 200, TEXT_SECONDARY, weight='SemiBold', align='center')
+    scene.add(Text("FINISH TIME", "IBM Plex Sans", 40,
+              width / 2, y + 200, TEXT_SECONDARY, weight='SemiBold', align='center'))
 
     y += panel_height + 80
 
@@ -186,58 +174,44 @@ def render_regatta_result(format_key, workout_data, options):
             margin_color = TEXT_SECONDARY
 
         if margin_text:
-            draw_text(ctx, margin_text, "IBM Plex Sans", 48,
-                      width / 2, y, margin_color, weight='SemiBold', align='center')
+            scene.add(Text(margin_text, "IBM Plex Sans", 48,
+                      width / 2, y, margin_color, weight='SemiBold', align='center'))
             y += 120
 
     # ── Crew List (9:16 format only or if space allows) ──
     if crew_list and (is_story or y < height - 600):
         y += 60
-        draw_text(ctx, "CREW", "IBM Plex Sans", 40,
-                  width / 2, y, TEXT_MUTED, weight='Bold', align='center')
+        scene.add(Text("CREW", "IBM Plex Sans", 40,
+                  width / 2, y, TEXT_MUTED, weight='Bold', align='center'))
         y += 70
 
-        # Draw crew members in compact format
+        # Draw crew members in compact format, wrapped on measured widths (max 6 lines)
         crew_text = " • ".join(crew_list)
-
-        # Wrap text if needed (approximate character limit)
-        max_chars_per_line = 60 if is_story else 50
-        words = crew_text.split()
-        lines = []
-        current_line = []
-        current_length = 0
-
-        for word in words:
-            if current_length + len(word) + 1 <= max_chars_per_line:
-                current_line.append(word)
-                current_length += len(word) + 1
-            else:
-                if current_line:
-                    lines.append(" ".join(current_line))
-                current_line = [word]
-                current_length = len(word)
-
-        if current_line:
-            lines.append(" ".join(current_line))
-
-        for line in lines[:6]:  # Max 6 lines
-            draw_text(ctx, line, "IBM Plex Sans", 32,
-                      width / 2, y, TEXT_SECONDARY, weight='Regular', align='center')
-            y += 50
+        crew_lines, crew_fit = fitted_text(crew_text, "IBM Plex Sans", width / 2, y, width - 320, 32, 28,
+                                           TEXT_SECONDARY, weight='Regular', align='center',
+                                           max_lines=6, line_height=50 / 32, key='crew')
+        scene.add(crew_lines)
+        y += crew_fit.height
 
     # ── Event Type Badge (bottom) ──
     if event_type:
         badge_y = height - 280
-        draw_text(ctx, event_type.upper(), "IBM Plex Sans", 32,
-                  width / 2, badge_y, TEXT_MUTED, weight='SemiBold', align='center')
+        scene.add(Text(event_type.upper(), "IBM Plex Sans", 32,
+                  width / 2, badge_y, TEXT_MUTED, weight='SemiBold', align='center'))
 
     # Add grain texture
-    draw_grain_texture(ctx, width, height, opacity=0.03)
+    scene.add_grain(opacity=0.03)
 
     # Branding
-    draw_oarbit_branding(ctx, width, height, format_key, options)
+    scene.add_branding(options)
+    scene.add_share_qr(options)
+
+    return scene
 
-    return surface_to_png_bytes(surface)
+
+def render_regatta_result(format_key, workout_data, options):
+    """Render single regatta result card. Returns: PNG bytes"""
+    return render_scene(build_regatta_result_scene(format_key, workout_data, options), options)
 
 
 # Sample data for testing
@@ -9,17 +9,12 @@ Displays:
 """
 
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect, draw_rounded_rect,
-    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes,
+    draw_diagonal_background,
     DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE
 )
+from templates.scene import Scene, render_scene, Group, Text, Rect, Panel, Shape, Table, Column, Cell, fitted_line, fitted_cell
+from templates.models import RegattaSummaryData
 from datetime import datetime
-import cairocffi as cairo
-
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
 
 
 def format_date(iso_date):
@@ -55,44 +50,65 @@ def get_placement_suffix(placement):
         return 'th'
 
 
-def draw_result_row(ctx, race, y, width, row_height, is_alt_row):
-    """Draw a single result row with alternating background"""
+# Fixed y positions of the separator and column headers (below the two header lines)
+SEPARATOR_Y = 140 + 100 + 120
+COLUMN_HEADER_Y = SEPARATOR_Y + 80
+
+
+def column_header_nodes(width):
+    """Static nodes: decorative separator and results column headers"""
+    separator_width = 600
+    y = COLUMN_HEADER_Y
+    return [
+        Rect((width - separator_width) / 2, SEPARATOR_Y, separator_width, 3, COPPER, alpha=0.5),
+        Text("EVENT", "IBM Plex Sans", 32,
+             140, y, TEXT_MUTED, weight='Bold', align='left'),
+        Text("PLACE", "IBM Plex Sans", 32,
+             width * 0.55, y, TEXT_MUTED, weight='Bold', align='left'),
+        Text("TIME", "IBM Plex Sans", 32,
+             width * 0.70, y, TEXT_MUTED, weight='Bold', align='left'),
+        Text("MARGIN", "IBM Plex Sans", 32,
+             width - 140, y, TEXT_MUTED, weight='Bold', align='right'),
+    ]
+
+
+def result_columns(width):
+    """Table columns for result rows: event, placement, time, margin"""
+    return [
+        Column(140, 'left', "IBM Plex Sans", 38, TEXT_PRIMARY, 'SemiBold'),
+        Column(width * 0.55, 'left', "IBM Plex Mono", 42, TEXT_PRIMARY, 'Bold'),
+        Column(width * 0.70, 'left', "IBM Plex Mono", 38, TEXT_SECONDARY, 'Regular'),
+        Column(width - 140, 'right', "IBM Plex Sans", 32, TEXT_MUTED, 'Regular'),
+    ]
+
+
+def add_result_row(table, race, y, width, row_height, is_alt_row):
+    """Add a single result row with alternating background"""
     # Alternating row background
     if is_alt_row:
-        ctx.set_source_rgba(*SLATE, 0.2)
-        ctx.rectangle(80, y - 10, width - 160, row_height)
-        ctx.fill()
-
-    event_name = race.get('event_name', '')
-    placement = race.get('placement', 0)
-    time = race.get('time', '')
-    margin = race.get('margin', '')
+        table.add(Rect(80, y - 10, width - 160, row_height, SLATE, alpha=0.2))
 
-    # Event name (left)
-    draw_text(ctx, event_name, "IBM Plex Sans", 38,
-              140, y, TEXT_PRIMARY, weight='SemiBold', align='left')
+    event_name = race.event_name
+    placement = race.placement
+    time = race.time
+    margin = race.margin
 
-    # Placement (center-left with color)
+    # Event name (left, shrunk to stop short of the placement column),
+    # placement (center-left with color), time (center-right), margin (right)
     placement_str = f"{placement}{get_placement_suffix(placement)}"
-    placement_color = get_placement_color(placement)
-    draw_text(ctx, placement_str, "IBM Plex Mono", 42,
-              width * 0.55, y, placement_color, weight='Bold', align='left')
-
-    # Time (center-right)
-    draw_text(ctx, time, "IBM Plex Mono", 38,
-              width * 0.70, y, TEXT_SECONDARY, weight='Regular', align='left')
-
-    # Margin (right)
-    if margin:
-        draw_text(ctx, margin, "IBM Plex Sans", 32,
-                  width - 140, y, TEXT_MUTED, weight='Regular', align='right')
+    table.add_row(y, [
+        fitted_cell(event_name, "IBM Plex Sans", width * 0.55 - 180, 38, 28, 'SemiBold'),
+        Cell(placement_str, color=get_placement_color(placement)),
+        time,
+        margin or None,
+    ])
 
     return y + row_height
 
 
-def render_regatta_summary(format_key, workout_data, options):
+def build_regatta_summary_scene(format_key, workout_data, options):
     """
-    Render regatta summary card with all race results
+    Build regatta summary card scene with all race results
 
     Data expected:
     {
@@ -113,58 +129,40 @@ def render_regatta_summary(format_key, workout_data, options):
     if options is None:
         options = {}
 
-    width, height = DIMENSIONS[format_key]
+    scene = Scene('regatta_summary', format_key)
+    width, height = scene.width, scene.height
     is_story = format_key == '9:16'
 
-    surface, ctx = setup_canvas(width, height)
-
     # Background - dark with subtle gradient
-    gradient = cairo.LinearGradient(0, 0, width, height)
-    gradient.add_color_stop_rgb(0, 0.03, 0.03, 0.04)
-    gradient.add_color_stop_rgb(0.5, 0.08, 0.06, 0.08)
-    gradient.add_color_stop_rgb(1, 0.12, 0.08, 0.06)
-    ctx.set_source(gradient)
-    ctx.rectangle(0, 0, width, height)
-    ctx.fill()
+    scene.add(Group([
+        Shape(lambda ctx: draw_diagonal_background(ctx, width, height)),
+    ], static_key=('background',)))
+    scene.add_photo_background(options)
 
     # Extract data
-    regatta_name = workout_data.get('regatta_name', 'Regatta')
-    location = workout_data.get('location', '')
-    date = workout_data.get('date', '')
-    races = workout_data.get('races', [])
+    workout = RegattaSummaryData.coerce(workout_data)
+    regatta_name = workout.regatta_name
+    location = workout.location
+    date = workout.date
+    races = workout.races
 
     # ── Header Section (Editorial style) ──
     y = 140
 
     # Regatta name - large, editorial
-    draw_text(ctx, regatta_name, "IBM Plex Sans", 72,
-              width / 2, y, TEXT_PRIMARY, weight='Bold', align='center')
+    scene.add(fitted_line(regatta_name, "IBM Plex Sans", width / 2, y, width - 240, 72, 44,
+                          TEXT_PRIMARY, weight='Bold', align='center', key='regatta_name'))
     y += 100
 
     # Location + Date
     location_date = f"{location} • {format_date(date)}"
-    draw_text(ctx, location_date, "IBM Plex Sans", 40,
-              width / 2, y, TEXT_SECONDARY, weight='Regular', align='center')
+    scene.add(fitted_line(location_date, "IBM Plex Sans", width / 2, y, width - 240, 40, 30,
+                          TEXT_SECONDARY, weight='Regular', align='center', key='location_date'))
     y += 120
 
-    # Decorative separator
-    separator_width = 600
-    ctx.set_source_rgba(*COPPER, 0.5)
-    ctx.rectangle((width - separator_width) / 2, y, separator_width, 3)
-    ctx.fill()
-    y += 80
-
-    # ── Results Section ──
-    # Column headers
-    draw_text(ctx, "EVENT", "IBM Plex Sans", 32,
-              140, y, TEXT_MUTED, weight='Bold', align='left')
-    draw_text(ctx, "PLACE", "IBM Plex Sans", 32,
-              width * 0.55, y, TEXT_MUTED, weight='Bold', align='left')
-    draw_text(ctx, "TIME", "IBM Plex Sans", 32,
-              width * 0.70, y, TEXT_MUTED, weight='Bold', align='left')
-    draw_text(ctx, "MARGIN", "IBM Plex Sans", 32,
-              width - 140, y, TEXT_MUTED, weight='Bold', align='right')
-    y += 60
+    # Decorative separator + column headers
+    scene.add(Group(column_header_nodes(width), static_key=('column_headers',)))
+    y = COLUMN_HEADER_Y + 60
 
     # Determine how many rows fit
     row_height = 90
@@ -180,17 +178,18 @@ def render_regatta_summary(format_key, workout_data, options):
         show_races = races[:max_rows]
         truncated = len(races) > max_rows
 
-    # Draw result rows
+    # Result rows
+    rows = scene.add(Table(result_columns(width), key='results'))
     for i, race in enumerate(show_races):
         is_alt_row = i % 2 == 1
-        y = draw_result_row(ctx, race, y, width, row_height, is_alt_row)
+        y = add_result_row(rows, race, y, width, row_height, is_alt_row)
 
     # Truncation indicator
     if truncated:
         remaining = len(races) - len(show_races)
-        draw_text(ctx, f"+ {remaining} more {'events' if remaining != 1 else 'event'}",
+        scene.add(Text(f"+ {remaining} more {'events' if remaining != 1 else 'event'}",
                   "IBM Plex Sans", 36,
-                  width / 2, y + 20, TEXT_MUTED, weight='Regular', align='center')
+                  width / 2, y + 20, TEXT_MUTED, weight='Regular', align='center'))
         y += 80
 
     # ── Summary Stats ──
@@ -199,53 +198,57 @@ def render_regatta_summary(format_key, workout_data, options):
     # Calculate stats
     total_events = len(races)
     medals = {
-        'gold': sum(1 for r in races if r.get('placement') == 1),
-        'silver': sum(1 for r in races if r.get('placement') == 2),
-        'bronze': sum(1 for r in races if r.get('placement') == 3),
+        'gold': sum(1 for r in races if r.placement == 1),
+        'silver': sum(1 for r in races if r.placement == 2),
+        'bronze': sum(1 for r in races if r.placement == 3),
     }
-    best_placement = min((r.get('placement', 999) for r in races), default=0)
+    best_placement = min((r.placement or 999 for r in races), default=0)
 
     # Stats panel
     panel_padding = 140
     panel_width = width - (panel_padding * 2)
     panel_height = 280
 
-    draw_rounded_rect(ctx, panel_padding, y, panel_width, panel_height, 24)
-    ctx.set_source_rgba(*SLATE, 0.3)
-    ctx.fill()
+    scene.add(Panel(panel_padding, y, panel_width, panel_height, 24, SLATE, alpha=0.3, key='stats_panel'))
 
     # Stats in 3-column grid
     stat_y = y + 60
 
     # Total events
-    draw_text(ctx, str(total_events), "IBM Plex Mono", 72,
-              width * 0.25, stat_y, GOLD, weight='Bold', align='center')
-    draw_text(ctx, "EVENTS", "IBM Plex Sans", 32,
-              width * 0.25, stat_y + 90, TEXT_MUTED, weight='SemiBold', align='center')
+    scene.add(Text(str(total_events), "IBM Plex Mono", 72,
+              width * 0.25, stat_y, GOLD, weight='Bold', align='center'))
+    scene.add(Text("EVENTS", "IBM Plex Sans", 32,
+              width * 0.25, stat_y + 90, TEXT_MUTED, weight='SemiBold', align='center'))
 
     # Medals (show count for each)
     medals_str = f"{medals['gold']}🥇 {medals['silver']}🥈 {medals['bronze']}🥉"
-    draw_text(ctx, medals_str, "IBM Plex Sans", 48,
-              width * 0.50, stat_y + 20, TEXT_PRIMARY, weight='Bold', align='center')
-    draw_text(ctx, "MEDALS", "IBM Plex Sans", 32,
-              width * 0.50, stat_y + 90, TEXT_MUTED, weight='SemiBold', align='center')
+    scene.add(Text(medals_str, "IBM Plex Sans", 48,
+              width * 0.50, stat_y + 20, TEXT_PRIMARY, weight='Bold', align='center'))
+    scene.add(Text("MEDALS", "IBM Plex Sans", 32,
+              width * 0.50, stat_y + 90, TEXT_MUTED, weight='SemiBold', align='center'))
 
     # Best result
     if best_placement > 0:
         best_str = f"{best_placement}{get_placement_suffix(best_placement)}"
         best_color = get_placement_color(best_placement)
-        draw_text(ctx, best_str, "IBM Plex Mono", 72,
-                  width * 0.75, stat_y, best_color, weight='Bold', align='center')
-        draw_text(ctx, "BEST", "IBM Plex Sans", 32,
-                  width * 0.75, stat_y + 90, TEXT_MUTED, weight='SemiBold', align='center')
+        scene.add(Text(best_str, "IBM Plex Mono", 72,
+                  width * 0.75, stat_y, best_color, weight='Bold', align='center'))
+        scene.add(Text("BEST", "IBM Plex Sans", 32,
+                  width * 0.75, stat_y + 90, TEXT_MUTED, weight='SemiBold', align='center'))
 
     # Add grain texture
-    draw_grain_texture(ctx, width, height, opacity=0.03)
+    scene.add_grain(opacity=0.03)
 
     # Branding
-    draw_oarbit_branding(ctx, width, height, format_key, options)
+    scene.add_branding(options)
+    scene.add_share_qr(options)
 
-    return surface_to_png_bytes(surface)
+    return scene
+
+
+def render_regatta_summary(format_key, workout_data, options):
+    """Render regatta summary card. Returns: PNG bytes"""
+    return render_scene(build_regatta_summary_scene(format_key, workout_data, options), options)
 
 
 # Sample data for testing
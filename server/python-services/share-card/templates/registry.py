@@ -0,0 +1,123 @@
+"""
+Template registry - card types resolved to renderers on first use
+Each card type is listed in TEMPLATE_MANIFEST by module and function name, and
+its module is only imported the first time that card type is requested, so a
+worker pays import time and memory only for the templates it actually serves.
+Adding a card type means adding a manifest entry; app.py needs no edits.
+
+app.py imports nothing else that loads Cairo-heavy modules (scene,
+base_template, photo, glyph_atlas), so they arrive with the first template.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+# cardType -> (module, renderer function, scene builder function)
+TEMPLATE_MANIFEST = {
+    'test': ('templates.base_template', 'render_test_card', 'build_test_card_scene'),
+    'erg_summary': ('templates.erg_summary', 'render_erg_summary', 'build_erg_summary_scene'),  # Design A - Evolved v5
+    'erg_summary_alt': ('templates.erg_summary_alt', 'render_erg_summary_alt', 'build_erg_summary_alt_scene'),  # Design B - Fresh Direction
+    'regatta_result': ('templates.regatta_result', 'render_regatta_result', 'build_regatta_result_scene'),  # Single race result
+    'regatta_summary': ('templates.regatta_summary', 'render_regatta_summary', 'build_regatta_summary_scene'),  # Full regatta summary
+    'season_recap': ('templates.season_recap', 'render_season_recap', 'build_season_recap_scene'),  # Spotify Wrapped style year-in-review
+    'team_leaderboard': ('templates.team_leaderboard', 'render_team_leaderboard', 'build_team_leaderboard_scene'),  # Team rankings snapshot
+}
+
+# Output formats -> MIME type. svg and pdf draw onto Cairo's vector surfaces:
+# text and shapes stay vectors, only photos and logos are embedded as images.
+OUTPUT_MIMETYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'pdf': 'application/pdf',
+}
+
+# /health cache counters: name -> (module, stats function), reported once the module is loaded
+CACHE_STATS = {
+    'brandingImages': ('templates.base_template', 'branding_image_stats'),
+    'photoBackgrounds': ('templates.photo', 'photo_cache_stats'),
+}
+
+_lock = threading.Lock()
+# cardType -> imported module
+_modules = {}
+# cardType -> seconds spent importing its module (modules already imported
+# elsewhere, like base_template, cost ~0)
+_import_seconds = {}
+
+
+def load_template(card_type):
+    """Import card_type's module (once) and return it. Raises KeyError for unknown card types."""
+    module = _modules.get(card_type)
+    if module is None:
+        module_name = TEMPLATE_MANIFEST[card_type][0]
+        with _lock:
+            module = _modules.get(card_type)
+            if module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(module_name)
+                _import_seconds[card_type] = time.perf_counter() - start
+                _modules[card_type] = module
+                logger.info("Loaded template %s (%s) in %.1fms",
+                            card_type, module_name, _import_seconds[card_type] * 1000)
+    return module
+
+
+def preload_templates(card_types=None):
+    """
+    Import every template up front (or just card_types) and build the glyph
+    atlases - opt-in worker warm-up; otherwise both happen on first use
+    """
+    for card_type in card_types or TEMPLATE_MANIFEST:
+        load_template(card_type)
+    from templates.glyph_atlas import warm_glyph_atlas
+    warm_glyph_atlas(card_types)
+
+
+def template_import_times():
+    """{cardType: import time in ms} for the templates loaded so far"""
+    return {card_type: round(seconds * 1000, 1) for card_type, seconds in _import_seconds.items()}
+
+
+def cache_stats():
+    """{name: counters} for the CACHE_STATS modules loaded so far (imports nothing)"""
+    return {
+        name: getattr(sys.modules[module], function)()
+        for name, (module, function) in CACHE_STATS.items()
+        if module in sys.modules
+    }
+
+
+class TemplateFunctions(Mapping):
+    """
+    Read-only cardType -> function mapping that imports templates lazily
+
+    Listing card types (keys, len, in) never imports anything; looking one
+    up imports its module on first access.
+    """
+
+    def __init__(self, slot):
+        self._slot = slot   # index into the manifest entry: 1 renderer, 2 scene builder
+
+    def __getitem__(self, card_type):
+        return getattr(load_template(card_type), TEMPLATE_MANIFEST[card_type][self._slot])
+
+    def __contains__(self, card_type):
+        return card_type in TEMPLATE_MANIFEST
+
+    def __iter__(self):
+        return iter(TEMPLATE_MANIFEST)
+
+    def __len__(self):
+        return len(TEMPLATE_MANIFEST)
+
+
+# Renderers: (format_key, workout model, options) -> PNG bytes
+CARD_RENDERERS = TemplateFunctions(1)
+# Scene builders for layout dry-runs: (format_key, workout model, options) -> Scene
+CARD_SCENE_BUILDERS = TemplateFunctions(2)
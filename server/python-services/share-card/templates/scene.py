@@ -0,0 +1,1182 @@
+"""
+Scene graph for share card templates
+Templates describe a card as a tree of nodes instead of issuing draw calls directly.
+The engine then:
+- measures every text node in one batched pass against a shared layout cache
+- composites numbers and symbols from pre-rendered glyph atlases instead of
+  shaping them (see glyph_atlas)
+- resolves alignment into absolute bounding boxes for every node
+- replays static subtrees from cached display lists (see draw_static_layer)
+- renders the remaining nodes in tree order, culling anything outside the clip
+- for cards rendered with a cardKey, repaints only the regions whose nodes
+  changed since the previous render of the same card
+
+Because every node has a bounding box, caching, culling and measuring work the
+same way for every card type.
+"""
+
+import binascii
+import logging
+import math
+import threading
+from collections import Counter, OrderedDict
+from io import BytesIO
+
+import cairocffi as cairo
+import pangocairocffi as pango
+from pangocffi import AttrList, Attribute, TabAlign, TabArray
+
+from templates.base_template import (
+    setup_canvas, create_text_layout, create_font_description, layout_pixel_size, fit_text,
+    draw_rounded_rect, draw_gradient_rect, draw_static_layer, has_static_layer,
+    create_grain_surface, draw_grain_surface, draw_grain_tile, is_vector_target, branding_position,
+    surface_to_png_bytes, load_branding_image, qr_code_rects, draw_qr_code, GRAIN_TILE_SIZE, PANGO_SCALE, TEXT_PRIMARY, TEXT_MUTED, DARK_BG
+)
+from templates.glyph_atlas import GlyphRun, glyph_run
+from templates.fonts import use_bundled_fonts
+from templates.photo import photo_background
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = {
+    '1:1': (2160, 2160),
+    '9:16': (2160, 3840),
+}
+
+# Last rendered surface per card - (scene name, format, cardKey) -> (surface, Scene), LRU bounded.
+# Each entry holds a full-size ARGB surface (18-33MB), so keep this small.
+_render_cache = OrderedDict()
+_render_cache_lock = threading.Lock()
+RENDER_CACHE_SIZE = 8
+
+# Share-page QR panel: side length per format, inset from the bottom-right corner
+SHARE_QR_SIZE = {'1:1': 220, '9:16': 260}
+SHARE_QR_MARGIN = 60
+# Light quiet zone around the code, in modules (the QR spec asks for 4)
+SHARE_QR_QUIET_ZONE = 4
+
+# Team logo and avatar: inset from the bottom-left corner, and the space between them
+BRANDING_IMAGE_MARGIN = 60
+BRANDING_IMAGE_GAP = 24
+
+# Live previews for the card editor: canvas width in pixels and PNG zlib level
+PREVIEW_WIDTH = 540
+PREVIEW_COMPRESS_LEVEL = 1
+
+# Fall back to a full render once the dirty rects cover more than this share of the canvas
+MAX_DIRTY_FRACTION = 0.5
+# Dirty rects are grown by this much to cover antialiasing and glyph overhang
+DIRTY_PADDING = 8
+
+
+# ─────────────────────────────────────────────
+# Text Measurement
+# ─────────────────────────────────────────────
+
+class TextMeasurer:
+    """
+    Measures text against a 1x1 scratch surface and keeps the shaped layouts
+
+    Layouts are cached by (text, family, size, weight), so strings repeated across
+    requests (labels, headers, common values) are shaped once per worker thread.
+    The cached layout is re-targeted at render time with pango.update_layout.
+    Text made only of glyph atlas characters gets a GlyphRun instead of a layout.
+    """
+
+    def __init__(self, max_entries=4096):
+        use_bundled_fonts()
+        self._surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 1, 1)
+        self._ctx = cairo.Context(self._surface)
+        self._layouts = OrderedDict()
+        self._runs = OrderedDict()
+        self.max_entries = max_entries
+
+    def create_layout(self):
+        """Empty layout on the scratch context - re-target with pango.update_layout"""
+        return pango.create_layout(self._ctx)
+
+    def measure(self, text, family, size, weight):
+        """Return (layout or GlyphRun, (width, height)) for one run of text"""
+        key = (text, family, size, weight)
+        entry = self._layouts.get(key)
+        if entry is None:
+            run = glyph_run(text, family, size, weight)
+            if run is not None:
+                entry = (run, (run.width, run.height))
+            else:
+                layout = create_text_layout(self._ctx, text, family, size, weight)
+                entry = (layout, layout_pixel_size(layout))
+            self._layouts[key] = entry
+            if len(self._layouts) > self.max_entries:
+                self._layouts.popitem(last=False)
+        else:
+            self._layouts.move_to_end(key)
+        return entry
+
+    def measure_batch(self, text_nodes):
+        """Measure many Text nodes at once, shaping each distinct string only once"""
+        for node in text_nodes:
+            layout, (w, h) = self.measure(node.text, node.family, node.size, node.weight)
+            node.apply_metrics(layout, w, h)
+
+    def measure_runs(self, runs):
+        """
+        Measure many (text, family, size, weight) runs in one shaping pass
+
+        Uncached runs become the lines of a single layout, each styled with a
+        font attribute run, so a whole table column is shaped at once. Runs
+        the glyph atlas covers take their metrics from the atlas instead.
+
+        Returns: [(width, ascent, height)] in pixels, one per run
+        """
+        missing = []
+        for run in dict.fromkeys(runs):
+            if run in self._runs:
+                continue
+            glyphs = glyph_run(*run)
+            if glyphs is not None:
+                self._runs[run] = (glyphs.width, glyphs.ascent, glyphs.height)
+            else:
+                missing.append(run)
+        if missing:
+            layout = self.create_layout()
+            layout.text = '\n'.join(text for text, _, _, _ in missing)
+            attrs = AttrList()
+            start = 0
+            for text, family, size, weight in missing:
+                # Include the line's newline so it takes the run's font too
+                end = start + len(text.encode('utf-8')) + 1
+                attrs.insert(Attribute.from_font_desc(create_font_description(family, size, weight), start, end))
+                start = end
+            layout.attributes = attrs
+
+            line = layout.get_iter()
+            for run in missing:
+                _, logical = line.get_line_extents()
+                top, bottom = line.get_line_yrange()
+                self._runs[run] = (
+                    logical.width / PANGO_SCALE,
+                    (line.get_baseline() - top) / PANGO_SCALE,
+                    (bottom - top) / PANGO_SCALE,
+                )
+                line.next_line()
+        while len(self._runs) > self.max_entries:
+            self._runs.popitem(last=False)
+        for run in runs:
+            self._runs.move_to_end(run)
+        return [self._runs[run] for run in runs]
+
+
+# Pango layouts are not thread-safe - one measurer per thread
+_local = threading.local()
+
+
+def get_measurer():
+    """Return this thread's TextMeasurer"""
+    measurer = getattr(_local, 'measurer', None)
+    if measurer is None:
+        measurer = _local.measurer = TextMeasurer()
+    return measurer
+
+
+# ─────────────────────────────────────────────
+# Nodes
+# ─────────────────────────────────────────────
+
+class Node:
+    """
+    Base scene node
+
+    Every node ends up with a bbox (x, y, w, h) after Scene.resolve(); leaves
+    draw themselves, groups are walked by the scene.
+    """
+    __slots__ = ('key', 'bbox')
+
+    def __init__(self, key=None):
+        self.key = key
+        self.bbox = None
+
+    def resolve(self, scene):
+        """Compute self.bbox once text has been measured"""
+
+    def signature(self):
+        """
+        Hashable description of everything that affects this node's pixels
+
+        Two nodes with equal signatures draw identical pixels, which is what
+        incremental re-rendering relies on. The default is unique per node,
+        so unknown nodes are always repainted.
+        """
+        return (type(self).__name__, id(self))
+
+    def draw(self, ctx):
+        raise NotImplementedError
+
+
+def _set_source(ctx, color, alpha):
+    if alpha is None:
+        ctx.set_source_rgb(*color)
+    else:
+        ctx.set_source_rgba(*color, alpha)
+
+
+def _show(ctx, layout, x, y):
+    """Draw a measured layout or GlyphRun with its top-left at (x, y) in the current source"""
+    if isinstance(layout, GlyphRun):
+        layout.draw(ctx, x, y)
+        return
+    ctx.move_to(x, y)
+    pango.update_layout(ctx, layout)
+    pango.show_layout(ctx, layout)
+
+
+class Text(Node):
+    """Single run of text anchored at (x, y) - top-left, top-center or top-right per align"""
+    __slots__ = ('text', 'family', 'size', 'x', 'y', 'color', 'weight', 'align', 'alpha',
+                 'layout', 'width', 'height', 'overflow')
+
+    def __init__(self, text, family, size, x, y, color=TEXT_PRIMARY, weight='Regular',
+                 align='left', alpha=None, key=None):
+        super().__init__(key)
+        self.text = text
+        self.family = family
+        self.size = size
+        self.x = x
+        self.y = y
+        self.color = color
+        self.weight = weight
+        self.align = align
+        self.alpha = alpha
+        self.layout = None
+        self.width = None
+        self.height = None
+        self.overflow = False   # set when auto-fit had to ellipsize
+
+    def apply_metrics(self, layout, width, height):
+        self.layout = layout
+        self.width = width
+        self.height = height
+
+    def resolve(self, scene):
+        if self.width is None:
+            layout, (w, h) = get_measurer().measure(self.text, self.family, self.size, self.weight)
+            self.apply_metrics(layout, w, h)
+        left = self.x
+        if self.align == 'center':
+            left = self.x - self.width / 2
+        elif self.align == 'right':
+            left = self.x - self.width
+        self.bbox = (left, self.y, self.width, self.height)
+
+    def signature(self):
+        return ('text', self.text, self.family, self.size, self.weight, self.color, self.alpha, self.bbox)
+
+    def draw(self, ctx):
+        _set_source(ctx, self.color, self.alpha)
+        _show(ctx, self.layout, self.bbox[0], self.y)
+
+
+def fitted_line(text, family, x, y, max_width, max_size, min_size=None, color=TEXT_PRIMARY,
+                weight='Regular', align='left', key=None):
+    """Single-line Text shrunk (then ellipsized) to fit max_width - see base_template.fit_text"""
+    fit = fit_text(text, family, max_width, max_size, min_size, weight)
+    node = Text(fit.lines[0], family, fit.size, x, y, color, weight=weight, align=align, key=key)
+    node.overflow = fit.overflow
+    return node
+
+
+def fitted_text(text, family, x, y, max_width, max_size, min_size=None, color=TEXT_PRIMARY,
+                weight='Regular', align='left', max_lines=1, max_height=None, line_height=None, key=None):
+    """
+    Text auto-fitted to a box (see base_template.fit_text), one Text node per line
+
+    Returns: (Group of Text lines, FittedText)
+    """
+    fit = fit_text(text, family, max_width, max_size, min_size, weight,
+                   max_lines=max_lines, max_height=max_height, line_height=line_height)
+    step = fit.height / len(fit.lines)
+    group = Group(key=key)
+    for i, line in enumerate(fit.lines):
+        node = group.add(Text(line, family, fit.size, x, y + i * step, color, weight=weight, align=align))
+        node.overflow = fit.overflow
+    return group, fit
+
+
+class TextUnderline(Node):
+    """Rule under a measured Text node, padded on both sides"""
+    __slots__ = ('text_node', 'padding', 'gap', 'thickness', 'color', 'alpha')
+
+    def __init__(self, text_node, color, alpha=None, padding=40, gap=20, thickness=3, key=None):
+        super().__init__(key)
+        self.text_node = text_node
+        self.padding = padding
+        self.gap = gap
+        self.thickness = thickness
+        self.color = color
+        self.alpha = alpha
+
+    def resolve(self, scene):
+        tx, ty, tw, th = self.text_node.bbox
+        self.bbox = (tx - self.padding / 2, ty + th + self.gap, tw + self.padding, self.thickness)
+
+    def signature(self):
+        return ('underline', self.color, self.alpha, self.bbox)
+
+    def draw(self, ctx):
+        _set_source(ctx, self.color, self.alpha)
+        ctx.rectangle(*self.bbox)
+        ctx.fill()
+
+
+class Rect(Node):
+    """Solid rectangle"""
+    __slots__ = ('x', 'y', 'w', 'h', 'color', 'alpha')
+
+    def __init__(self, x, y, w, h, color, alpha=None, key=None):
+        super().__init__(key)
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.color = color
+        self.alpha = alpha
+
+    def resolve(self, scene):
+        self.bbox = (self.x, self.y, self.w, self.h)
+
+    def signature(self):
+        return ('rect', self.color, self.alpha, self.bbox)
+
+    def draw(self, ctx):
+        _set_source(ctx, self.color, self.alpha)
+        ctx.rectangle(self.x, self.y, self.w, self.h)
+        ctx.fill()
+
+
+class Panel(Node):
+    """Rounded-rect panel with optional border"""
+    __slots__ = ('x', 'y', 'w', 'h', 'radius', 'color', 'alpha', 'border_color', 'border_width')
+
+    def __init__(self, x, y, w, h, radius, color, alpha=None, border_color=None, border_width=2, key=None):
+        super().__init__(key)
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.radius = radius
+        self.color = color
+        self.alpha = alpha
+        self.border_color = border_color
+        self.border_width = border_width
+
+    def resolve(self, scene):
+        pad = self.border_width / 2 if self.border_color else 0
+        self.bbox = (self.x - pad, self.y - pad, self.w + 2 * pad, self.h + 2 * pad)
+
+    def signature(self):
+        return ('panel', self.x, self.y, self.w, self.h, self.radius, self.color, self.alpha,
+                self.border_color, self.border_width)
+
+    def draw(self, ctx):
+        draw_rounded_rect(ctx, self.x, self.y, self.w, self.h, self.radius)
+        _set_source(ctx, self.color, self.alpha)
+        if self.border_color:
+            ctx.fill_preserve()
+            ctx.set_source_rgb(*self.border_color)
+            ctx.set_line_width(self.border_width)
+            ctx.stroke()
+        else:
+            ctx.fill()
+
+
+class Gradient(Node):
+    """Rectangle filled with a two-stop linear gradient"""
+    __slots__ = ('x', 'y', 'w', 'h', 'color_start', 'color_end', 'direction')
+
+    def __init__(self, x, y, w, h, color_start, color_end, direction='vertical', key=None):
+        super().__init__(key)
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.color_start = color_start
+        self.color_end = color_end
+        self.direction = direction
+
+    def resolve(self, scene):
+        self.bbox = (self.x, self.y, self.w, self.h)
+
+    def signature(self):
+        return ('gradient', self.bbox, self.color_start, self.color_end, self.direction)
+
+    def draw(self, ctx):
+        draw_gradient_rect(ctx, self.x, self.y, self.w, self.h,
+                           self.color_start, self.color_end, direction=self.direction)
+
+
+class Shape(Node):
+    """
+    Free-form vector drawing (waves, chamfers, radial glows, dots)
+
+    draw_fn receives the Cairo context. bbox defaults to the full canvas.
+    signature should capture every input draw_fn closes over; without one
+    the shape is treated as changed on every render.
+    """
+    __slots__ = ('draw_fn', 'extents', 'params')
+
+    def __init__(self, draw_fn, bbox=None, signature=None, key=None):
+        super().__init__(key)
+        self.draw_fn = draw_fn
+        self.extents = bbox
+        self.params = signature
+
+    def resolve(self, scene):
+        self.bbox = self.extents or (0, 0, scene.width, scene.height)
+
+    def signature(self):
+        if self.params is None:
+            return super().signature()
+        return ('shape', self.params, self.bbox)
+
+    def draw(self, ctx):
+        self.draw_fn(ctx)
+
+
+class Image(Node):
+    """Cairo image surface scaled into a box"""
+    __slots__ = ('surface', 'x', 'y', 'w', 'h', 'filter')
+
+    def __init__(self, surface, x, y, w=None, h=None, filter=cairo.FILTER_GOOD, key=None):
+        super().__init__(key)
+        self.surface = surface
+        self.x, self.y = x, y
+        self.w = w if w is not None else surface.get_width()
+        self.h = h if h is not None else surface.get_height()
+        self.filter = filter
+
+    def resolve(self, scene):
+        self.bbox = (self.x, self.y, self.w, self.h)
+
+    def signature(self):
+        # The scene holding the previous render keeps its surfaces alive, so ids stay unique
+        return ('image', id(self.surface), self.bbox, self.filter)
+
+    def draw(self, ctx):
+        sw, sh = self.surface.get_width(), self.surface.get_height()
+        ctx.save()
+        ctx.translate(self.x, self.y)
+        ctx.scale(self.w / sw, self.h / sh)
+        pattern = cairo.SurfacePattern(self.surface)
+        pattern.set_filter(self.filter)
+        ctx.set_source(pattern)
+        ctx.rectangle(0, 0, sw, sh)
+        ctx.fill()
+        ctx.restore()
+
+
+class Grain(Node):
+    """
+    Full-canvas grain overlay
+
+    The noise surface is generated on first draw and kept on the node, so an
+    incremental re-render can repaint grain inside dirty regions with exactly
+    the noise of the cached image. Vector output gets a small repeating tile
+    instead of a canvas-sized image.
+    """
+    __slots__ = ('opacity', 'width', 'height', 'surface')
+
+    def __init__(self, width, height, opacity=0.03, key=None):
+        super().__init__(key)
+        self.width = width
+        self.height = height
+        self.opacity = opacity
+        self.surface = None
+
+    def resolve(self, scene):
+        self.bbox = (0, 0, self.width, self.height)
+
+    def signature(self):
+        return ('grain', self.width, self.height, self.opacity)
+
+    def draw(self, ctx):
+        if is_vector_target(ctx):
+            draw_grain_tile(ctx, create_grain_surface(GRAIN_TILE_SIZE, GRAIN_TILE_SIZE, self.opacity))
+            return
+        if self.surface is None:
+            self.surface = create_grain_surface(self.width, self.height, self.opacity)
+        draw_grain_surface(ctx, self.surface)
+
+
+class Group(Node):
+    """
+    Ordered container of child nodes
+
+    A group with a static_key is request-independent: it is recorded once per
+    (scene name, format, static_key) and replayed from the display list cache.
+    """
+    __slots__ = ('children', 'static_key')
+
+    def __init__(self, children=None, static_key=None, key=None):
+        super().__init__(key)
+        self.children = list(children or [])
+        self.static_key = static_key
+
+    def add(self, node):
+        self.children.append(node)
+        return node
+
+
+class Cell:
+    """Table cell with optional per-cell style overrides"""
+    __slots__ = ('text', 'color', 'size', 'weight', 'family', 'overflow')
+
+    def __init__(self, text, color=None, size=None, weight=None, family=None, overflow=False):
+        self.text = text
+        self.overflow = overflow
+        self.color = color
+        self.size = size
+        self.weight = weight
+        self.family = family
+
+
+class Column:
+    """Table column: anchor x, alignment and default text style"""
+    __slots__ = ('x', 'align', 'family', 'size', 'color', 'weight')
+
+    def __init__(self, x, align='left', family='IBM Plex Mono', size=32, color=TEXT_PRIMARY, weight='Regular'):
+        self.x = x
+        self.align = align
+        self.family = family
+        self.size = size
+        self.color = color
+        self.weight = weight
+
+
+def fitted_cell(text, family, max_width, max_size, min_size=None, weight='Regular', color=None):
+    """Table Cell shrunk (then ellipsized) to fit max_width - see base_template.fit_text"""
+    fit = fit_text(text, family, max_width, max_size, min_size, weight)
+    return Cell(fit.lines[0], color=color, size=fit.size, weight=weight, family=family, overflow=fit.overflow)
+
+
+def _pango_color(color):
+    """RGB floats (0-1) -> 16-bit channels, rounded the way cairo rounds source colors"""
+    return tuple(int(c * 65535 + 0.5) for c in color)
+
+
+class TableRow(Node):
+    """
+    One table row drawn as a single Pango layout
+
+    Cells are joined with tabs; a tab stop per cell places it at its column's
+    resolved left edge and attribute runs carry each cell's font and color, so
+    a row costs one layout and one show_layout instead of one per cell. Cells
+    are top-aligned like separate Text nodes: each gets a rise equal to the
+    difference between the row's tallest ascent and its own. Cells the glyph
+    atlas covers (numbers, trend arrows) are left out of the layout and
+    composited from the atlas at their column's left edge.
+    """
+    __slots__ = ('table', 'y', 'cells', 'metrics', 'lefts', 'layout', 'cell_layouts', 'glyph_runs')
+
+    def __init__(self, table, y, cells):
+        super().__init__()
+        self.table = table
+        self.y = y
+        self.cells = cells      # [(column, Cell)]
+        self.metrics = None     # [(width, ascent, height)], filled by Table.measure
+        self.lefts = None
+        self.layout = None
+        self.cell_layouts = None
+        self.glyph_runs = None
+
+    def resolve(self, scene):
+        lefts = []
+        for (column, cell), (w, _, _) in zip(self.cells, self.metrics):
+            if column.align == 'center':
+                lefts.append(column.x - w / 2)
+            elif column.align == 'right':
+                lefts.append(column.x - w)
+            else:
+                lefts.append(column.x)
+        self.lefts = lefts
+
+        x0 = min(lefts)
+        x1 = max(left + w for left, (w, _, _) in zip(lefts, self.metrics))
+        self.bbox = (x0, self.y, x1 - x0, max(h for _, _, h in self.metrics))
+        x0 = lefts[0]
+
+        # A tab can only move text forward, so rows whose cells overlap fall
+        # back to one layout per cell
+        stops = [round((left - x0) * PANGO_SCALE) for left in lefts]
+        ends = [stop + round(w * PANGO_SCALE) for stop, (w, _, _) in zip(stops, self.metrics)]
+        if any(stops[i] <= ends[i - 1] for i in range(1, len(stops))):
+            measurer = get_measurer()
+            self.cell_layouts = [
+                measurer.measure(cell.text, *style)[0]
+                for (_, cell), style in zip(self.cells, self.table.cell_styles(self))
+            ]
+            return
+
+        self.glyph_runs = [glyph_run(cell.text, *style) for (_, cell), style
+                           in zip(self.cells, self.table.cell_styles(self))]
+        shaped = [i for i, run in enumerate(self.glyph_runs) if run is None]
+        if shaped:
+            self.layout = self._build_layout(shaped, [stops[i] - stops[shaped[0]] for i in shaped])
+
+    def _build_layout(self, shaped, stops):
+        """One tabbed layout for the cells at indices shaped, stops relative to the first"""
+        ascent = max(a for _, a, _ in self.metrics)
+        styles = self.table.cell_styles(self)
+        layout = get_measurer().create_layout()
+        layout.text = '\t'.join(self.cells[i][1].text for i in shaped)
+
+        attrs = AttrList()
+        start = 0
+        for i, ((column, cell), (family, size, weight), (_, cell_ascent, _)) in enumerate(
+                (self.cells[j], styles[j], self.metrics[j]) for j in shaped):
+            # Each cell's run starts at the tab that positions it
+            end = start + len(cell.text.encode('utf-8')) + (1 if i else 0)
+            attrs.insert(Attribute.from_font_desc(create_font_description(family, size, weight), start, end))
+            attrs.insert(Attribute.from_foreground_color(*_pango_color(cell.color or column.color), start, end))
+            rise = round((ascent - cell_ascent) * PANGO_SCALE)
+            if rise:
+                attrs.insert(Attribute.from_rise(rise, start, end))
+            start = end
+        layout.attributes = attrs
+
+        tabs = TabArray()
+        tabs.tabs = [(TabAlign.LEFT, stop) for stop in stops[1:]]
+        layout.tabs = tabs
+        return layout
+
+    def signature(self):
+        return ('table_row', self.y, tuple(
+            (cell.text, style, cell.color or column.color, left)
+            for (column, cell), style, left in zip(self.cells, self.table.cell_styles(self), self.lefts)
+        ))
+
+    def draw(self, ctx):
+        if self.cell_layouts is not None:
+            for (column, cell), left, layout in zip(self.cells, self.lefts, self.cell_layouts):
+                ctx.set_source_rgb(*(cell.color or column.color))
+                _show(ctx, layout, left, self.y)
+            return
+        if self.layout is not None:
+            first = self.glyph_runs.index(None)
+            ctx.move_to(self.lefts[first], self.y)
+            pango.update_layout(ctx, self.layout)
+            pango.show_layout(ctx, self.layout)
+        for (column, cell), left, run in zip(self.cells, self.lefts, self.glyph_runs):
+            if run is not None:
+                ctx.set_source_rgb(*(cell.color or column.color))
+                run.draw(ctx, left, self.y)
+
+
+class Table(Group):
+    """
+    Rows of cells laid out against shared column definitions
+
+    Rows are added with an explicit y so templates keep control of variable
+    row heights (podium rows, interleaved rest rows). A cell may be a string,
+    a Cell with style overrides, or None to leave the column empty. Other
+    nodes (row backgrounds, markers) can be mixed in with add().
+
+    Every column is measured in one pass (see TextMeasurer.measure_runs),
+    which also gives column_widths, and every row is drawn as one layout.
+    """
+    __slots__ = ('columns', 'column_widths')
+
+    def __init__(self, columns, key=None):
+        super().__init__(key=key)
+        self.columns = columns
+        self.column_widths = None
+
+    def add_row(self, y, cells):
+        row = [
+            (column, cell if isinstance(cell, Cell) else Cell(cell))
+            for column, cell in zip(self.columns, cells)
+            if cell is not None
+        ]
+        if row:
+            self.add(TableRow(self, y, row))
+
+    def cell_styles(self, row):
+        """[(family, size, weight)] for a row's cells, with overrides applied"""
+        return [
+            (cell.family or column.family, cell.size or column.size, cell.weight or column.weight)
+            for column, cell in row.cells
+        ]
+
+    def measure(self, measurer):
+        """One measurement pass per column over every row; sets row metrics and column_widths"""
+        rows = [child for child in self.children if isinstance(child, TableRow)]
+        by_column = {}
+        for row in rows:
+            row.metrics = [None] * len(row.cells)
+            for i, ((column, cell), style) in enumerate(zip(row.cells, self.cell_styles(row))):
+                by_column.setdefault(id(column), []).append((row, i, (cell.text,) + style))
+
+        widths = {}
+        for column_id, entries in by_column.items():
+            metrics = measurer.measure_runs([run for _, _, run in entries])
+            for (row, i, _), m in zip(entries, metrics):
+                row.metrics[i] = m
+            widths[column_id] = max(w for w, _, _ in metrics)
+        self.column_widths = [widths.get(id(column), 0) for column in self.columns]
+
+
+# ─────────────────────────────────────────────
+# Scene
+# ─────────────────────────────────────────────
+
+def _intersects(a, b):
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def _pixel_rect(bbox, padding, width, height):
+    """Grow bbox by padding and snap outward to whole pixels inside the canvas"""
+    x0 = max(0, math.floor(bbox[0] - padding))
+    y0 = max(0, math.floor(bbox[1] - padding))
+    x1 = min(width, math.ceil(bbox[0] + bbox[2] + padding))
+    y1 = min(height, math.ceil(bbox[1] + bbox[3] + padding))
+    return (x0, y0, max(0, x1 - x0), max(0, y1 - y0))
+
+
+class Scene:
+    """
+    Root of a card's node tree
+
+    Args:
+        name: Template name (part of every static layer cache key)
+        format_key: '1:1' or '9:16'
+    """
+
+    def __init__(self, name, format_key):
+        self.name = name
+        self.format_key = format_key
+        self.width, self.height = DIMENSIONS[format_key]
+        self.root = Group()
+
+    def add(self, node):
+        return self.root.add(node)
+
+    def static_layer_key(self, group):
+        return (self.name, self.format_key) + tuple(group.static_key)
+
+    def iter_leaves(self, node=None, include_cached=True):
+        """Depth-first leaves in draw order; optionally skip already-recorded static groups"""
+        node = node or self.root
+        for child in node.children:
+            if isinstance(child, Group):
+                if (not include_cached and child.static_key is not None
+                        and has_static_layer(self.static_layer_key(child))):
+                    continue
+                yield from self.iter_leaves(child, include_cached)
+            else:
+                yield child
+
+    def resolve(self):
+        """Batched measurement of all text, then bounding boxes for every node"""
+        leaves = list(self.iter_leaves(include_cached=False))
+        measurer = get_measurer()
+        measurer.measure_batch([n for n in leaves if isinstance(n, Text)])
+        for table in dict.fromkeys(n.table for n in leaves if isinstance(n, TableRow)):
+            table.measure(measurer)
+        for leaf in leaves:
+            leaf.resolve(self)
+        self._resolve_groups(self.root)
+
+    def _resolve_groups(self, group):
+        boxes = []
+        for child in group.children:
+            if isinstance(child, Group):
+                self._resolve_groups(child)
+            if child.bbox is not None:
+                boxes.append(child.bbox)
+        if group.static_key is not None and not boxes:
+            # Replayed from cache without being measured - assume full canvas
+            group.bbox = (0, 0, self.width, self.height)
+        elif boxes:
+            x0 = min(b[0] for b in boxes)
+            y0 = min(b[1] for b in boxes)
+            x1 = max(b[0] + b[2] for b in boxes)
+            y1 = max(b[1] + b[3] for b in boxes)
+            group.bbox = (x0, y0, x1 - x0, y1 - y0)
+
+    def draw(self, ctx, clip=None, skip=()):
+        """
+        Draw the tree onto ctx
+
+        Args:
+            clip: Optional list of (x, y, w, h) rects - nodes whose bbox misses
+                  all of them are culled
+            skip: Node classes left out of the drawing (e.g. Grain for previews)
+        """
+        self._draw_group(ctx, self.root, clip, skip)
+
+    def _draw_group(self, ctx, group, clip, skip=()):
+        for child in group.children:
+            if clip is not None and child.bbox is not None and not any(_intersects(child.bbox, r) for r in clip):
+                continue
+            if isinstance(child, Group):
+                if child.static_key is not None:
+                    draw_static_layer(ctx, self.static_layer_key(child), self.width, self.height,
+                                      lambda layer_ctx, g=child: self._draw_group(layer_ctx, g, None))
+                else:
+                    self._draw_group(ctx, child, clip, skip)
+            elif not isinstance(child, skip):
+                child.draw(ctx)
+
+    def elements(self):
+        """
+        Flatten the resolved tree into drawable units: [(signature, bbox)] in draw order
+
+        Static groups count as one unit keyed by their display list key.
+        """
+        units = []
+        self._collect_elements(self.root, units)
+        return units
+
+    def _collect_elements(self, group, units):
+        for child in group.children:
+            if isinstance(child, Group):
+                if child.static_key is not None:
+                    units.append((('static',) + self.static_layer_key(child), child.bbox))
+                else:
+                    self._collect_elements(child, units)
+            else:
+                units.append((child.signature(), child.bbox))
+
+    def dirty_rects(self, previous):
+        """
+        Regions that differ between a previous resolved scene and this one
+
+        Rects are full-width horizontal bands: gradients are evaluated
+        incrementally along each scanline from its left edge, so only a repaint
+        that starts rows at x=0 is bit-identical to a full render.
+
+        Returns: list of pixel-aligned (x, y, w, h) bands, or None when the
+                 change cannot be expressed as a repaint (z-order changed,
+                 or too much of the card changed to be worth it)
+        """
+        old = previous.elements()
+        new = self.elements()
+        old_counts = Counter(sig for sig, _ in old)
+        new_counts = Counter(sig for sig, _ in new)
+        changed = set(old_counts - new_counts) | set(new_counts - old_counts)
+
+        # Unchanged elements must keep their relative order, otherwise pixels
+        # outside the dirty rects could differ from a full render
+        if [sig for sig, _ in old if sig not in changed] != [sig for sig, _ in new if sig not in changed]:
+            return None
+
+        spans = sorted(
+            (r[1], r[1] + r[3])
+            for r in (_pixel_rect(bbox, DIRTY_PADDING, self.width, self.height)
+                      for sig, bbox in old + new if sig in changed and bbox is not None)
+            if r[3]
+        )
+        bands = []
+        for y0, y1 in spans:
+            if bands and y0 <= bands[-1][1]:
+                bands[-1][1] = max(bands[-1][1], y1)
+            else:
+                bands.append([y0, y1])
+
+        if sum(y1 - y0 for y0, y1 in bands) > MAX_DIRTY_FRACTION * self.height:
+            return None
+        return [(0, y0, self.width, y1 - y0) for y0, y1 in bands]
+
+    def _adopt_grain(self, previous):
+        """Reuse the noise surfaces of a previous render so repainted grain matches it"""
+        surfaces = [n.surface for n in previous.iter_leaves() if isinstance(n, Grain) and n.surface is not None]
+        for node, surface in zip((n for n in self.iter_leaves() if isinstance(n, Grain)), surfaces):
+            node.surface = surface
+
+    def repaint(self, surface, previous):
+        """
+        Update surface (a render of previous) in place so it matches this scene
+
+        Each dirty rect is redrawn with the full node stack into its own patch
+        surface (integer translation, no clip - clipped compositing rounds
+        differently) and copied back, so the result is identical to a full
+        render of this scene.
+
+        Returns: False when a full render is needed instead
+        """
+        rects = self.dirty_rects(previous)
+        if rects is None:
+            return False
+        self._adopt_grain(previous)
+
+        ctx = cairo.Context(surface)
+        ctx.set_operator(cairo.OPERATOR_SOURCE)
+        for x, y, w, h in rects:
+            if not w or not h:
+                continue
+            patch = cairo.ImageSurface(cairo.FORMAT_ARGB32, w, h)
+            patch_ctx = cairo.Context(patch)
+            patch_ctx.translate(-x, -y)
+            self.draw(patch_ctx, clip=[(x, y, w, h)])
+            patch.flush()
+
+            ctx.set_source_surface(patch, x, y)
+            ctx.rectangle(x, y, w, h)
+            ctx.fill()
+        return True
+
+    def render(self, card_key=None, output='png'):
+        """
+        Resolve, rasterize and encode the scene. Returns PNG bytes.
+
+        Args:
+            card_key: Optional stable identity of the card (e.g. workout id).
+                      The last render per (template, format, card_key) is kept,
+                      and a re-render repaints only the regions that changed.
+            output: 'png', or 'svg' / 'pdf' to draw onto a vector surface and
+                    return the document instead (card_key is ignored)
+        """
+        if output != 'png':
+            self.resolve()
+            stream = BytesIO()
+            surface, ctx = setup_canvas(self.width, self.height, output, stream)
+            self.draw(ctx)
+            surface.finish()
+            return stream.getvalue()
+        surface, keep = self.rasterize(card_key)
+        png = surface_to_png_bytes(surface)
+        keep()
+        return png
+
+    def rasterize(self, card_key=None):
+        """
+        Resolve and draw the scene into a full-size ARGB32 surface, without encoding
+
+        With a card_key the previous render of the same card is repainted in
+        place where possible (see render). The surface stays out of the render
+        cache until keep() is called, so call it only once the surface has been
+        encoded - until then no other render of the card can repaint it.
+
+        Returns: (surface, keep)
+        """
+        self.resolve()
+        if card_key is None:
+            surface, ctx = setup_canvas(self.width, self.height)
+            self.draw(ctx)
+            return surface, lambda: None
+
+        cache_key = (self.name, self.format_key, card_key)
+        # Take the entry out while repainting so concurrent renders of the same card never share a surface
+        with _render_cache_lock:
+            cached = _render_cache.pop(cache_key, None)
+
+        if cached is not None and self.repaint(*cached):
+            surface = cached[0]
+        else:
+            surface, ctx = setup_canvas(self.width, self.height)
+            self.draw(ctx)
+
+        def keep():
+            with _render_cache_lock:
+                _render_cache[cache_key] = (surface, self)
+                while len(_render_cache) > RENDER_CACHE_SIZE:
+                    _render_cache.popitem(last=False)
+        return surface, keep
+
+    def render_preview(self, width=PREVIEW_WIDTH):
+        """
+        Quick low-resolution PNG for interactive editing
+
+        The full-size tree is drawn through a scaled context, so static layers
+        replay from the same display lists as full renders and text keeps its
+        cached shaping. Grain is skipped (invisible at this size), nothing
+        enters the render cache, and the PNG is encoded at a low zlib level.
+        """
+        self.resolve()
+        scale = width / self.width
+        surface, ctx = setup_canvas(width, round(self.height * scale))
+        ctx.scale(scale, scale)
+        self.draw(ctx, skip=(Grain,))
+        return surface_to_png_bytes(surface, compress_level=PREVIEW_COMPRESS_LEVEL)
+
+    def layout(self):
+        """
+        Measure and lay out the scene without rasterizing anything
+
+        No canvas is allocated, nothing is drawn and no grain is generated -
+        only text shaping runs, against the per-thread scratch context.
+
+        Returns: JSON-ready dict with the canvas size, an overall overflow
+                 flag and one entry per keyed node (bbox, font size(s),
+                 overflow), table rows listed under their table
+        """
+        self.resolve()
+        elements = []
+        self._collect_layout(self.root, elements)
+        return {
+            'width': self.width,
+            'height': self.height,
+            'overflow': any(e['overflow'] for e in elements),
+            'elements': elements,
+        }
+
+    def _collect_layout(self, group, elements):
+        for child in group.children:
+            if child.key is not None:
+                elements.append(self._layout_entry(child))
+            elif isinstance(child, Group) and child.static_key is None:
+                self._collect_layout(child, elements)
+
+    def _off_canvas(self, bbox):
+        x, y, w, h = bbox
+        return x < 0 or y < 0 or x + w > self.width or y + h > self.height
+
+    def _layout_entry(self, node):
+        entry = {'type': type(node).__name__}
+        if node.key is not None:
+            entry['key'] = node.key
+        bbox = node.bbox
+        entry['bbox'] = [round(v, 1) for v in bbox] if bbox is not None else None
+
+        if isinstance(node, Table):
+            rows = [self._layout_entry(row) for row in node.children if isinstance(row, TableRow)]
+            entry['rows'] = rows
+            entry['columnWidths'] = [round(w, 1) for w in node.column_widths or []]
+            overflow = any(row['overflow'] for row in rows)
+        elif isinstance(node, TableRow):
+            entry['fontSizes'] = [cell.size or column.size for column, cell in node.cells]
+            # Cells that had to be ellipsized or that collide with the next column
+            overflow = node.cell_layouts is not None or any(cell.overflow for _, cell in node.cells)
+        else:
+            if isinstance(node, Text):
+                texts = [node]
+            elif isinstance(node, Group):
+                texts = [leaf for leaf in self.iter_leaves(node) if isinstance(leaf, Text)]
+            else:
+                texts = []
+            if texts:
+                sizes = sorted({t.size for t in texts})
+                entry['fontSize'] = sizes[0] if len(sizes) == 1 else sizes
+                entry['text'] = ' '.join(t.text for t in texts) if len(texts) > 1 else texts[0].text
+            overflow = any(t.overflow for t in texts)
+
+        entry['overflow'] = bool(overflow or (bbox is not None and self._off_canvas(bbox)))
+        return entry
+
+    # ── Shared building blocks ──
+
+    def add_grain(self, opacity=0.03):
+        return self.add(Grain(self.width, self.height, opacity))
+
+    def add_photo_background(self, options):
+        """Add the user's blurred, darkened options.backgroundPhoto over the card background, if any"""
+        photo = options.get('backgroundPhoto')
+        if not photo:
+            return None
+        surface = photo_background(photo, self.width, self.height)
+        return self.add(Image(surface, 0, 0, self.width, self.height, key='photo_background'))
+
+    def add_share_qr(self, options):
+        """Add a QR code for options.shareUrl (the public share page) in the bottom-right corner, if set"""
+        url = options.get('shareUrl')
+        if not url:
+            return None
+        size = SHARE_QR_SIZE[self.format_key]
+        x = self.width - SHARE_QR_MARGIN - size
+        y = self.height - SHARE_QR_MARGIN - size
+        modules, _ = qr_code_rects(url)
+        module = size / (modules + 2 * SHARE_QR_QUIET_ZONE)
+        inset = SHARE_QR_QUIET_ZONE * module
+        return self.add(Group([
+            Panel(x, y, size, size, 16, TEXT_PRIMARY),
+            Shape(lambda ctx: draw_qr_code(ctx, url, x + inset, y + inset, modules * module, DARK_BG),
+                  bbox=(x, y, size, size), signature=('qr', url)),
+        ], key='share_qr'))
+
+    def add_branding(self, options):
+        """
+        Add options.teamLogo and options.userAvatar (bottom-left, if set) and the
+        "Made with oarbit" attribution as a static group (honours showAttribution)
+        """
+        self.add_branding_images(options)
+        if not options.get('showAttribution', True):
+            return None
+        x, y = branding_position(self.width, self.height, self.format_key)
+        return self.add(Group([
+            Text("Made with oarbit", "IBM Plex Sans", 28, x, y, TEXT_MUTED, weight='Regular', align='center'),
+        ], static_key=('branding',)))
+
+    def add_branding_images(self, options):
+        """
+        Add the team logo and the user's round avatar side by side in the bottom-left corner
+
+        Both are base64 PNG/JPEG in options, decoded and scaled once through the
+        branding image cache, so the same logo on every card of a team is a hit.
+        An image that can't be decoded is left off, like a missing one.
+        """
+        x = BRANDING_IMAGE_MARGIN
+        nodes = []
+        logo = branding_image(options, 'teamLogo', 'team_logo', self.format_key)
+        if logo is not None:
+            w, h = logo.get_width(), logo.get_height()
+            nodes.append(Image(logo, x, self.height - BRANDING_IMAGE_MARGIN - h, w, h))
+            x += w + BRANDING_IMAGE_GAP
+        avatar = branding_image(options, 'userAvatar', 'avatar', self.format_key, fit='cover')
+        if avatar is not None:
+            size = avatar.get_width()
+            y = self.height - BRANDING_IMAGE_MARGIN - size
+
+            def draw_avatar(ctx, avatar=avatar, x=x, y=y, size=size):
+                ctx.save()
+                ctx.arc(x + size / 2, y + size / 2, size / 2, 0, 2 * math.pi)
+                ctx.clip()
+                ctx.set_source_surface(avatar, x, y)
+                ctx.paint()
+                ctx.restore()
+
+            # Cached surfaces are reused across renders, so their id identifies the image
+            nodes.append(Shape(draw_avatar, bbox=(x, y, size, size), signature=('avatar', id(avatar))))
+        if not nodes:
+            return None
+        return self.add(Group(nodes, key='branding_images'))
+
+
+def branding_image(options, field, kind, format_key, fit='contain'):
+    """
+    Cached surface for a base64 image in options[field]
+
+    Returns None when the field is unset, or when it is not a base64 string of a
+    decodable image (logged and skipped - branding never fails the card).
+    """
+    value = options.get(field)
+    if not value:
+        return None
+    if not isinstance(value, str):
+        logger.warning("Skipping %s: expected a base64 string, got %s", field, type(value).__name__)
+        return None
+    from PIL import Image as PILImage
+
+    try:
+        return load_branding_image(binascii.a2b_base64(value), kind, format_key, fit)
+    except (binascii.Error, OSError, ValueError, PILImage.DecompressionBombError) as e:
+        logger.warning("Skipping %s: not a readable image (%s)", field, e)
+        return None
+
+
+def render_scene(scene, options):
+    """
+    Render a built scene, repainting incrementally when options carry a cardKey
+
+    options.output selects the document type ('png', 'svg' or 'pdf'; see OUTPUT_MIMETYPES),
+    and options.preview a quick low-resolution PNG (see Scene.render_preview).
+    """
+    options = options or {}
+    if options.get('preview'):
+        return scene.render_preview()
+    return scene.render(card_key=options.get('cardKey'), output=options.get('output', 'png'))
+
+
+def render_scenes(scenes, options):
+    """
+    Render several built scenes for one payload (both formats, both designs)
+
+    Scenes are measured, drawn and encoded one after another on this thread,
+    so they share its text measurer, fitted-text results, glyph runs and the
+    static layers the first one records. None of those caches is locked -
+    Pango layouts and recordings are not safe to use from two threads at
+    once - so nothing here may move to another thread.
+
+    Returns: [bytes] in scene order
+    """
+    options = options or {}
+    return [render_scene(scene, options) for scene in scenes]
@@ -10,18 +10,16 @@ Layout:
 """
 
 import math
+from datetime import date, timedelta
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect, draw_rounded_rect,
-    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes,
     DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE
 )
+from templates.scene import Scene, render_scene, Group, Text, Panel, Gradient, Shape, Image, fitted_line
+from templates.models import SeasonRecapData
+from templates.season_stats import SeasonStats
+from templates.heatmap import volume_levels, heatmap_surface, HEATMAP_CELL, HEATMAP_GAP
 import cairocffi as cairo
 
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
-
 
 def format_meters(meters):
     """Format meters with comma separators and unit"""
@@ -86,41 +84,82 @@ def draw_celebration_background(ctx, width, height):
     ctx.restore()
 
 
-def draw_stat_badge(ctx, value, label, x, y, color, align='center'):
-    """Draw a stat with large value and label below"""
-    draw_text(ctx, value, "IBM Plex Mono", 96,
-              x, y, color, weight='Bold', align=align)
-    draw_text(ctx, label, "IBM Plex Sans", 36,
-              x, y + 120, TEXT_MUTED, weight='SemiBold', align=align)
-
-
-def draw_improvement_row(ctx, improvement, x, y, width):
-    """Draw a single improvement row (test type, old→new, delta)"""
-    test_type = improvement.get('test_type', '')
-    old_time = improvement.get('old_time', '')
-    new_time = improvement.get('new_time', '')
-    delta = improvement.get('delta', '')
+def section_header_nodes(width):
+    """Static nodes: "SEASON RECAP" kicker, separator and volume section header"""
+    # Decorative separator (below season name + date range)
+    separator_y = 120 + 90 + 110 + 100
+    separator_width = 800
+    return [
+        Text("SEASON RECAP", "IBM Plex Sans", 56,
+             width / 2, 120, COPPER, weight='Bold', align='center'),
+        Gradient((width - separator_width) / 2, separator_y, separator_width, 4,
+                 GOLD, COPPER, direction='horizontal'),
+        Text("YOUR YEAR IN NUMBERS", "IBM Plex Sans", 44,
+             width / 2, separator_y + 80, TEXT_MUTED, weight='Bold', align='center'),
+    ]
+
+
+def add_stat_badge(group, value, label, x, y, color, align='center'):
+    """Add a stat with large value and label below"""
+    group.add(Text(value, "IBM Plex Mono", 96,
+                   x, y, color, weight='Bold', align=align))
+    group.add(Text(label, "IBM Plex Sans", 36,
+                   x, y + 120, TEXT_MUTED, weight='SemiBold', align=align))
+
+
+def add_improvement_row(group, improvement, x, y, width):
+    """Add a single improvement row (test type, old→new, delta)"""
+    test_type = improvement.test_type
+    old_time = improvement.old_time
+    new_time = improvement.new_time
+    delta = improvement.delta
 
     # Test type (left)
-    draw_text(ctx, test_type, "IBM Plex Sans", 42,
-              x, y, TEXT_PRIMARY, weight='Bold', align='left')
+    group.add(Text(test_type, "IBM Plex Sans", 42,
+              x, y, TEXT_PRIMARY, weight='Bold', align='left'))
 
     # Old → New (center)
     transition = f"{old_time} → {new_time}"
-    draw_text(ctx, transition, "IBM Plex Mono", 38,
-              x + 280, y, TEXT_SECONDARY, weight='Regular', align='left')
+    group.add(Text(transition, "IBM Plex Mono", 38,
+              x + 280, y, TEXT_SECONDARY, weight='Regular', align='left'))
 
     # Delta (right, with color coding)
     delta_color = GOLD  # Improvements are always gold (negative delta)
-    draw_text(ctx, delta, "IBM Plex Mono", 42,
-              width - x, y, delta_color, weight='Bold', align='right')
+    group.add(Text(delta, "IBM Plex Mono", 42,
+              width - x, y, delta_color, weight='Bold', align='right'))
 
     return y + 80
 
 
-def render_season_recap(format_key, workout_data, options):
+# Largest on-card size of one heatmap day (cell + gap), for short seasons
+HEATMAP_MAX_PITCH = 44
+
+
+def add_heatmap(scene, workouts, y, width):
+    """Add the daily volume heatmap as one scaled image. Returns new y position."""
+    levels = volume_levels(workouts.date, workouts.distance_m)
+    if levels is None:
+        return y
+
+    rows, weeks = levels.shape
+    active_days = int((levels > 0).sum())
+    scene.add(Text("TRAINING CALENDAR", "IBM Plex Sans", 32,
+                   160, y, TEXT_MUTED, weight='SemiBold', align='left', key='heatmap_label'))
+    scene.add(Text(f"{active_days} active day{'s' if active_days != 1 else ''}", "IBM Plex Sans", 32,
+                   width - 160, y, TEXT_MUTED, weight='Regular', align='right', key='heatmap_days'))
+
+    # Whole buffer pixels per cell keep the nearest-neighbour blit crisp
+    surface = heatmap_surface(levels)
+    pitch = HEATMAP_CELL + HEATMAP_GAP
+    scale = min((width - 320) / (weeks * pitch), HEATMAP_MAX_PITCH / pitch)
+    w, h = surface.get_width() * scale, surface.get_height() * scale
+    scene.add(Image(surface, (width - w) / 2, y + 60, w, h, filter=cairo.FILTER_NEAREST, key='heatmap'))
+    return y + 60 + h + 100
+
+
+def build_season_recap_scene(format_key, workout_data, options):
     """
-    Render season recap card - Spotify Wrapped style for rowing
+    Build season recap card scene - Spotify Wrapped style for rowing
 
     Data expected:
     {
@@ -146,115 +185,130 @@ def render_season_recap(format_key, workout_data, options):
             },
             ...
         ],
-        'athlete_name': str  # Optional
+        'athlete_name': str,  # Optional
+        'workouts': {  # Optional raw season; replaces the totals, PRs and improvements above
+            'date': [str],  # ISO dates, one per workout
+            'distanceM': [number],
+            'durationSeconds': [number],
+            'calories': [number],
+            'machineType': [str],
+            'isInterval': [bool]
+        }
     }
     """
     if options is None:
         options = {}
 
-    width, height = DIMENSIONS[format_key]
+    scene = Scene('season_recap', format_key)
+    width, height = scene.width, scene.height
     is_story = format_key == '9:16'
 
-    surface, ctx = setup_canvas(width, height)
-
     # Celebration background
-    draw_celebration_background(ctx, width, height)
+    scene.add(Group([
+        Shape(lambda ctx: draw_celebration_background(ctx, width, height)),
+    ], static_key=('background',)))
+    scene.add_photo_background(options)
 
     # Extract data
-    season_name = workout_data.get('season_name', 'Season')
-    date_range = workout_data.get('date_range', '')
-    total_meters = workout_data.get('total_meters', 0)
-    total_minutes = workout_data.get('total_minutes', 0)
-    workout_count = workout_data.get('workout_count', 0)
-    prs_set = workout_data.get('prs_set', 0)
-    total_calories = workout_data.get('total_calories', 0)
-    avg_weekly_meters = workout_data.get('avg_weekly_meters', 0)
-    favorite_machine = workout_data.get('favorite_machine', 'RowErg')
-    biggest_improvement = workout_data.get('biggest_improvement', {})
-    improvements = workout_data.get('improvements', [])
-    athlete_name = workout_data.get('athlete_name', '')
+    workout = SeasonRecapData.coerce(workout_data)
+    if workout.workouts is not None:
+        SeasonStats(workout.workouts).apply(workout)
+    season_name = workout.season_name
+    date_range = workout.date_range
+    total_meters = workout.total_meters
+    total_minutes = workout.total_minutes
+    workout_count = workout.workout_count
+    prs_set = workout.prs_set
+    total_calories = workout.total_calories
+    avg_weekly_meters = workout.avg_weekly_meters
+    favorite_machine = workout.favorite_machine
+    biggest_improvement = workout.biggest_improvement
+    improvements = workout.improvements
+    athlete_name = workout.athlete_name
 
     # ── Title Section ──
     y = 120
 
-    # "SEASON RECAP" header
-    draw_text(ctx, "SEASON RECAP", "IBM Plex Sans", 56,
-              width / 2, y, COPPER, weight='Bold', align='center')
+    # "SEASON RECAP" header, separator and volume header (fixed positions)
+    scene.add(Group(section_header_nodes(width), static_key=('section_headers',)))
     y += 90
 
     # Season name - large, celebratory
-    draw_text(ctx, season_name, "IBM Plex Sans", 88,
-              width / 2, y, TEXT_PRIMARY, weight='Bold', align='center')
+    scene.add(fitted_line(season_name, "IBM Plex Sans", width / 2, y, width - 240, 88, 56,
+                          TEXT_PRIMARY, weight='Bold', align='center', key='season_name'))
     y += 110
 
     # Date range
-    draw_text(ctx, date_range, "IBM Plex Sans", 38,
-              width / 2, y, TEXT_SECONDARY, weight='Regular', align='center')
+    scene.add(Text(date_range, "IBM Plex Sans", 38,
+              width / 2, y, TEXT_SECONDARY, weight='Regular', align='center'))
     y += 100
 
-    # Decorative separator
-    separator_width = 800
-    draw_gradient_rect(ctx, (width - separator_width) / 2, y, separator_width, 4,
-                       GOLD, COPPER, direction='horizontal')
+    # Decorative separator (drawn in the section headers layer)
     y += 80
 
     # ── VOLUME SECTION ──
-    # Section header
-    draw_text(ctx, "YOUR YEAR IN NUMBERS", "IBM Plex Sans", 44,
-              width / 2, y, TEXT_MUTED, weight='Bold', align='center')
+    # Section header (drawn in the section headers layer)
     y += 100
 
     # Volume stats in grid (2x3 for 1:1, 2x3 for 9:16)
     stat_gap = 200
+    volume = scene.add(Group(key='volume'))
     row1_y = y
     row2_y = y + stat_gap
 
     if is_story:
         # 9:16 format - more vertical space, show all stats
         # Row 1: Total Meters, Workouts, Time
-        draw_stat_badge(ctx, format_meters(total_meters), "TOTAL DISTANCE",
-                        width / 2, row1_y, GOLD, align='center')
+        add_stat_badge(volume, format_meters(total_meters), "TOTAL DISTANCE",
+                       width / 2, row1_y, GOLD, align='center')
 
         row1_y += stat_gap
         # Row 2: Workouts, Time
-        draw_stat_badge(ctx, str(workout_count), "WORKOUTS",
-                        width * 0.33, row1_y, ROSE, align='center')
-        draw_stat_badge(ctx, format_time_hours(total_minutes), "TIME",
-                        width * 0.67, row1_y, ROSE, align='center')
+        add_stat_badge(volume, str(workout_count), "WORKOUTS",
+                       width * 0.33, row1_y, ROSE, align='center')
+        add_stat_badge(volume, format_time_hours(total_minutes), "TIME",
+                       width * 0.67, row1_y, ROSE, align='center')
 
         row1_y += stat_gap
         # Row 3: Calories, Avg/week, Favorite machine
-        draw_stat_badge(ctx, format_calories(total_calories), "CALORIES",
-                        width * 0.33, row1_y, COPPER, align='center')
-        draw_stat_badge(ctx, format_meters(avg_weekly_meters), "AVG/WEEK",
-                        width * 0.67, row1_y, COPPER, align='center')
+        add_stat_badge(volume, format_calories(total_calories), "CALORIES",
+                       width * 0.33, row1_y, COPPER, align='center')
+        add_stat_badge(volume, format_meters(avg_weekly_meters), "AVG/WEEK",
+                       width * 0.67, row1_y, COPPER, align='center')
 
         y = row1_y + stat_gap + 60
 
         # Favorite machine callout
-        draw_text(ctx, f"Favorite: {favorite_machine}", "IBM Plex Sans", 40,
-                  width / 2, y, TEXT_SECONDARY, weight='SemiBold', align='center')
+        scene.add(Text(f"Favorite: {favorite_machine}", "IBM Plex Sans", 40,
+                  width / 2, y, TEXT_SECONDARY, weight='SemiBold', align='center'))
         y += 120
     else:
         # 1:1 format - compact, key stats only
         # Row 1: Total Meters, Workouts
-        draw_stat_badge(ctx, format_meters(total_meters), "TOTAL DISTANCE",
-                        width * 0.33, row1_y, GOLD, align='center')
-        draw_stat_badge(ctx, str(workout_count), "WORKOUTS",
-                        width * 0.67, row1_y, ROSE, align='center')
+        add_stat_badge(volume, format_meters(total_meters), "TOTAL DISTANCE",
+                       width * 0.33, row1_y, GOLD, align='center')
+        add_stat_badge(volume, str(workout_count), "WORKOUTS",
+                       width * 0.67, row1_y, ROSE, align='center')
 
         # Row 2: Time, Calories
-        draw_stat_badge(ctx, format_time_hours(total_minutes), "TIME",
-                        width * 0.33, row2_y, COPPER, align='center')
-        draw_stat_badge(ctx, format_calories(total_calories), "CALORIES",
-                        width * 0.67, row2_y, COPPER, align='center')
+        add_stat_badge(volume, format_time_hours(total_minutes), "TIME",
+                       width * 0.33, row2_y, COPPER, align='center')
+        add_stat_badge(volume, format_calories(total_calories), "CALORIES",
+                       width * 0.67, row2_y, COPPER, align='center')
 
         y = row2_y + 200
 
+    # ── TRAINING CALENDAR (raw season workouts only) ──
+    if workout.workouts is not None:
+        y = add_heatmap(scene, workout.workouts, y, width)
+
     # ── IMPROVEMENT SECTION ──
-    # Section header
-    draw_text(ctx, "YOUR PROGRESS", "IBM Plex Sans", 44,
-              width / 2, y, TEXT_MUTED, weight='Bold', align='center')
+    # Section header (position depends only on format - y is part of the key regardless)
+    progress_y = y
+    scene.add(Group([
+        Text("YOUR PROGRESS", "IBM Plex Sans", 44,
+             width / 2, progress_y, TEXT_MUTED, weight='Bold', align='center'),
+    ], static_key=('progress_header', progress_y)))
     y += 100
 
     # PRs badge (large, gold)
@@ -264,53 +318,58 @@ def render_season_recap(format_key, workout_data, options):
         panel_height = 180
         panel_x = (width - panel_width) / 2
 
-        draw_rounded_rect(ctx, panel_x, y, panel_width, panel_height, 24)
-        ctx.set_source_rgba(*GOLD, 0.15)
-        ctx.fill()
+        scene.add(Panel(panel_x, y, panel_width, panel_height, 24, GOLD, alpha=0.15, key='prs_panel'))
 
         # PRs count with badge
-        draw_text(ctx, str(prs_set), "IBM Plex Mono", 100,
-                  width / 2, y + 40, GOLD, weight='Bold', align='center')
-        draw_text(ctx, "PERSONAL RECORDS SET", "IBM Plex Sans", 36,
-                  width / 2, y + 160, TEXT_PRIMARY, weight='SemiBold', align='center')
+        scene.add(Text(str(prs_set), "IBM Plex Mono", 100,
+                  width / 2, y + 40, GOLD, weight='Bold', align='center'))
+        scene.add(Text("PERSONAL RECORDS SET", "IBM Plex Sans", 36,
+                  width / 2, y + 160, TEXT_PRIMARY, weight='SemiBold', align='center'))
 
         y += panel_height + 80
 
     # Biggest improvement callout
     if biggest_improvement:
-        test_type = biggest_improvement.get('test_type', '')
-        delta_seconds = biggest_improvement.get('delta_seconds', 0)
+        test_type = biggest_improvement.test_type
+        delta_seconds = biggest_improvement.delta_seconds
         if test_type and delta_seconds:
             biggest_text = f"Biggest gain: {test_type} (-{delta_seconds:.1f}s)"
-            draw_text(ctx, biggest_text, "IBM Plex Sans", 48,
-                      width / 2, y, ROSE, weight='Bold', align='center')
+            scene.add(Text(biggest_text, "IBM Plex Sans", 48,
+                      width / 2, y, ROSE, weight='Bold', align='center'))
             y += 100
 
     # Top 3 improvements (9:16 only, or if space allows)
     if improvements and (is_story or y < height - 700):
         y += 40
-        draw_text(ctx, "TOP IMPROVEMENTS", "IBM Plex Sans", 36,
-                  width / 2, y, TEXT_MUTED, weight='Bold', align='center')
+        scene.add(Text("TOP IMPROVEMENTS", "IBM Plex Sans", 36,
+                  width / 2, y, TEXT_MUTED, weight='Bold', align='center'))
         y += 80
 
-        # Draw improvements
+        # Improvement rows
+        rows = scene.add(Group(key='improvements'))
         improvement_x = 200
         for improvement in improvements[:3]:
-            y = draw_improvement_row(ctx, improvement, improvement_x, y, width)
+            y = add_improvement_row(rows, improvement, improvement_x, y, width)
 
     # ── Athlete Name (if provided) ──
     if athlete_name:
         name_y = height - 220
-        draw_text(ctx, athlete_name, "IBM Plex Sans", 52,
-                  width / 2, name_y, TEXT_SECONDARY, weight='SemiBold', align='center')
+        scene.add(fitted_line(athlete_name, "IBM Plex Sans", width / 2, name_y, width - 240, 52, 36,
+                              TEXT_SECONDARY, weight='SemiBold', align='center', key='athlete_name'))
 
     # Add grain texture
-    draw_grain_texture(ctx, width, height, opacity=0.03)
+    scene.add_grain(opacity=0.03)
 
     # Branding
-    draw_oarbit_branding(ctx, width, height, format_key, options)
+    scene.add_branding(options)
+    scene.add_share_qr(options)
 
-    return surface_to_png_bytes(surface)
+    return scene
+
+
+def render_season_recap(format_key, workout_data, options):
+    """Render season recap card. Returns: PNG bytes"""
+    return render_scene(build_season_recap_scene(format_key, workout_data, options), options)
 
 
 # Sample data for testing
@@ -332,3 +391,22 @@ SAMPLE_SEASON_RECAP = {
     ],
     'athlete_name': 'Marcus Chen',
 }
+
+# Raw-season sample: 15 weeks of steady state plus fortnightly 2K and monthly 6K tests
+_SEASON_DAYS = [d for d in range(105) if d % 7 not in (2, 6)]
+_SEASON_TESTS = {
+    **{d: (2000, 394.4 - 1.6 * i) for i, d in enumerate(range(11, 105, 14))},
+    **{d: (6000, 1275.0 - 8.8 * i) for i, d in enumerate(range(18, 105, 28))},
+}
+SAMPLE_SEASON_WORKOUTS = {
+    'season_name': 'Fall 2025',
+    'athlete_name': 'Marcus Chen',
+    'workouts': {
+        'date': [(date(2025, 9, 1) + timedelta(days=d)).isoformat() for d in _SEASON_DAYS],
+        'distanceM': [_SEASON_TESTS.get(d, (12000 - 1500 * (d % 3), 0))[0] for d in _SEASON_DAYS],
+        'durationSeconds': [_SEASON_TESTS.get(d, (0, 2880.0 - 360 * (d % 3)))[1] for d in _SEASON_DAYS],
+        'calories': [520 - 60 * (d % 3) for d in _SEASON_DAYS],
+        'machineType': ['bike' if d % 7 == 4 else 'rower' for d in _SEASON_DAYS],
+        'isInterval': [False] * len(_SEASON_DAYS),
+    },
+}
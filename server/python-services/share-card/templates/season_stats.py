@@ -0,0 +1,170 @@
+"""
+Season Stats - season_recap statistics from a season's raw workout columns
+Totals, weekly average, favourite machine, PRs and per-test-distance
+improvements are computed with array reductions over the whole season, so a
+recap costs the same handful of NumPy passes for 20 workouts or 2,000.
+"""
+
+import numpy as np
+
+from templates.models import BiggestImprovement, Improvement
+
+# Test distances tracked for PRs and improvements -> display label
+SEASON_TEST_DISTANCES = {
+    500: '500m',
+    1000: '1K',
+    2000: '2K',
+    5000: '5K',
+    6000: '6K',
+    10000: '10K',
+}
+
+# Raw machine type -> favourite machine label
+MACHINE_NAMES = {
+    'rower': 'RowErg',
+    'slides': 'RowErg',
+    'dynamic': 'RowErg',
+    'skierg': 'SkiErg',
+    'bike': 'BikeErg',
+    'bikerg': 'BikeErg',
+}
+
+
+def format_result_time(seconds):
+    """Format a test result: 394.4 -> '6:34.4', 3723.0 -> '1:02:03.0'"""
+    hrs = int(seconds // 3600)
+    mins = int((seconds % 3600) // 60)
+    secs = seconds % 60
+    if hrs > 0:
+        return f"{hrs}:{mins:02d}:{secs:04.1f}"
+    return f"{mins}:{secs:04.1f}"
+
+
+def format_date_range(first, last):
+    """'Sep 1 - Dec 15, 2025', with the first year shown only when it differs"""
+    start = f"{first:%b} {first.day}"
+    if first.year != last.year:
+        start += f", {first.year}"
+    return f"{start} - {last:%b} {last.day}, {last.year}"
+
+
+class SeasonStats:
+    """
+    Everything season_recap shows, computed from SeasonWorkouts columns
+
+    A test result is a non-interval workout whose distance is one of
+    SEASON_TEST_DISTANCES. Each distance's first result of the season is its
+    baseline; every later result faster than all before it counts as a PR,
+    and the improvement is baseline minus season best. Improvements are
+    ranked by relative gain so a 500m and a 6K compare fairly.
+
+    Attributes:
+        total_meters, total_minutes, total_calories, workout_count: Season totals
+        avg_weekly_meters: Meters per calendar week spanned by the season
+        favorite_machine: Label of the most-used machine, None without machine data
+        date_range: Formatted first - last workout date, None without workouts
+        prs_set: Number of PRs across all test distances
+        improvements: Improvement models, biggest relative gain first
+        biggest_improvement: BiggestImprovement for the top improvement, or None
+    """
+    __slots__ = ('total_meters', 'total_minutes', 'total_calories', 'workout_count', 'avg_weekly_meters',
+                 'favorite_machine', 'date_range', 'prs_set', 'improvements', 'biggest_improvement')
+
+    def __init__(self, workouts):
+        days = workouts.date
+        count = len(days)
+        distance = self._values(workouts.distance_m, count)
+        duration = self._values(workouts.duration_seconds, count)
+        calories = self._values(workouts.calories, count)
+
+        self.workout_count = count
+        self.total_meters = int(np.nansum(distance))
+        self.total_minutes = int(round(np.nansum(duration) / 60))
+        self.total_calories = int(np.nansum(calories))
+
+        self.date_range = None
+        self.avg_weekly_meters = 0
+        if count:
+            first, last = days.min(), days.max()
+            weeks = max(1, -(-(int((last - first).astype(int)) + 1) // 7))
+            self.avg_weekly_meters = int(round(self.total_meters / weeks))
+            self.date_range = format_date_range(first.item(), last.item())
+
+        self.favorite_machine = None
+        if workouts.machine_type and count:
+            machines = np.array([MACHINE_NAMES.get((m or 'rower').lower(), 'RowErg') for m in workouts.machine_type])
+            names, counts = np.unique(machines, return_counts=True)
+            self.favorite_machine = str(names[np.argmax(counts)])
+
+        interval = self._values(workouts.is_interval, count)
+        self._test_results(days, distance, duration, interval == 1)
+
+    @staticmethod
+    def _values(column, count):
+        """Column as a float array, all-NaN when the payload omitted it"""
+        return column if column is not None else np.full(count, np.nan)
+
+    def _test_results(self, days, distance, duration, interval):
+        """PR count and per-distance improvements"""
+        self.prs_set = 0
+        self.improvements = ()
+        self.biggest_improvement = None
+
+        tests = (np.isin(distance, list(SEASON_TEST_DISTANCES))
+                 & np.isfinite(duration) & (duration > 0) & ~interval)
+        if not tests.any():
+            return
+
+        # Group by distance, chronological within each group
+        distance, days, times = distance[tests], days[tests], duration[tests]
+        order = np.lexsort((days, distance))
+        distance, times = distance[order], times[order]
+        groups, starts = np.unique(distance, return_index=True)
+        group = np.repeat(np.arange(len(groups)), np.diff(np.append(starts, len(times))))
+
+        # Running best within each group in one accumulate: shifting each later
+        # group below every earlier one stops minima leaking across groups
+        shift = group * (times.max() + 1)
+        running = np.minimum.accumulate(times - shift) + shift
+        previous = np.roll(running, 1)
+        # Tolerance absorbs float error from the shift round-trip, so ties are not PRs
+        is_pr = times < previous - 1e-6
+        is_pr[starts] = False
+        self.prs_set = int(is_pr.sum())
+
+        baseline = times[starts]
+        best = np.minimum.reduceat(times, starts)
+        gain = baseline - best
+        ranked = [i for i in np.argsort(-gain / baseline, kind='stable') if gain[i] > 0]
+
+        self.improvements = tuple(
+            Improvement(
+                test_type=SEASON_TEST_DISTANCES[int(groups[i])],
+                old_time=format_result_time(baseline[i]),
+                new_time=format_result_time(best[i]),
+                delta=f"-{gain[i]:.1f}s",
+            )
+            for i in ranked
+        )
+        if ranked:
+            top = ranked[0]
+            self.biggest_improvement = BiggestImprovement(
+                test_type=SEASON_TEST_DISTANCES[int(groups[top])],
+                delta_seconds=float(gain[top]),
+            )
+
+    def apply(self, recap):
+        """Overwrite a SeasonRecapData's precomputed fields with these stats"""
+        recap.total_meters = self.total_meters
+        recap.total_minutes = self.total_minutes
+        recap.total_calories = self.total_calories
+        recap.workout_count = self.workout_count
+        recap.avg_weekly_meters = self.avg_weekly_meters
+        recap.prs_set = self.prs_set
+        recap.improvements = self.improvements
+        recap.biggest_improvement = self.biggest_improvement
+        if self.favorite_machine:
+            recap.favorite_machine = self.favorite_machine
+        if self.date_range and not recap.date_range:
+            recap.date_range = self.date_range
+        return recap
@@ -0,0 +1,222 @@
+"""
+Split Analysis - one-pass statistics over a workout's splits/intervals
+Computed once per render and shared by the title, table header, rest-row and
+pace-dot helpers instead of each of them re-walking the split list.
+
+Also aggregates long split lists (marathons, long JustRow pieces) into a
+fixed number of table rows.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from templates.models import ErgSplit
+
+# Recent analyses - id(splits) -> (splits, SplitAnalysis), LRU bounded. The
+# entry holds the splits tuple so its id cannot be reused while cached.
+_analyses = OrderedDict()
+_analyses_lock = threading.Lock()
+ANALYSIS_CACHE_SIZE = 64
+
+
+class SplitAnalysis:
+    """
+    Everything the erg cards derive from a split list, built in a single pass
+
+    Rest statistics exclude the last interval's rest (the PM5 records the
+    cooldown there, not a real rest).
+
+    Attributes:
+        count: Number of splits
+        uniform_time: Shared split time in seconds when every timed split has
+                      the same whole-second duration, else None
+        uniform_distance: Shared split distance when every split with a
+                          distance has the same one, else None
+        rest_times: Rest times (tenths) of the work intervals that have one
+        uniform_rest: True when all rest_times are equal (or there are none)
+        uniform_rest_value: The shared rest time, None when variable or absent
+        avg_rest: Mean of rest_times, None when absent
+        has_rest_hr: True when any split recorded a recovery heart rate
+        paces: Pace (tenths/500m) of every split that has one, in order
+        avg_pace: Mean of paces, None when no split has a pace
+        pace_devs: {split index: relative deviation from avg_pace}
+    """
+    __slots__ = ('count', 'uniform_time', 'uniform_distance', 'rest_times', 'uniform_rest',
+                 'uniform_rest_value', 'avg_rest', 'has_rest_hr', 'paces', 'avg_pace', 'pace_devs')
+
+    def __init__(self, splits):
+        """splits: sequence of ErgSplit"""
+        self.count = len(splits)
+        last_work = self.count - 1 if self.count > 1 else self.count
+
+        first_time = first_distance = None
+        time_uniform = distance_uniform = True
+        rest_times = []
+        rest_set = set()
+        has_rest_hr = False
+        paces = []
+        pace_indexes = []
+
+        for i, s in enumerate(splits):
+            t = s.time_seconds
+            if t:
+                if first_time is None:
+                    first_time = t
+                elif int(t) != int(first_time):
+                    time_uniform = False
+
+            d = s.distance_m
+            if d:
+                if first_distance is None:
+                    first_distance = d
+                elif d != first_distance:
+                    distance_uniform = False
+
+            if i < last_work:
+                rest = s.rest_time
+                if rest:
+                    rest_times.append(rest)
+                    rest_set.add(rest)
+
+            if s.heart_rate_rest:
+                has_rest_hr = True
+
+            p = s.pace_tenths
+            if p:
+                paces.append(p)
+                pace_indexes.append(i)
+
+        self.uniform_time = first_time if time_uniform else None
+        self.uniform_distance = first_distance if distance_uniform else None
+
+        self.rest_times = rest_times
+        self.uniform_rest = len(rest_set) <= 1
+        self.uniform_rest_value = rest_times[0] if len(rest_set) == 1 else None
+        self.avg_rest = sum(rest_times) / len(rest_times) if rest_times else None
+        self.has_rest_hr = has_rest_hr
+
+        self.paces = paces
+        self.avg_pace = sum(paces) / len(paces) if paces else None
+        avg = self.avg_pace
+        self.pace_devs = {i: (p - avg) / avg for i, p in zip(pace_indexes, paces)} if avg else {}
+
+
+# Bucket spans that read as "round" on a whiteboard: per-1K or per-5-minute rows
+ROUND_BUCKET_METERS = 1000
+ROUND_BUCKET_SECONDS = 300
+
+
+def split_analysis(splits):
+    """
+    SplitAnalysis of a decoded splits tuple, shared by every card drawn from it
+
+    Cards rendered from one payload (both formats, say) hold the same decoded
+    model, so the analysis runs once for all of them.
+    """
+    with _analyses_lock:
+        entry = _analyses.get(id(splits))
+        if entry is not None and entry[0] is splits:
+            _analyses.move_to_end(id(splits))
+            return entry[1]
+    analysis = SplitAnalysis(splits)
+    with _analyses_lock:
+        _analyses[id(splits)] = (splits, analysis)
+        if len(_analyses) > ANALYSIS_CACHE_SIZE:
+            _analyses.popitem(last=False)
+    return analysis
+
+
+def bucket_size(analysis, max_rows):
+    """
+    Number of consecutive splits per bucket so that at most max_rows rows remain
+
+    Prefers the smallest size (up to twice the minimum) whose span is a round
+    distance or time, e.g. 4 x 500m -> per-2K rows, 5 x 1:00 -> per-5-minute rows.
+    """
+    smallest = math.ceil(analysis.count / max(1, max_rows))
+    for k in range(smallest, min(2 * smallest, analysis.count) + 1):
+        if analysis.uniform_distance and (k * analysis.uniform_distance) % ROUND_BUCKET_METERS == 0:
+            return k
+        if analysis.uniform_time and round(k * analysis.uniform_time) % ROUND_BUCKET_SECONDS == 0:
+            return k
+    return smallest
+
+
+def _column(splits, attr):
+    """Split attribute as a float array, NaN where the split has no value"""
+    return np.array([getattr(s, attr) or np.nan for s in splits], dtype=float)
+
+
+def _weighted_mean(values, weights, starts):
+    """
+    Per-bucket mean of values weighted by weights, ignoring NaN values
+
+    Falls back to equal weights for buckets whose weights are all missing.
+    """
+    present = ~np.isnan(values)
+    weights = np.where(np.isnan(weights), 0.0, weights) * present
+    filled = np.where(present, values, 0.0)
+
+    weighted_sum = np.add.reduceat(filled * weights, starts)
+    weight_sum = np.add.reduceat(weights, starts)
+    plain_sum = np.add.reduceat(filled, starts)
+    count = np.add.reduceat(present.astype(float), starts)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(weight_sum > 0, weighted_sum / weight_sum, plain_sum / count)
+
+
+def _as_int(value):
+    return None if np.isnan(value) else int(round(value))
+
+
+def bucket_splits(splits, max_rows, analysis=None):
+    """
+    Aggregate splits into at most max_rows rows of consecutive splits
+
+    Each bucket is returned as an ErgSplit with the fields the table reads:
+    distance and time are summed, pace is distance-weighted (total time over
+    total distance) and watts, rate and heart rate are time-weighted means.
+    split_number is the bucket's last split; end_distance_m and end_seconds are the
+    cumulative distance and time at the end of the bucket, for "through 2K"
+    style row labels. Returns splits unchanged when they already fit.
+    """
+    if len(splits) <= max_rows:
+        return splits
+
+    analysis = analysis or split_analysis(splits)
+    k = bucket_size(analysis, max_rows)
+    starts = np.arange(0, len(splits), k)
+    ends = np.append(starts[1:], len(splits))
+
+    distance = _column(splits, 'distance_m')
+    time = _column(splits, 'time_seconds')
+
+    distance_sum = np.add.reduceat(np.nan_to_num(distance), starts)
+    time_sum = np.add.reduceat(np.nan_to_num(time), starts)
+    end_distance = np.cumsum(distance_sum)
+    end_seconds = np.cumsum(time_sum)
+    pace = _weighted_mean(_column(splits, 'pace_tenths'), distance, starts)
+    watts = _weighted_mean(_column(splits, 'watts'), time, starts)
+    rate = _weighted_mean(_column(splits, 'stroke_rate'), time, starts)
+    heart_rate = _weighted_mean(_column(splits, 'heart_rate'), time, starts)
+
+    numbers = [s.split_number if s.split_number is not None else i + 1 for i, s in enumerate(splits)]
+
+    buckets = []
+    for b, end in enumerate(ends):
+        buckets.append(ErgSplit(
+            split_number=numbers[end - 1],
+            distance_m=int(distance_sum[b]) or None,
+            time_seconds=float(time_sum[b]) or None,
+            end_distance_m=int(end_distance[b]),
+            end_seconds=float(end_seconds[b]),
+            pace_tenths=_as_int(pace[b]),
+            watts=_as_int(watts[b]),
+            stroke_rate=_as_int(rate[b]),
+            heart_rate=_as_int(heart_rate[b]),
+        ))
+    return buckets
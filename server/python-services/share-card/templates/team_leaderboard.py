@@ -10,17 +10,13 @@ Layout:
 """
 
 from templates.base_template import (
-    setup_canvas, draw_text, draw_gradient_rect, draw_rounded_rect,
-    draw_grain_texture, draw_oarbit_branding, surface_to_png_bytes,
+    draw_diagonal_background,
     DARK_BG, GOLD, COPPER, ROSE, TEXT_PRIMARY, TEXT_SECONDARY, TEXT_MUTED, SLATE
 )
+from templates.scene import Scene, render_scene, Group, Text, Gradient, Shape, Table, Column, Cell, fitted_line, fitted_cell
+from templates.models import LeaderboardData
 import cairocffi as cairo
 
-DIMENSIONS = {
-    '1:1': (2160, 2160),
-    '9:16': (2160, 3840),
-}
-
 
 def get_rank_color(rank):
     """Return color for rank position"""
@@ -58,53 +54,71 @@ def get_trend_color(trend):
         return TEXT_MUTED
 
 
-def draw_leaderboard_row(ctx, entry, y, width, row_height, is_podium=False):
-    """Draw a single leaderboard row"""
-    rank = entry.get('rank', 0)
-    athlete_name = entry.get('athlete_name', '')
-    metric_value = entry.get('metric_value', '')
-    trend = entry.get('trend', '')
+def draw_leaderboard_background(ctx, width, height):
+    """Static layer: dark gradient with warm copper glow behind the leaderboard"""
+    draw_diagonal_background(ctx, width, height)
+
+    radial_bg = cairo.RadialGradient(width / 2, height * 0.5, 0, width / 2, height * 0.5, width * 0.6)
+    radial_bg.add_color_stop_rgba(0, *COPPER, 0.12)
+    radial_bg.add_color_stop_rgba(1, *COPPER, 0)
+    ctx.set_source(radial_bg)
+    ctx.paint()
+
+
+def legend_node(width, height):
+    """Static node: trend legend at the bottom of the card"""
+    legend_y = height - 300
+    return Text("↑ Improving  ↓ Dropped  ★ New", "IBM Plex Sans", 32,
+                width / 2, legend_y, TEXT_MUTED, weight='Regular', align='center')
+
+
+def leaderboard_columns(width):
+    """Table columns for leaderboard rows: rank, name, metric value, trend (regular-row styles)"""
+    return [
+        Column(180, 'left', "IBM Plex Mono", 48, TEXT_PRIMARY, 'SemiBold'),
+        Column(320, 'left', "IBM Plex Sans", 44, TEXT_PRIMARY, 'SemiBold'),
+        Column(width * 0.65, 'left', "IBM Plex Mono", 42, TEXT_PRIMARY, 'Bold'),
+        Column(width - 200, 'right', "IBM Plex Sans", 40, TEXT_PRIMARY, 'Bold'),
+    ]
+
+
+def add_leaderboard_row(table, entry, y, width, row_height, is_podium=False):
+    """Add a single leaderboard row"""
+    rank = entry.rank
+    athlete_name = entry.athlete_name
+    metric_value = entry.metric_value
+    trend = entry.trend
 
     rank_color = get_rank_color(rank)
     trend_symbol = get_trend_symbol(trend)
     trend_color = get_trend_color(trend)
 
-    # Rank (left)
-    rank_x = 180
+    # Names shrink to stop short of the metric column
+    name_width = width * 0.65 - 360
+
     if is_podium:
         # Larger, bold for podium
-        draw_text(ctx, str(rank), "IBM Plex Mono", 68,
-                  rank_x, y, rank_color, weight='Bold', align='left')
+        cells = [
+            Cell(str(rank), color=rank_color, size=68, weight='Bold'),
+            fitted_cell(athlete_name, "IBM Plex Sans", name_width, 56, 36, 'Bold'),
+            Cell(metric_value, color=rank_color, size=52),
+            Cell(trend_symbol, color=trend_color, size=48) if trend_symbol else None,
+        ]
     else:
-        draw_text(ctx, str(rank), "IBM Plex Mono", 48,
-                  rank_x, y, rank_color, weight='SemiBold', align='left')
-
-    # Name (center-left)
-    name_x = 320
-    name_size = 56 if is_podium else 44
-    name_weight = 'Bold' if is_podium else 'SemiBold'
-    draw_text(ctx, athlete_name, "IBM Plex Sans", name_size,
-              name_x, y, TEXT_PRIMARY, weight=name_weight, align='left')
-
-    # Metric value (center-right)
-    metric_x = width * 0.65
-    metric_size = 52 if is_podium else 42
-    draw_text(ctx, metric_value, "IBM Plex Mono", metric_size,
-              metric_x, y, rank_color, weight='Bold', align='left')
-
-    # Trend (right)
-    if trend_symbol:
-        trend_x = width - 200
-        trend_size = 48 if is_podium else 40
-        draw_text(ctx, trend_symbol, "IBM Plex Sans", trend_size,
-                  trend_x, y, trend_color, weight='Bold', align='right')
+        cells = [
+            Cell(str(rank), color=rank_color),
+            fitted_cell(athlete_name, "IBM Plex Sans", name_width, 44, 32, 'SemiBold'),
+            Cell(metric_value, color=rank_color),
+            Cell(trend_symbol, color=trend_color) if trend_symbol else None,
+        ]
+    table.add_row(y, cells)
 
     return y + row_height
 
 
-def render_team_leaderboard(format_key, workout_data, options):
+def build_team_leaderboard_scene(format_key, workout_data, options):
     """
-    Render team leaderboard card
+    Build team leaderboard card scene
 
     Data expected:
     {
@@ -125,32 +139,22 @@ def render_team_leaderboard(format_key, workout_data, options):
     if options is None:
         options = {}
 
-    width, height = DIMENSIONS[format_key]
+    scene = Scene('team_leaderboard', format_key)
+    width, height = scene.width, scene.height
     is_story = format_key == '9:16'
 
-    surface, ctx = setup_canvas(width, height)
-
-    # Background - dark with team pride gradient
-    gradient = cairo.LinearGradient(0, 0, width, height)
-    gradient.add_color_stop_rgb(0, 0.03, 0.03, 0.04)
-    gradient.add_color_stop_rgb(0.5, 0.08, 0.06, 0.08)
-    gradient.add_color_stop_rgb(1, 0.12, 0.08, 0.06)
-    ctx.set_source(gradient)
-    ctx.rectangle(0, 0, width, height)
-    ctx.fill()
-
-    # Warm glow behind leaderboard
-    radial_bg = cairo.RadialGradient(width / 2, height * 0.5, 0, width / 2, height * 0.5, width * 0.6)
-    radial_bg.add_color_stop_rgba(0, *COPPER, 0.12)
-    radial_bg.add_color_stop_rgba(1, *COPPER, 0)
-    ctx.set_source(radial_bg)
-    ctx.paint()
+    # Background - dark with team pride gradient and warm glow behind leaderboard
+    scene.add(Group([
+        Shape(lambda ctx: draw_leaderboard_background(ctx, width, height)),
+    ], static_key=('background',)))
+    scene.add_photo_background(options)
 
     # Extract data
-    team_name = workout_data.get('team_name', 'Team')
-    period = workout_data.get('period', '')
-    leaderboard_type = workout_data.get('leaderboard_type', 'Leaderboard')
-    entries = workout_data.get('entries', [])
+    workout = LeaderboardData.coerce(workout_data)
+    team_name = workout.team_name
+    period = workout.period
+    leaderboard_type = workout.leaderboard_type
+    entries = workout.entries
 
     # Team color accent (use option if provided, else default copper)
     team_color_hex = options.get('teamColor')
@@ -164,24 +168,24 @@ def render_team_leaderboard(format_key, workout_data, options):
     y = 120
 
     # Team name
-    draw_text(ctx, team_name, "IBM Plex Sans", 64,
-              width / 2, y, TEXT_PRIMARY, weight='Bold', align='center')
+    scene.add(fitted_line(team_name, "IBM Plex Sans", width / 2, y, width - 240, 64, 40,
+                          TEXT_PRIMARY, weight='Bold', align='center', key='team_name'))
     y += 100
 
     # Period
-    draw_text(ctx, period, "IBM Plex Sans", 40,
-              width / 2, y, TEXT_SECONDARY, weight='Regular', align='center')
+    scene.add(fitted_line(period, "IBM Plex Sans", width / 2, y, width - 240, 40, 30,
+                          TEXT_SECONDARY, weight='Regular', align='center', key='period'))
     y += 100
 
     # Leaderboard type
-    draw_text(ctx, leaderboard_type.upper(), "IBM Plex Sans", 48,
-              width / 2, y, team_color, weight='Bold', align='center')
+    scene.add(fitted_line(leaderboard_type.upper(), "IBM Plex Sans", width / 2, y, width - 240, 48, 32,
+                          team_color, weight='Bold', align='center', key='leaderboard_type'))
     y += 100
 
     # Decorative separator with team color
     separator_width = 700
-    draw_gradient_rect(ctx, (width - separator_width) / 2, y, separator_width, 4,
-                       team_color, GOLD, direction='horizontal')
+    scene.add(Gradient((width - separator_width) / 2, y, separator_width, 4,
+                       team_color, GOLD, direction='horizontal'))
     y += 80
 
     # ── Leaderboard Rows ──
@@ -195,37 +199,43 @@ def render_team_leaderboard(format_key, workout_data, options):
         row_height_podium = 120
         row_height_regular = 90
 
-    # Draw podium entries (top 3) with special treatment
+    rows = scene.add(Table(leaderboard_columns(width), key='rows'))
+
+    # Podium entries (top 3) with special treatment
     podium_entries = entries[:3]
     for entry in podium_entries:
-        y = draw_leaderboard_row(ctx, entry, y, width, row_height_podium, is_podium=True)
+        y = add_leaderboard_row(rows, entry, y, width, row_height_podium, is_podium=True)
         y += 20  # Extra spacing after podium
 
-    # Draw remaining entries
+    # Remaining entries
     remaining_entries = entries[3:max_rows]
     for entry in remaining_entries:
-        y = draw_leaderboard_row(ctx, entry, y, width, row_height_regular, is_podium=False)
+        y = add_leaderboard_row(rows, entry, y, width, row_height_regular, is_podium=False)
 
     # Truncation indicator
     if len(entries) > max_rows:
         remaining = len(entries) - max_rows
         y += 40
-        draw_text(ctx, f"+ {remaining} more {'athletes' if remaining != 1 else 'athlete'}",
+        scene.add(Text(f"+ {remaining} more {'athletes' if remaining != 1 else 'athlete'}",
                   "IBM Plex Sans", 36,
-                  width / 2, y, TEXT_MUTED, weight='Regular', align='center')
+                  width / 2, y, TEXT_MUTED, weight='Regular', align='center'))
 
     # ── Legend (bottom) ──
-    legend_y = height - 300
-    draw_text(ctx, "↑ Improving  ↓ Dropped  ★ New", "IBM Plex Sans", 32,
-              width / 2, legend_y, TEXT_MUTED, weight='Regular', align='center')
+    scene.add(Group([legend_node(width, height)], static_key=('legend',)))
 
     # Add grain texture
-    draw_grain_texture(ctx, width, height, opacity=0.03)
+    scene.add_grain(opacity=0.03)
 
     # Branding
-    draw_oarbit_branding(ctx, width, height, format_key, options)
+    scene.add_branding(options)
+    scene.add_share_qr(options)
 
-    return surface_to_png_bytes(surface)
+    return scene
+
+
+def render_team_leaderboard(format_key, workout_data, options):
+    """Render team leaderboard card. Returns: PNG bytes"""
+    return render_scene(build_team_leaderboard_scene(format_key, workout_data, options), options)
 
 
 # Sample data for testing
@@ -0,0 +1,517 @@
+"""
+Telemetry - per-stroke series and force curves from the PM5 stroke stream
+Downsamples the stream to a fixed number of points with LTTB, and reduces
+force curves to a mean and percentile bands, so the sparkline and force-curve
+panels cost the same to draw for a 200-stroke 2K and a 20,000-stroke marathon.
+
+Long sessions can also arrive as an NDJSON stroke stream, folded record by
+record into fixed-size min/max buckets and force-curve histograms
+(TelemetryAccumulator), so folding costs the same memory for any stroke count.
+"""
+
+import itertools
+import json
+import math
+from array import array
+
+import cairocffi as cairo
+import numpy as np
+
+from templates.models import Telemetry
+
+# Points kept after downsampling; plenty for a card-width sparkline
+SPARKLINE_POINTS = 300
+
+# Concept2 power/pace relation: watts = 2.80 / (seconds per meter)^3
+C2_POWER_CONSTANT = 2.80
+
+SPARKLINE_METRICS = {
+    # metric: (Telemetry column, label)
+    'pace': ('watts', 'PACE'),
+    'watts': ('watts', 'WATTS'),
+    'heartRate': ('heart_rate', 'HEART RATE'),
+    'strokeRate': ('stroke_rate', 'RATE'),
+}
+
+
+def stroke_series(telemetry, metric):
+    """
+    Time and value arrays for one sparkline metric, skipping strokes without data
+
+    Pace is derived from per-stroke watts (tenths of a second per 500m).
+    Returns (t, values) float arrays, or None when there is nothing to plot.
+    """
+    if telemetry is None or metric not in SPARKLINE_METRICS:
+        return None
+    column = SPARKLINE_METRICS[metric][0]
+    if telemetry.series_points is not None:
+        # Streamed: already reduced to min/max buckets, each point with its own time
+        t, values = telemetry.series_points[column]
+    else:
+        values = getattr(telemetry, column)
+        values = np.asarray(values if values is not None else (), dtype=float)
+        t = np.asarray(telemetry.time_s if telemetry.time_s is not None else (), dtype=float)
+        if len(t) != len(values):
+            # No usable clock for this series: spread strokes evenly
+            t = np.arange(len(values), dtype=float)
+
+    keep = np.isfinite(values) & (values > 0)
+    t, values = t[keep], values[keep]
+    if len(values) < 2:
+        return None
+
+    if metric == 'pace':
+        values = 5000 * np.cbrt(C2_POWER_CONSTANT / values)
+    return t, values
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling to at most threshold points
+
+    Keeps the first and last points; from each bucket in between it keeps the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket, which preserves peaks and dips that plain
+    striding would drop. Bucket means come from one np.add.reduceat and each
+    bucket's triangle areas are computed as one vector operation.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    # Bucket edges over the interior points (first and last are always kept)
+    edges = (np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    starts, ends = edges[:-1], edges[1:]
+
+    counts = ends - starts
+    mean_x = np.add.reduceat(x[:-1], starts) / counts
+    mean_y = np.add.reduceat(y[:-1], starts) / counts
+    # The bucket after the last interior bucket is the final point itself
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    picked = np.empty(threshold, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for b in range(threshold - 2):
+        lo, hi = starts[b], ends[b]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - next_x[b]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (next_y[b] - ay))
+        a = lo + int(np.argmax(area))
+        picked[b + 1] = a
+
+    return x[picked], y[picked]
+
+
+def sparkline_points(telemetry, metric, x, y, w, h, points=SPARKLINE_POINTS):
+    """
+    Downsampled series scaled into the box (x, y, w, h)
+
+    Higher values plot higher, except pace where faster (lower) is up.
+    Returns a tuple of (px, py) pairs, or None when there is nothing to plot.
+    """
+    series = stroke_series(telemetry, metric)
+    if series is None:
+        return None
+    t, values = lttb(*series, points)
+
+    span_t = t[-1] - t[0] or 1.0
+    lo, hi = values.min(), values.max()
+    span_v = (hi - lo) or 1.0
+    level = (values - lo) / span_v
+    if metric == 'pace':
+        level = 1.0 - level
+
+    px = x + (t - t[0]) / span_t * w
+    py = y + h - level * h
+    return tuple(zip(np.round(px, 1).tolist(), np.round(py, 1).tolist()))
+
+
+def draw_sparkline(ctx, points, baseline, color, line_width=4, fill_alpha=0.12):
+    """
+    Draw a sparkline as one Cairo path: a translucent area down to baseline,
+    then the line itself stroked on top
+    """
+    ctx.new_path()
+    ctx.move_to(*points[0])
+    for px, py in points[1:]:
+        ctx.line_to(px, py)
+    line = ctx.copy_path()
+
+    # Area under the line
+    ctx.line_to(points[-1][0], baseline)
+    ctx.line_to(points[0][0], baseline)
+    ctx.close_path()
+    ctx.set_source_rgba(*color, fill_alpha)
+    ctx.fill()
+
+    ctx.append_path(line)
+    ctx.set_source_rgb(*color)
+    ctx.set_line_width(line_width)
+    ctx.set_line_join(cairo.LINE_JOIN_ROUND)
+    ctx.stroke()
+
+
+# Samples per stroke after resampling every force curve to a common length
+FORCE_CURVE_SAMPLES = 64
+
+
+def force_curve_matrix(curves, samples=FORCE_CURVE_SAMPLES):
+    """
+    Resample every stroke's force curve to `samples` points
+
+    Strokes are flattened into one array with per-stroke offsets, then all
+    strokes are linearly interpolated at once with a (strokes x samples) index
+    grid - no per-stroke Python work beyond the initial flatten. Strokes with
+    fewer than two readings are dropped.
+    Returns a (strokes, samples) float array, or None when nothing is usable.
+    """
+    curves = [c for c in curves or () if isinstance(c, (list, tuple, np.ndarray)) and len(c) >= 2]
+    if not curves:
+        return None
+
+    lengths = np.fromiter((len(c) for c in curves), dtype=int, count=len(curves))
+    # Missing readings (None) become NaN on conversion, then zero force
+    flat = np.nan_to_num(np.array(list(itertools.chain.from_iterable(curves)), dtype=float))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    # Fractional source position of each output sample within its stroke
+    pos = np.linspace(0.0, 1.0, samples)[None, :] * (lengths - 1)[:, None]
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, (lengths - 1)[:, None])
+    frac = pos - lo
+
+    base = offsets[:, None]
+    return flat[base + lo] * (1 - frac) + flat[base + hi] * frac
+
+
+def force_curve_bands(curves, samples=FORCE_CURVE_SAMPLES):
+    """
+    Mean force curve with 10-90 and 25-75 percentile bands across strokes
+
+    Returns {'mean', 'p10', 'p25', 'p75', 'p90': (samples,) arrays, 'strokes': n},
+    or None when there are no usable curves.
+    """
+    matrix = force_curve_matrix(curves, samples)
+    if matrix is None:
+        return None
+    # Percentiles partition each sample position across strokes; a contiguous
+    # (samples, strokes) copy makes that a row-wise pass
+    by_sample = np.ascontiguousarray(matrix.T)
+    p10, p25, p75, p90 = np.percentile(by_sample, (10, 25, 75, 90), axis=1)
+    return {
+        'mean': by_sample.mean(axis=1),
+        'p10': p10, 'p25': p25, 'p75': p75, 'p90': p90,
+        'strokes': len(matrix),
+    }
+
+
+def force_curve_paths(bands, x, y, w, h):
+    """
+    Scale force bands into the box (x, y, w, h)
+
+    Returns (outer band polygon, inner band polygon, mean polyline) as tuples of
+    (px, py) pairs; bands are closed polygons running along the upper
+    percentile and back along the lower one.
+    """
+    peak = max(float(bands['p90'].max()), 1.0)
+    px = np.round(x + np.linspace(0.0, w, len(bands['mean'])), 1)
+
+    def scaled(values):
+        return np.round(y + h - np.clip(values, 0, None) / peak * h, 1)
+
+    def band(upper, lower):
+        xs = np.concatenate((px, px[::-1]))
+        ys = np.concatenate((scaled(upper), scaled(lower)[::-1]))
+        return tuple(zip(xs.tolist(), ys.tolist()))
+
+    mean = tuple(zip(px.tolist(), scaled(bands['mean']).tolist()))
+    return band(bands['p90'], bands['p10']), band(bands['p75'], bands['p25']), mean
+
+
+def draw_force_curve(ctx, paths, color, line_width=5):
+    """Draw the percentile bands as two filled paths and the mean curve as one stroked path"""
+    outer, inner, mean = paths
+    for polygon, alpha in ((outer, 0.15), (inner, 0.3)):
+        ctx.new_path()
+        ctx.move_to(*polygon[0])
+        for px, py in polygon[1:]:
+            ctx.line_to(px, py)
+        ctx.close_path()
+        ctx.set_source_rgba(*color, alpha)
+        ctx.fill()
+
+    ctx.new_path()
+    ctx.move_to(*mean[0])
+    for px, py in mean[1:]:
+        ctx.line_to(px, py)
+    ctx.set_source_rgb(*color)
+    ctx.set_line_width(line_width)
+    ctx.set_line_join(cairo.LINE_JOIN_ROUND)
+    ctx.set_line_cap(cairo.LINE_CAP_ROUND)
+    ctx.stroke()
+
+
+# ─────────────────────────────────────────────
+# Streaming ingestion (NDJSON stroke records)
+# ─────────────────────────────────────────────
+
+# Bytes read from the request stream per chunk
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Force histogram per resampled position: FORCE_HISTOGRAM_BINS bins over
+# [0, FORCE_HISTOGRAM_MAX); readings outside the range land in the end bins
+FORCE_HISTOGRAM_BINS = 256
+FORCE_HISTOGRAM_MAX = 512.0
+
+# Force curves buffered before each vectorised resample + histogram fold
+FORCE_CURVE_BATCH = 512
+
+# Stroke record field -> Telemetry column it is folded into
+STROKE_FIELDS = (
+    ('watts', 'watts'),
+    ('heartRate', 'heart_rate'),
+    ('strokeRate', 'stroke_rate'),
+)
+
+# Buckets per folded column (even); each keeps its lowest and highest reading,
+# so a streamed column reaches LTTB as at most 2 * SERIES_BUCKETS points
+SERIES_BUCKETS = 1024
+
+# Strokes buffered before each vectorised min/max fold
+SERIES_BATCH = 1024
+
+
+def ndjson_records(stream, chunk_size=STREAM_CHUNK_BYTES):
+    """
+    Yield one decoded JSON value per non-blank line of a binary stream
+
+    Reads fixed-size chunks rather than relying on the stream's readline, so
+    only one chunk plus one partial line is ever held in memory.
+    Raises ValueError on a malformed line.
+    """
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if pending.strip():
+        yield json.loads(pending)
+
+
+def _reading(value):
+    """Numeric reading as a float, NaN when missing or not a number"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return math.nan
+
+
+class MinMaxSeries:
+    """
+    One streamed column folded into at most `buckets` (min, max) buckets
+
+    Every `width` consecutive readings share a bucket that keeps its lowest
+    and highest reading, with their clock time and stroke index. When every
+    bucket is full, neighbours merge pairwise and width doubles, so memory is
+    fixed and the peaks and dips LTTB would keep survive the folding.
+    Readings that are missing or not positive are skipped (stroke_series
+    drops them too).
+    """
+
+    def __init__(self, buckets=SERIES_BUCKETS):
+        self.buckets = buckets
+        self.width = 1
+        self.filled = 0     # complete buckets
+        self.count = 0      # readings in the bucket being filled (index `filled`)
+        # Low and high point of each bucket: clock time, stroke index, value
+        self.lo = np.empty((3, buckets))
+        self.hi = np.empty((3, buckets))
+
+    def fold(self, t, index, values):
+        """Fold a batch of readings (float arrays of equal length, in stroke order)"""
+        keep = np.isfinite(values) & (values > 0)
+        points = np.stack((t[keep], index[keep], values[keep]))
+        pos, n = 0, points.shape[1]
+        while pos < n:
+            b = self.filled
+            if self.count:
+                # Top up the partially filled bucket
+                take = min(self.width - self.count, n - pos)
+                self._extend(b, points[:, pos:pos + take])
+                self.count += take
+                pos += take
+                if self.count == self.width:
+                    self.filled += 1
+                    self.count = 0
+            elif b == self.buckets:
+                self._merge()
+            elif n - pos < self.width:
+                # Remainder opens a new partial bucket
+                self._start(b, b + 1, points[:, pos:].reshape(3, 1, -1))
+                self.count = n - pos
+                pos = n
+            else:
+                k = min((n - pos) // self.width, self.buckets - b)
+                self._start(b, b + k, points[:, pos:pos + k * self.width].reshape(3, k, self.width))
+                self.filled += k
+                pos += k * self.width
+
+    def _start(self, first, last, groups):
+        """Fill buckets first..last from (3, buckets, width) readings"""
+        rows = np.arange(groups.shape[1])
+        self.lo[:, first:last] = groups[:, rows, groups[2].argmin(axis=1)]
+        self.hi[:, first:last] = groups[:, rows, groups[2].argmax(axis=1)]
+
+    def _extend(self, b, points):
+        """Widen bucket b with more (3, n) readings"""
+        low, high = points[:, points[2].argmin()], points[:, points[2].argmax()]
+        if low[2] < self.lo[2, b]:
+            self.lo[:, b] = low
+        if high[2] > self.hi[2, b]:
+            self.hi[:, b] = high
+
+    def _merge(self):
+        """Merge bucket pairs into the first half, keeping each pair's lowest and highest point"""
+        half = self.buckets // 2
+        take_lo = self.lo[2, 1::2] < self.lo[2, 0::2]
+        take_hi = self.hi[2, 1::2] > self.hi[2, 0::2]
+        self.lo[:, :half] = np.where(take_lo, self.lo[:, 1::2], self.lo[:, 0::2])
+        self.hi[:, :half] = np.where(take_hi, self.hi[:, 1::2], self.hi[:, 0::2])
+        self.filled = half
+        self.width *= 2
+
+    def points(self, clock):
+        """
+        (t, values) float arrays, each bucket's two points in stroke order
+
+        clock: use the recorded clock times; otherwise stroke indices stand in
+        """
+        n = self.filled + (1 if self.count else 0)
+        lo, hi = self.lo[:, :n], self.hi[:, :n]
+        first, second = np.where(lo[1] <= hi[1], lo, hi), np.where(lo[1] <= hi[1], hi, lo)
+        x = np.column_stack((first[0 if clock else 1], second[0 if clock else 1])).ravel()
+        v = np.column_stack((first[2], second[2])).ravel()
+        # Buckets whose low and high are the same stroke contribute it once
+        keep = np.ones(2 * n, dtype=bool)
+        keep[1::2] = lo[1] != hi[1]
+        return x[keep], v[keep]
+
+
+class TelemetryAccumulator:
+    """
+    Folds stroke records into the telemetry the renderers read
+
+    Strokes are buffered in batches of SERIES_BATCH, then each column is
+    folded into SERIES_BUCKETS min/max buckets (MinMaxSeries).
+    Force curves are resampled in batches of FORCE_CURVE_BATCH and folded
+    into a fixed (samples x bins) histogram plus a running sum. Memory is
+    therefore constant however many strokes arrive. Percentile bands are
+    accurate to one histogram bin (2 force units).
+
+    Record shape: {"t": 1.9, "watts": 231, "heartRate": 141,
+                   "strokeRate": 28, "force": [0.0, 41.5, ...]}
+    """
+
+    def __init__(self, samples=FORCE_CURVE_SAMPLES):
+        self.samples = samples
+        self.strokes = 0
+        self.time = array('d')
+        self.pending = {column: array('d') for _, column in STROKE_FIELDS}
+        self.series = {column: MinMaxSeries() for _, column in STROKE_FIELDS}
+        self.clock_complete = True
+        self.pending_curves = []
+        self.force_counts = np.zeros((samples, FORCE_HISTOGRAM_BINS), dtype=np.int64)
+        self.force_sum = np.zeros(samples)
+        self.force_strokes = 0
+
+    def add(self, record):
+        """Fold one stroke record"""
+        if not isinstance(record, dict):
+            raise ValueError('Stroke records must be JSON objects')
+
+        t = _reading(record.get('t'))
+        self.clock_complete = self.clock_complete and not math.isnan(t)
+        self.time.append(t)
+        for field, column in STROKE_FIELDS:
+            self.pending[column].append(_reading(record.get(field)))
+        if len(self.time) >= SERIES_BATCH:
+            self._fold_series()
+
+        curve = record.get('force')
+        if curve:
+            self.pending_curves.append(curve)
+            if len(self.pending_curves) >= FORCE_CURVE_BATCH:
+                self._fold_curves()
+
+    def _fold_series(self):
+        """Fold the buffered strokes into every column's min/max buckets"""
+        n = len(self.time)
+        if not n:
+            return
+        t = np.frombuffer(self.time)
+        index = np.arange(self.strokes, self.strokes + n, dtype=float)
+        for column, values in self.pending.items():
+            self.series[column].fold(t, index, np.frombuffer(values))
+        self.strokes += n
+        self.time = array('d')
+        self.pending = {column: array('d') for column in self.pending}
+
+    def _fold_curves(self):
+        """Resample buffered curves and add them to the force histogram"""
+        matrix = force_curve_matrix(self.pending_curves, self.samples)
+        self.pending_curves = []
+        if matrix is None:
+            return
+
+        bin_width = FORCE_HISTOGRAM_MAX / FORCE_HISTOGRAM_BINS
+        bins = np.clip((matrix / bin_width).astype(int), 0, FORCE_HISTOGRAM_BINS - 1)
+        # Row-major (sample, bin) index so one bincount updates every histogram
+        flat = (np.arange(self.samples) * FORCE_HISTOGRAM_BINS)[None, :] + bins
+        self.force_counts += np.bincount(
+            flat.ravel(), minlength=self.force_counts.size
+        ).reshape(self.force_counts.shape)
+        self.force_sum += matrix.sum(axis=0)
+        self.force_strokes += len(matrix)
+
+    def force_curve_bands(self):
+        """Same shape as force_curve_bands(), read off the histograms; None without curves"""
+        self._fold_curves()
+        n = self.force_strokes
+        if not n:
+            return None
+
+        bin_width = FORCE_HISTOGRAM_MAX / FORCE_HISTOGRAM_BINS
+        cumulative = self.force_counts.cumsum(axis=1)
+        rows = np.arange(self.samples)
+        bands = {'mean': self.force_sum / n, 'strokes': n}
+        for pct in (10, 25, 75, 90):
+            rank = pct / 100 * (n - 1)
+            # First bin whose cumulative count passes the rank, interpolated within the bin
+            index = (cumulative <= rank).sum(axis=1)
+            count = self.force_counts[rows, index]
+            below = cumulative[rows, index] - count
+            frac = np.clip((rank + 0.5 - below) / np.maximum(count, 1), 0.0, 1.0)
+            bands[f'p{pct}'] = (index + frac) * bin_width
+        return bands
+
+    def telemetry(self):
+        """Telemetry in the shape renderers read from ErgWorkoutData.telemetry"""
+        self._fold_series()
+        return Telemetry(
+            force_curve_bands=self.force_curve_bands(),
+            series_points={column: series.points(self.clock_complete) for column, series in self.series.items()},
+        )
+
+
+def fold_telemetry_stream(records):
+    """Fold an iterable of stroke records into Telemetry"""
+    accumulator = TelemetryAccumulator()
+    for record in records:
+        accumulator.add(record)
+    return accumulator.telemetry()
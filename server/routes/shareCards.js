@@ -1,6 +1,11 @@
 import express from 'express';
 import { authenticateToken } from '../middleware/auth.js';
-import { generateShareCard, getShareCard, deleteShareCard } from '../services/shareCardService.js';
+import {
+  generateShareCard,
+  getShareCard,
+  deleteShareCard,
+  layoutShareCards,
+} from '../services/shareCardService.js';
 import { AppError } from '../utils/errors.js';
 
 const router = express.Router();
@@ -106,6 +111,38 @@ router.post('/generate', authenticateToken, async (req, res, next) => {
   }
 });
 
+/**
+ * POST /api/v1/share-cards/layout
+ * Measure one or more cards without rendering (element boxes, font sizes, overflow flags)
+ */
+router.post('/layout', authenticateToken, async (req, res, next) => {
+  try {
+    const { cards } = req.body;
+
+    if (!Array.isArray(cards) || cards.length === 0) {
+      throw new AppError(400, 'VALIDATION_FAILED', 'cards must be a non-empty array');
+    }
+
+    if (cards.length > 50) {
+      throw new AppError(400, 'VALIDATION_FAILED', 'At most 50 cards per request');
+    }
+
+    const layouts = await layoutShareCards(cards);
+
+    res.json({ success: true, data: layouts });
+  } catch (error) {
+    if (error instanceof AppError) {
+      return next(error);
+    }
+
+    if (error.message === 'Workout not found') {
+      return next(new AppError(404, 'NOT_FOUND', error.message));
+    }
+
+    next(new AppError(500, 'SERVER_ERROR', error.message || 'Failed to measure share card layout'));
+  }
+});
+
 /**
  * GET /api/v1/share-cards/:shareId
  * Get share card metadata (public endpoint - no auth)
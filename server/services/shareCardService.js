@@ -1,6 +1,7 @@
 import axios from 'axios';
 import path from 'path';
 import fs from 'fs/promises';
+import { Readable } from 'stream';
 import { fileURLToPath } from 'url';
 import { dirname } from 'path';
 import prisma from '../db/connection.js';
@@ -9,12 +10,24 @@ const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
 const PYTHON_SERVICE_URL = process.env.PYTHON_SERVICE_URL || 'http://localhost:5000';
-const UPLOAD_DIR = path.join(__dirname, '../../uploads/share-cards');
+const BASE_URL = process.env.BASE_URL || 'https://oarbit.net';
+const UPLOADS_ROOT = path.join(__dirname, '../../uploads');
+const UPLOAD_DIR = path.join(UPLOADS_ROOT, 'share-cards');
+
+// Largest team logo / avatar inlined into a render request
+const BRANDING_IMAGE_MAX_BYTES = 5 * 1024 * 1024;
+
+// Workouts with more strokes than this are streamed to /generate as NDJSON
+const NDJSON_MIN_STROKES = 1000;
 
 /**
  * Generate a share card by calling the Python rendering service
  */
-export async function generateShareCard({ workoutId, cardType, format, options, userId, teamId }) {
+export async function generateShareCard({ workoutId, cardType, format, options: requestOptions, userId, teamId }) {
+  // Share cards are stored and served (also as the OG image) as full-size PNGs,
+  // so the renderer's svg/pdf output and low-resolution preview don't apply
+  const { output: _output, preview: _preview, ...options } = requestOptions || {};
+
   // Generate short share ID
   const { nanoid } = await import('nanoid');
   const shareId = nanoid(10);
@@ -23,27 +36,7 @@ export async function generateShareCard({ workoutId, cardType, format, options,
   await fs.mkdir(UPLOAD_DIR, { recursive: true });
 
   // Fetch workout data if workoutId provided
-  let workoutData = {};
-  let athleteName = null;
-  if (workoutId) {
-    const workout = await prisma.workout.findUnique({
-      where: { id: workoutId },
-      include: {
-        splits: { orderBy: { splitNumber: 'asc' } },
-        telemetry: true,
-        athlete: true,
-      },
-    });
-
-    if (!workout) {
-      throw new Error('Workout not found');
-    }
-
-    workoutData = serializeWorkoutForPython(workout);
-    athleteName = workout.athlete
-      ? `${workout.athlete.firstName} ${workout.athlete.lastName}`
-      : null;
-  }
+  const { workoutData, athleteName } = await loadWorkoutData(workoutId);
 
   // Fetch team data for branding (if teamId provided)
   let teamBranding = {};
@@ -80,18 +73,30 @@ export async function generateShareCard({ workoutId, cardType, format, options,
 
   // Call Python rendering service
   try {
+    const body = {
+      cardType,
+      format,
+      workoutData,
+      // cardKey lets the renderer repaint only what changed since this card's last render
+      options: {
+        ...options,
+        cardKey: workoutId || teamId || userId,
+        // showQrCode puts a QR code for the public share page on the card
+        ...(options?.showQrCode && { shareUrl: `${BASE_URL}/share/${shareId}` }),
+        // The renderer only takes image data, never paths or URLs
+        teamLogo: await inlineBrandingImage(teamBranding.teamLogo),
+        userAvatar: await inlineBrandingImage(userBranding.userAvatar),
+      },
+      branding: { ...teamBranding, ...userBranding },
+    };
+    const streamed = strokeCount(workoutData.telemetry) > NDJSON_MIN_STROKES;
     const response = await axios.post(
       `${PYTHON_SERVICE_URL}/generate`,
-      {
-        cardType,
-        format,
-        workoutData,
-        options,
-        branding: { ...teamBranding, ...userBranding },
-      },
+      streamed ? Readable.from(generateNdjson(body)) : body,
       {
         responseType: 'arraybuffer',
         timeout: 30000, // 30 second timeout for rendering
+        ...(streamed && { headers: { 'Content-Type': 'application/x-ndjson' } }),
       }
     );
 
@@ -138,6 +143,122 @@ export async function generateShareCard({ workoutId, cardType, format, options,
   };
 }
 
+/**
+ * Measure share card layouts without rendering them
+ *
+ * Returns element boxes, chosen font sizes and overflow flags per card so the
+ * editor can flag names and titles that will be shrunk or cut off.
+ */
+export async function layoutShareCards(cards) {
+  const payload = await Promise.all(
+    cards.map(async ({ workoutId, cardType, format, options }) => ({
+      cardType,
+      format,
+      workoutData: (await loadWorkoutData(workoutId)).workoutData,
+      options: options || {},
+    }))
+  );
+
+  try {
+    const response = await axios.post(
+      `${PYTHON_SERVICE_URL}/layout`,
+      { cards: payload },
+      { timeout: 10000 }
+    );
+    return response.data.cards;
+  } catch (error) {
+    console.error('Share card layout failed:', error.message);
+    throw new Error(error.response?.data?.error || 'Failed to measure share card layout.');
+  }
+}
+
+/**
+ * Base64 contents of a team logo or avatar for the renderer (null when unset or unreadable)
+ *
+ * Accepts only a data URL or a file under /uploads - remote URLs are never
+ * fetched, since users control these settings. A missing image leaves it off
+ * the card rather than failing the render; so does one the renderer can't decode.
+ */
+async function inlineBrandingImage(source) {
+  if (typeof source !== 'string') return null;
+  try {
+    if (source.startsWith('data:image/')) {
+      return source.slice(source.indexOf(',') + 1);
+    }
+    if (source.startsWith('/uploads/')) {
+      const filepath = path.resolve(UPLOADS_ROOT, '..', `.${source}`);
+      if (!filepath.startsWith(UPLOADS_ROOT + path.sep)) return null;
+      const { size } = await fs.stat(filepath);
+      if (size > BRANDING_IMAGE_MAX_BYTES) return null;
+      return (await fs.readFile(filepath)).toString('base64');
+    }
+  } catch (error) {
+    console.warn('Skipping share card branding image:', error.message);
+  }
+  return null;
+}
+
+/**
+ * Number of strokes in serialized telemetry (0 when absent)
+ */
+function strokeCount(telemetry) {
+  if (!telemetry) return 0;
+  return Math.max(
+    telemetry.timeSeriesS.length,
+    telemetry.wattsSeries.length,
+    telemetry.forceCurves?.length || 0
+  );
+}
+
+/**
+ * Encode a /generate body as NDJSON: the body without telemetry on the first
+ * line, then one line per stroke, so neither side holds the whole session as
+ * one JSON document
+ */
+function* generateNdjson(body) {
+  const { telemetry, ...workoutData } = body.workoutData;
+  yield `${JSON.stringify({ ...body, workoutData })}\n`;
+
+  for (let i = 0; i < strokeCount(telemetry); i++) {
+    yield `${JSON.stringify({
+      t: telemetry.timeSeriesS[i] ?? null,
+      watts: telemetry.wattsSeries[i] ?? null,
+      heartRate: telemetry.heartRateSeries[i] ?? null,
+      strokeRate: telemetry.strokeRateSeries[i] ?? null,
+      force: telemetry.forceCurves?.[i] ?? null,
+    })}\n`;
+  }
+}
+
+/**
+ * Load and serialize a workout for the Python service ({} when no workoutId)
+ */
+async function loadWorkoutData(workoutId) {
+  if (!workoutId) {
+    return { workoutData: {}, athleteName: null };
+  }
+
+  const workout = await prisma.workout.findUnique({
+    where: { id: workoutId },
+    include: {
+      splits: { orderBy: { splitNumber: 'asc' } },
+      telemetry: true,
+      athlete: true,
+    },
+  });
+
+  if (!workout) {
+    throw new Error('Workout not found');
+  }
+
+  return {
+    workoutData: serializeWorkoutForPython(workout),
+    athleteName: workout.athlete
+      ? `${workout.athlete.firstName} ${workout.athlete.lastName}`
+      : null,
+  };
+}
+
 /**
  * Get share card metadata for public pages
  */
@@ -331,6 +452,7 @@ function serializeWorkoutForPython(workout) {
           wattsSeries: workout.telemetry.wattsSeries || [],
           heartRateSeries: workout.telemetry.heartRateSeries || [],
           strokeRateSeries: workout.telemetry.strokeRateSeries || [],
+          forceCurves: workout.telemetry.forceCurves || null,
         }
       : null,
     athlete: workout.athlete